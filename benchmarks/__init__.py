@@ -0,0 +1,16 @@
+"""Benchmarks del sistema hotelero.
+
+Los módulos del sistema viven en str/ y se importan como paquetes de primer
+nivel (models, service, ...), igual que lo hacen entre sí.
+
+    python -m benchmarks.bench_servicios   # servicios, reportes y almacenamiento
+    python -m benchmarks.bench_eventos     # despacho del bus de eventos
+    python -m benchmarks.estres_reservas   # reservas concurrentes sin dobles reservas
+    python -m benchmarks.regresiones       # casos de regresión de consistencia
+"""
+import os
+import sys
+
+RAIZ_FUENTES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "str")
+if RAIZ_FUENTES not in sys.path:
+    sys.path.insert(0, RAIZ_FUENTES)
@@ -0,0 +1,42 @@
+"""Micro-benchmark del costo de despacho del bus de eventos.
+
+Uso: python -m benchmarks.bench_eventos
+"""
+import time
+
+import benchmarks  # noqa: F401  (configura sys.path)
+from service.eventos import BusEventos, Evento, ReservaCreada
+
+
+def medir_despacho(num_eventos: int = 200000, num_suscriptores: int = 1, asincrono: bool = False):
+    """Retorna microsegundos por evento publicado"""
+    bus = BusEventos()
+    contador = [0]
+    
+    def manejador(evento):
+        contador[0] += 1
+    
+    for _ in range(num_suscriptores):
+        bus.suscribir(Evento, manejador, asincrono=asincrono)
+    
+    evento = ReservaCreada(None)
+    inicio = time.perf_counter()
+    for _ in range(num_eventos):
+        bus.publicar(evento)
+    if asincrono:
+        bus.esperar()
+    duracion = time.perf_counter() - inicio
+    
+    return duracion / num_eventos * 1e6
+
+
+def main():
+    print("📊 Costo de despacho del bus de eventos (µs/evento)")
+    print(f"  sin suscriptores:      {medir_despacho(num_suscriptores=0):.3f}")
+    for n in (1, 5):
+        print(f"  {n} síncrono(s):         {medir_despacho(num_suscriptores=n):.3f}")
+    print(f"  1 asíncrono (con cola): {medir_despacho(num_eventos=50000, asincrono=True):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Suite de benchmarks de los caminos críticos de servicios, reportes y almacenamiento.
+
+Cada caso se mide con varios tamaños de datos sintéticos (número de reservas;
+habitaciones y personal escalan en proporción) y los resultados se emiten en
+JSON para compararlos contra una línea base guardada.
+
+Uso:
+    python -m benchmarks.bench_servicios --tamaños 1000 10000 --salida resultados.json
+    python -m benchmarks.bench_servicios --linea-base resultados.json --tolerancia 0.25
+
+Sale con código 1 si algún caso empeora más que la tolerancia.
+"""
+import argparse
+import itertools
+import shutil
+import sys
+import tempfile
+from datetime import date
+
+import benchmarks  # noqa: F401  (configura sys.path)
+from benchmarks.medicion import (medir, silencio, entorno, guardar_resultados,
+                                 cargar_resultados, comparar)
+from service.hotel_service import HotelService
+from service.reserva_service import ReservaService
+from service.reporte_service import ReporteService
+from storage.json_storage import JSONStorage
+from utils.generador_datos import GeneradorHotel, APELLIDOS
+
+TAMAÑOS_POR_DEFECTO = [1000, 10000, 100000]
+
+
+def construir_hotel(num_reservas: int, semilla: int = 42):
+    """HotelService poblado con datos sintéticos proporcionales al tamaño"""
+    generador = GeneradorHotel(semilla=semilla,
+                               num_habitaciones=max(50, num_reservas // 100),
+                               num_reservas=num_reservas,
+                               num_empleados=max(20, num_reservas // 200),
+                               num_servicios=0)
+    with silencio():
+        hotel = generador.poblar(HotelService(datos_ejemplo=False))
+    return hotel
+
+
+def casos_servicio(hotel):
+    """Casos sobre un hotel en memoria: nombre -> función sin argumentos"""
+    reservas = ReservaService(hotel)
+    reportes = ReporteService(hotel)
+
+    numeros = itertools.cycle([h.numero for h in hotel.habitaciones[::max(1, len(hotel.habitaciones) // 97)]])
+    apellidos = itertools.cycle(APELLIDOS)
+
+    primera = min(r.fecha_inicio for r in hotel.reservas)
+    ultima = max(r.fecha_fin for r in hotel.reservas)
+    origen, fin = date.fromisoformat(primera).toordinal(), date.fromisoformat(ultima).toordinal()
+    fechas = itertools.cycle([date.fromordinal(origen + (fin - origen) * k // 11).isoformat()
+                              for k in range(1, 11)])
+    meses = itertools.cycle(sorted({(int(f[:4]), int(f[5:7])) for f in
+                                    (r.fecha_inicio for r in hotel.reservas[::max(1, len(hotel.reservas) // 50)])}))
+
+    def reporte_mensual():
+        año, mes = next(meses)
+        return reservas.generar_reporte_mensual(mes, año)
+
+    def reporte_financiero():
+        reportes.cache.limpiar()  # Sin limpiar, toda repetición sería un acierto de caché
+        return reportes.generar_reporte_financiero()
+
+    return {
+        "obtener_habitacion_por_numero": lambda: hotel.obtener_habitacion_por_numero(next(numeros)),
+        "obtener_habitaciones_disponibles": hotel.obtener_habitaciones_disponibles,
+        "generar_reporte_ocupacion": hotel.generar_reporte_ocupacion,
+        "buscar_reservas_por_huesped": lambda: reservas.buscar_reservas_por_huesped(next(apellidos)),
+        "calcular_ocupacion_fecha": lambda: reservas.calcular_ocupacion_fecha(next(fechas)),
+        "generar_reporte_mensual": reporte_mensual,
+        "generar_reporte_financiero": reporte_financiero,
+    }
+
+
+def casos_almacenamiento(hotel, directorio: str):
+    """Guardado y carga completos con JSONStorage"""
+    storage = JSONStorage(directorio)
+
+    def guardar():
+        storage.guardar_habitaciones(hotel.habitaciones)
+        storage.guardar_reservas(hotel.reservas)
+
+    def cargar():
+        habitaciones = storage.cargar_habitaciones()
+        storage.cargar_reservas()
+        return habitaciones
+
+    with silencio():
+        guardar()
+    return {"json_storage_guardar": guardar, "json_storage_cargar": cargar}
+
+
+def ejecutar(tamaños, casos=None, tiempo_minimo: float = 0.2) -> dict:
+    """Mide todos los casos (o los indicados) para cada tamaño"""
+    resultados = {"entorno": entorno(), "tamaños": list(tamaños), "casos": {}}
+
+    for tamaño in tamaños:
+        print(f"📦 Generando {tamaño} reservas...", file=sys.stderr)
+        hotel = construir_hotel(tamaño)
+        directorio = tempfile.mkdtemp(prefix="bench_hotel_")
+        try:
+            todos = casos_servicio(hotel)
+            todos.update(casos_almacenamiento(hotel, directorio))
+
+            for nombre, funcion in todos.items():
+                if casos and nombre not in casos:
+                    continue
+                # Los casos de almacenamiento son lentos: pocas repeticiones bastan
+                medicion = medir(funcion, tiempo_minimo=tiempo_minimo,
+                                 max_repeticiones=5 if nombre.startswith("json_") else 10000)
+                resultados["casos"].setdefault(nombre, {})[str(tamaño)] = medicion
+                print(f"  {nombre:<36} n={tamaño:<8} p50={medicion['p50_ms']:.3f} ms",
+                      file=sys.stderr)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de servicios y reportes")
+    parser.add_argument("--tamaños", type=int, nargs="+", default=TAMAÑOS_POR_DEFECTO)
+    parser.add_argument("--casos", nargs="+", help="Medir solo estos casos")
+    parser.add_argument("--tiempo-minimo", type=float, default=0.2,
+                        help="Segundos mínimos de medición por caso")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto, stdout)")
+    parser.add_argument("--linea-base", help="Resultados previos contra los cuales comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Empeoramiento relativo de la mediana tolerado (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.tamaños, args.casos, args.tiempo_minimo)
+
+    if args.salida:
+        guardar_resultados(resultados, args.salida)
+    else:
+        import json
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+    if not args.linea_base:
+        return 0
+
+    regresiones = 0
+    print("\n📊 Comparación contra línea base (mediana)", file=sys.stderr)
+    for fila in comparar(resultados, cargar_resultados(args.linea_base), args.tolerancia):
+        marca = "❌" if fila["regresion"] else "✅"
+        regresiones += fila["regresion"]
+        print(f"  {marca} {fila['caso']:<36} n={fila['tamaño']:<8} "
+              f"{fila['base_ms']:.3f} → {fila['actual_ms']:.3f} ms ({fila['cambio']:+.1%})",
+              file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Prueba de estrés de reservas concurrentes (HotelService con concurrente=True).
+
+Muchos hilos intentan a la vez reservas individuales y grupales con fechas
+solapadas sobre pocas habitaciones; al final la auditoría de solapamientos
+debe reportar cero conflictos y el registro debe contener exactamente las
+reservas aceptadas.
+
+Uso:
+    python -m benchmarks.estres_reservas
+    python -m benchmarks.estres_reservas --hilos 32 --intentos 500 --habitaciones 8
+
+Sale con código 1 si aparece alguna doble reserva.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (configura sys.path)
+from benchmarks.medicion import silencio
+from models.habitacion import HabitacionSimple
+from models.reserva import ReservaGrupal
+from service.auditoria_service import AuditoriaService
+from service.hotel_service import HotelService
+
+
+def construir_hotel(num_habitaciones: int):
+    hotel = HotelService(concurrente=True, datos_ejemplo=False)
+    for numero in range(1, num_habitaciones + 1):
+        hotel.agregar_habitacion(HabitacionSimple(100 + numero, 1, True, "jardin", True))
+    return hotel
+
+
+def reservar(hotel, hilo: int, intentos: int, dias: int, semilla: int, barrera, aceptadas):
+    """Trabajo de un hilo: intentos de reserva con fechas y habitaciones al azar"""
+    azar = random.Random(semilla + hilo)
+    numeros = [h.numero for h in hotel.habitaciones]
+    origen = date(2030, 1, 1)
+    propias = []
+
+    barrera.wait()  # Todos los hilos arrancan a la vez
+    for intento in range(intentos):
+        inicio = origen + timedelta(days=azar.randrange(dias))
+        fin = inicio + timedelta(days=azar.randint(1, 5))
+        fecha_inicio, fecha_fin = inicio.strftime("%Y-%m-%d"), fin.strftime("%Y-%m-%d")
+        codigo = f"EST-{hilo}-{intento}"
+
+        if azar.random() < 0.2:
+            # Grupal: varias habitaciones bloqueadas juntas (orden de locks sin interbloqueo)
+            habitaciones = hotel.obtener_habitaciones_por_numeros(azar.sample(numeros, 2)).values()
+            reserva = ReservaGrupal(codigo, fecha_inicio, fecha_fin, list(habitaciones),
+                                    f"Grupo {hilo}", 4)
+            if hotel.agregar_reserva(reserva):
+                propias.append(codigo)
+        elif hotel.crear_reserva_individual(codigo, fecha_inicio, fecha_fin, azar.choice(numeros),
+                                            f"Huésped {hilo}", "estrés", False):
+            propias.append(codigo)
+
+    aceptadas.extend(propias)
+
+
+def ejecutar(hilos: int, intentos: int, num_habitaciones: int, dias: int, semilla: int = 42):
+    """Corre la prueba y retorna un resumen con los conflictos encontrados"""
+    with silencio():
+        hotel = construir_hotel(num_habitaciones)
+    barrera = threading.Barrier(hilos)
+    aceptadas = []
+
+    trabajadores = [threading.Thread(target=reservar,
+                                     args=(hotel, hilo, intentos, dias, semilla, barrera, aceptadas))
+                    for hilo in range(hilos)]
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    duracion = time.perf_counter() - inicio
+
+    conflictos = list(AuditoriaService(hotel).detectar_solapamientos())
+    registradas = {r.codigo_reserva for r in hotel.reservas}
+    return {
+        "intentos": hilos * intentos,
+        "aceptadas": len(aceptadas),
+        "registradas": len(registradas),
+        "perdidas": len(set(aceptadas) - registradas),
+        "conflictos": conflictos,
+        "segundos": duracion
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--intentos", type=int, default=300, help="reservas intentadas por hilo")
+    parser.add_argument("--habitaciones", type=int, default=6)
+    parser.add_argument("--dias", type=int, default=120, help="días sobre los que se reparten las fechas")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    resultado = ejecutar(args.hilos, args.intentos, args.habitaciones, args.dias, args.semilla)
+    print(f"🧵 {args.hilos} hilos, {resultado['intentos']} intentos en {resultado['segundos']:.2f} s")
+    print(f"✅ Aceptadas: {resultado['aceptadas']} (registradas: {resultado['registradas']})")
+
+    fallas = len(resultado["conflictos"]) + resultado["perdidas"]
+    fallas += resultado["aceptadas"] != resultado["registradas"]
+    for conflicto in resultado["conflictos"][:10]:
+        print(f"❌ Hab. {conflicto['habitacion']}: {conflicto['reserva_a'].codigo_reserva} "
+              f"y {conflicto['reserva_b'].codigo_reserva} ({conflicto['desde']} al {conflicto['hasta']})")
+
+    if fallas:
+        print(f"❌ {len(resultado['conflictos'])} dobles reservas, {resultado['perdidas']} reservas perdidas")
+        return 1
+    print("✅ Sin dobles reservas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
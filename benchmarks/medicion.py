@@ -0,0 +1,84 @@
+"""Utilidades de medición y comparación contra una línea base."""
+import contextlib
+import io
+import json
+import platform
+import statistics
+import time
+
+
+@contextlib.contextmanager
+def silencio():
+    """Descarta los print() de los servicios mientras se mide"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def medir(funcion, tiempo_minimo: float = 0.2, max_repeticiones: int = 10000,
+          min_repeticiones: int = 3) -> dict:
+    """Ejecuta funcion() repetidamente y retorna latencias (ms) y throughput (ops/s)"""
+    latencias = []
+    total = 0.0
+    with silencio():
+        funcion()  # calentamiento
+        while len(latencias) < max_repeticiones and (
+                len(latencias) < min_repeticiones or total < tiempo_minimo):
+            inicio = time.perf_counter()
+            funcion()
+            duracion = time.perf_counter() - inicio
+            latencias.append(duracion)
+            total += duracion
+
+    latencias.sort()
+    return {
+        "repeticiones": len(latencias),
+        "ops_por_segundo": len(latencias) / total if total else 0.0,
+        "media_ms": statistics.fmean(latencias) * 1000,
+        "p50_ms": latencias[len(latencias) // 2] * 1000,
+        "p95_ms": latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))] * 1000,
+        "min_ms": latencias[0] * 1000
+    }
+
+
+def entorno() -> dict:
+    """Metadatos del entorno para interpretar los resultados"""
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def guardar_resultados(resultados: dict, ruta: str):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+
+def cargar_resultados(ruta: str) -> dict:
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def comparar(resultados: dict, linea_base: dict, tolerancia: float = 0.25) -> list:
+    """Compara la mediana de cada caso contra la línea base.
+
+    Retorna una lista de dicts (caso, tamaño, base, actual, cambio); 'regresion'
+    es True cuando la mediana empeora más que la tolerancia relativa.
+    """
+    comparaciones = []
+    for caso, por_tamaño in resultados["casos"].items():
+        base_caso = linea_base.get("casos", {}).get(caso, {})
+        for tamaño, medicion in por_tamaño.items():
+            base = base_caso.get(tamaño)
+            if not base:
+                continue
+            cambio = medicion["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+            comparaciones.append({
+                "caso": caso,
+                "tamaño": tamaño,
+                "base_ms": base["p50_ms"],
+                "actual_ms": medicion["p50_ms"],
+                "cambio": cambio,
+                "regresion": cambio > tolerancia
+            })
+    return comparaciones
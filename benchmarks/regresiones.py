@@ -0,0 +1,222 @@
+"""Casos de regresión de consistencia (índices, cachés y calendario).
+
+Cada caso reproduce un error ya corregido y verifica el resultado con assert.
+
+Uso:
+    python -m benchmarks.regresiones
+    python -m benchmarks.regresiones --caso calendario_intervalos_anidados
+
+Sale con código 1 si algún caso falla.
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+import benchmarks  # noqa: F401  (configura sys.path)
+from benchmarks.medicion import silencio
+from models.empleado import Recepcionista
+from models.habitacion import HabitacionSimple
+from models.reserva import ReservaGrupal, ReservaIndividual
+from service.calendario_disponibilidad import CalendarioDisponibilidad
+from service.eventos import ReservaCreada
+from service.hotel_service import HotelService
+from service.mapa_ocupacion import MapaOcupacion, np
+from service.reporte_service import ReporteService
+from storage.json_storage import JSONStorage
+
+CASOS = {}
+
+
+def caso(funcion):
+    CASOS[funcion.__name__] = funcion
+    return funcion
+
+
+@caso
+def calendario_intervalos_anidados():
+    """Un intervalo cargado dentro de otro no debe ocultar al que lo contiene"""
+    habitacion = HabitacionSimple(1, 1, True, "jardin", True)
+    calendario = CalendarioDisponibilidad()
+    calendario.cargar([
+        ReservaIndividual("A", "2030-01-01", "2030-01-10", habitacion, "Ana", "vacaciones"),
+        ReservaIndividual("B", "2030-01-02", "2030-01-03", habitacion, "Beto", "vacaciones")
+    ])
+    assert not calendario.esta_libre(1, "2030-01-05", "2030-01-06")
+    assert calendario.esta_libre(1, "2030-01-10", "2030-01-12")
+
+    calendario.eliminar_reserva(ReservaIndividual("B", "2030-01-02", "2030-01-03", habitacion,
+                                                  "Beto", "vacaciones"))
+    assert not calendario.esta_libre(1, "2030-01-05", "2030-01-06")
+
+
+@caso
+def arranque_rapido_contratar_sin_leer():
+    """Contratar antes de leer 'empleados' no debe perder al empleado al guardar"""
+    directorio = tempfile.mkdtemp(prefix="regresion_hotel_")
+    try:
+        HotelService().guardar(JSONStorage(directorio))
+        hotel = HotelService(storage=JSONStorage(directorio))
+        hotel.contratar_empleado(Recepcionista("Nora Díaz", "REC-900", "nocturno", 1500, ["español"]))
+        hotel.guardar()
+
+        codigos = [e["codigo"] for e in JSONStorage(directorio).cargar_empleados()]
+        assert "REC-900" in codigos and len(codigos) == 9, codigos
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+@caso
+def nomina_cambio_en_el_lugar():
+    """Un idioma nuevo debe reflejarse en la nómina, la vista de personal y la caché"""
+    hotel = HotelService()
+    reportes = ReporteService(hotel)
+    recepcionista = next(e for e in hotel.empleados if isinstance(e, Recepcionista))
+    nomina = hotel.calcular_nomina_mensual()
+    reportes.generar_reportes()
+
+    try:
+        recepcionista.idiomas.append("alemán")  # Ya no se puede cambiar sin avisar
+        raise AssertionError("idiomas admite cambios en el lugar")
+    except AttributeError:
+        pass
+    recepcionista.agregar_idioma("alemán")
+
+    assert hotel.calcular_nomina_mensual() == nomina + 50000
+    assert hotel.obtener_vista_nomina().nomina_total == nomina + 50000
+    assert reportes.generar_reportes()["financiero"]["costos_nomina_mensual"] == nomina + 50000
+
+
+@caso
+def reserva_cambio_de_atributo():
+    """Cambiar el descuento de un grupo debe actualizar índice mensual, vista de ingresos y caché"""
+    hotel = HotelService()
+    reportes = ReporteService(hotel)
+    grupal = next(r for r in hotel.reservas if isinstance(r, ReservaGrupal))
+    año, mes = int(grupal.fecha_inicio[:4]), int(grupal.fecha_inicio[5:7])
+    indice = hotel.obtener_indice_mensual()
+    indice.ingresos_mes(año, mes)
+    reportes.generar_reporte_financiero()
+
+    grupal.descuento_grupo = 50
+
+    esperado = sum(r.calcular_costo_total() for r in hotel.reservas)
+    del_mes = sum(r.calcular_costo_total() for r in hotel.reservas if r.fecha_inicio[:7] == grupal.fecha_inicio[:7])
+    assert abs(hotel.obtener_vista_ingresos().reporte()["ingresos_totales"] - esperado) < 1e-6
+    assert abs(indice.ingresos_mes(año, mes) - del_mes) < 1e-6
+    financiero = reportes.generar_reporte_financiero()["financiero"]
+    assert abs(financiero["ingresos_reservas_activas"] - esperado) < 1e-6
+
+
+@caso
+def mapa_guardado_misma_cantidad_de_reservas():
+    """Cancelar una y crear otra deja la misma cantidad: el mapa guardado no debe reutilizarse"""
+    if np is None:
+        return  # NumPy es opcional
+    directorio = tempfile.mkdtemp(prefix="regresion_mapa_")
+    try:
+        ruta = f"{directorio}/mapa"
+        HotelService().habilitar_mapa_ocupacion("2024-01-01", 365, ruta=ruta)
+
+        hotel = HotelService()
+        primera = hotel.reservas[0]
+        hotel.eliminar_reserva(primera)
+        assert hotel.crear_reserva_individual("REG-1", "2024-06-01", "2024-06-05", 403, "Nora", "vacaciones", False)
+        mapa = hotel.habilitar_mapa_ocupacion("2024-01-01", 365, ruta=ruta)
+
+        nuevo = MapaOcupacion([h.numero for h in hotel.habitaciones], "2024-01-01", 365)
+        nuevo.cargar_reservas(hotel.reservas)
+        assert np.array_equal(np.asarray(mapa.matriz), nuevo.matriz)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+@caso
+def crear_y_cancelar_concurrente():
+    """Con hilos, la cancelación no debe llegar a los índices antes que su creación"""
+    hotel = HotelService(concurrente=True)
+    # Un suscriptor lento antes de los índices agranda la ventana entre registrar y avisar
+    hotel.eventos.suscribir(ReservaCreada, lambda e: time.sleep(0.002))
+    indice = hotel._obtener_indice_huespedes()
+    mensual = hotel.obtener_indice_mensual()
+    habitacion = hotel.habitaciones[0]
+
+    def crear():
+        for i in range(28):
+            hotel.agregar_reserva(ReservaIndividual(f"C-{i}", f"2031-01-{i + 1:02d}",
+                                                    f"2031-01-{i + 2:02d}",
+                                                    habitacion, "Huésped", "vacaciones"))
+
+    def cancelar():
+        for i in range(28):
+            limite = time.monotonic() + 5
+            reserva = hotel.obtener_reserva_por_codigo(f"C-{i}")
+            while reserva is None and time.monotonic() < limite:
+                time.sleep(0.0001)
+                reserva = hotel.obtener_reserva_por_codigo(f"C-{i}")
+            if reserva:
+                hotel.eliminar_reserva(reserva)
+
+    hilos = [threading.Thread(target=crear), threading.Thread(target=cancelar)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    reservas = hotel.reservas
+    del_mes = [r for r in reservas if r.fecha_inicio.startswith("2031-01")]
+    assert len(indice) == len(reservas), (len(indice), len(reservas))
+    assert len(mensual.reservas_mes(2031, 1)) == len(del_mes), "índice mensual desfasado"
+
+
+@caso
+def lote_registra_huespedes():
+    """Un lote debe dejar en el historial de cada habitación lo mismo que la creación individual"""
+    individual, lote = HotelService(), HotelService()
+    individual.crear_reserva_individual("H-1", "2031-02-01", "2031-02-03", 101, "Nora", "vacaciones", False)
+    resultado = lote.crear_reservas_lote([{
+        "tipo": "individual", "codigo_reserva": "H-1", "fecha_inicio": "2031-02-01",
+        "fecha_fin": "2031-02-03", "habitacion": 101, "huesped": "Nora",
+        "proposito_visita": "vacaciones", "incluye_desayuno": False
+    }])
+    assert not resultado["errores"], resultado["errores"]
+
+    def nombres(hotel):
+        return [r["huesped"] for r in hotel.obtener_habitacion_por_numero(101).historial_huespedes]
+    assert nombres(lote) == nombres(individual) and nombres(lote)[-1] == "Nora", nombres(lote)
+
+
+@caso
+def reporte_anual_cache_por_procesos():
+    """El reporte anual en caché no debe atribuirse a otra cantidad de procesos"""
+    reportes = ReporteService(HotelService())
+    assert not reportes.generar_reporte_anual(2024, procesos=1)["desde_cache"]
+    assert not reportes.generar_reporte_anual(2024, procesos=2, particiones=4)["desde_cache"]
+    assert reportes.generar_reporte_anual(2024, procesos=1)["desde_cache"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--caso", action="append", choices=sorted(CASOS), help="solo estos casos")
+    args = parser.parse_args(argv)
+
+    fallas = 0
+    for nombre in args.caso or CASOS:
+        try:
+            with silencio():
+                CASOS[nombre]()
+            print(f"✅ {nombre}")
+        except Exception:
+            fallas += 1
+            print(f"❌ {nombre}")
+            traceback.print_exc()
+
+    print(f"{len(args.caso or CASOS) - fallas} casos correctos, {fallas} con fallas")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -886,6 +886,7 @@ class HotelService:
         self.reservas = []
         self.servicios = []
         self.empleados = []
+        self._habitaciones_por_numero = {}  # Índice numero -> habitación
         self._inicializar_datos()
     
     def _inicializar_datos(self):
@@ -897,24 +898,24 @@ class HotelService:
     def _crear_habitaciones_ejemplo(self):
         """Crea inventario de 3 habitaciones de cada tipo"""
         # Simples
-        self.habitaciones.append(HabitacionSimple(101, 1, True, "jardin", True))
-        self.habitaciones.append(HabitacionSimple(102, 1, True, "calle", False))
-        self.habitaciones.append(HabitacionSimple(103, 1, True, "interior", True))
+        self.agregar_habitacion(HabitacionSimple(101, 1, True, "jardin", True))
+        self.agregar_habitacion(HabitacionSimple(102, 1, True, "calle", False))
+        self.agregar_habitacion(HabitacionSimple(103, 1, True, "interior", True))
         
         # Dobles
-        self.habitaciones.append(HabitacionDoble(201, 2, "2 camas individuales", "calle", True))
-        self.habitaciones.append(HabitacionDoble(202, 2, "cama queen", "marina", True))
-        self.habitaciones.append(HabitacionDoble(203, 2, "cama king", "montaña", True))
+        self.agregar_habitacion(HabitacionDoble(201, 2, "2 camas individuales", "calle", True))
+        self.agregar_habitacion(HabitacionDoble(202, 2, "cama queen", "marina", True))
+        self.agregar_habitacion(HabitacionDoble(203, 2, "cama king", "montaña", True))
         
         # Suites
-        self.habitaciones.append(Suite(301, 3, True, True, True, 2))
-        self.habitaciones.append(Suite(302, 3, True, False, True, 1))
-        self.habitaciones.append(Suite(303, 3, True, True, False, 3))
+        self.agregar_habitacion(Suite(301, 3, True, True, True, 2))
+        self.agregar_habitacion(Suite(302, 3, True, False, True, 1))
+        self.agregar_habitacion(Suite(303, 3, True, True, False, 3))
         
         # Penthouse
-        self.habitaciones.append(Penthouse(401, 4, True, True, True))
-        self.habitaciones.append(Penthouse(402, 4, False, True, False))
-        self.habitaciones.append(Penthouse(403, 4, True, False, True))
+        self.agregar_habitacion(Penthouse(401, 4, True, True, True))
+        self.agregar_habitacion(Penthouse(402, 4, False, True, False))
+        self.agregar_habitacion(Penthouse(403, 4, True, False, True))
     
     def _contratar_personal_ejemplo(self):
         """Contrata equipo completo de hotel"""
@@ -948,11 +949,25 @@ class HotelService:
     def obtener_habitaciones_disponibles(self):
         return [h for h in self.habitaciones if h.estado == "disponible"]
     
+    def agregar_habitacion(self, habitacion) -> bool:
+        if habitacion.numero in self._habitaciones_por_numero:
+            return False
+        self.habitaciones.append(habitacion)
+        self._habitaciones_por_numero[habitacion.numero] = habitacion
+        return True
+
+    def eliminar_habitacion(self, numero: int):
+        habitacion = self._habitaciones_por_numero.pop(numero, None)
+        if habitacion:
+            self.habitaciones.remove(habitacion)
+        return habitacion
+
     def obtener_habitacion_por_numero(self, numero: int):
-        for habitacion in self.habitaciones:
-            if habitacion.numero == numero:
-                return habitacion
-        return None
+        return self._habitaciones_por_numero.get(numero)
+
+    def obtener_habitaciones_por_numeros(self, numeros):
+        indice = self._habitaciones_por_numero
+        return {numero: indice.get(numero) for numero in numeros}
     
     def crear_reserva_individual(self, codigo: str, fecha_inicio: str, fecha_fin: str,
                                 numero_habitacion: int, huesped: str, proposito: str,
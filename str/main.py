@@ -0,0 +1,45 @@
+import argparse
+import os
+
+from models.versionado import ConflictoVersionError
+from service.hotel_service import HotelService
+from storage.json_storage import JSONStorage
+from ui.menu_sistema import SistemaHotelMenu
+
+
+def main(argv=None):
+    """Función principal.
+
+    Sin argumentos arranca con los datos de ejemplo en memoria. Con --datos
+    arranca rápido desde un directorio JSON (cada colección se carga la primera
+    vez que se usa) y al salir guarda los cambios en ese mismo directorio.
+    """
+    parser = argparse.ArgumentParser(description="Sistema de Gestión Hotelera")
+    parser.add_argument("--datos", help="directorio de datos JSON (ver utils/generador_datos.py)")
+    args = parser.parse_args(argv)
+
+    try:
+        storage = None
+        if args.datos:
+            if not os.path.isdir(args.datos):
+                print(f"❌ El directorio {args.datos} no existe")
+                return
+            storage = JSONStorage(args.datos)
+
+        hotel_service = HotelService(storage=storage, verbose=True)
+        menu_sistema = SistemaHotelMenu(hotel_service)
+        menu_sistema.ejecutar()
+
+        if storage:
+            hotel_service.guardar()
+
+    except ConflictoVersionError as e:
+        print(f"\n❌ No se guardaron los cambios: {e}")
+    except KeyboardInterrupt:
+        print("\n\n👋 Sistema interrumpido por el usuario.")
+    except Exception as e:
+        print(f"\n❌ Error inesperado: {e}")
+
+
+if __name__ == "__main__":
+    main()
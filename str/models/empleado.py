@@ -2,8 +2,10 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List
 
+from models.observable import Observable
 
-class EmpleadoHotel(ABC):
+
+class EmpleadoHotel(Observable, ABC):
     """Clase abstracta base para todos los empleados (ABSTRACCION)"""
     
     def __init__(self, nombre: str, codigo: str, turno: str, salario_base: float):
@@ -15,7 +17,16 @@ class EmpleadoHotel(ABC):
         
         # Atributo protegido
         self._evaluaciones = []  # Historial de evaluaciones
+        self._observadores = []
     
+    def __setattr__(self, nombre, valor):
+        """Los atributos públicos de las subclases determinan el salario: notifica sus cambios.
+        Las listas se guardan como tuplas para que solo cambien reasignándolas (y notificando)."""
+        if isinstance(valor, list) and not nombre.startswith("_"):
+            valor = tuple(valor)
+        super().__setattr__(nombre, valor)
+        if not nombre.startswith("_") and "_observadores" in self.__dict__:
+            self._notificar("atributo", nombre=nombre)
   
     @abstractmethod
     def calcular_salario_mensual(self) -> float:
@@ -36,6 +47,7 @@ class EmpleadoHotel(ABC):
             "comentario": comentario
         }
         self._evaluaciones.append(evaluacion)
+        self._notificar("evaluacion", evaluacion=evaluacion)
     
 
     def __calcular_bono_desempeño(self) -> float:
@@ -130,6 +142,11 @@ class Recepcionista(EmpleadoHotel):
         else:
             return tareas[4] + ", " + tareas[5]
     
+    def agregar_idioma(self, idioma: str):
+        """Agrega un idioma (cambia el bono por idiomas)"""
+        if idioma not in self.idiomas:
+            self.idiomas += (idioma,)
+    
     def __str__(self):
         return (f"Recepcionista: {self.nombre} | Idiomas: {', '.join(self.idiomas)} | "
                 f"Turno: {self.turno} | Salario: ${self.calcular_salario_mensual():,.0f}")
@@ -177,7 +194,7 @@ class Housekeeping(EmpleadoHotel):
     def agregar_habitacion(self, numero_habitacion: int):
         """Agrega una habitación a las asignadas"""
         if numero_habitacion not in self.habitaciones_asignadas:
-            self.habitaciones_asignadas.append(numero_habitacion)
+            self.habitaciones_asignadas += (numero_habitacion,)
     
     def __str__(self):
         return (f"Housekeeping: {self.nombre} | Piso {self.piso} | "
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from models.observable import Observable
+from models.versionado import Versionado
 
-class Habitacion(ABC):
+
+class Habitacion(Observable, Versionado, ABC):
     """Clase abstracta base para todas las habitaciones (ABSTRACCION)"""
     
     def __init__(self, numero: int, piso: int, tarifa_base: float):
@@ -15,7 +18,17 @@ class Habitacion(ABC):
         # Atributos protegidos
         self._servicios_incluidos = []
         self._historial_huespedes = []
-    
+        self._observadores = []
+        self._version = 1
+    
+    def __setattr__(self, nombre, valor):
+        """Los atributos públicos de las subclases determinan la tarifa: notifica sus cambios.
+        Las listas se guardan como tuplas para que solo cambien reasignándolas (y notificando)."""
+        if isinstance(valor, list) and not nombre.startswith("_"):
+            valor = tuple(valor)
+        super().__setattr__(nombre, valor)
+        if not nombre.startswith("_") and "_observadores" in self.__dict__:
+            self._notificar("atributo", nombre=nombre)
 
     @abstractmethod
     def calcular_tarifa_noche(self) -> float:
@@ -27,16 +40,23 @@ class Habitacion(ABC):
         """Retorna capacidad máxima"""
         pass
     
-    def cambiar_estado(self, nuevo_estado: str):
-        """Cambia el estado de la habitación"""
+    def cambiar_estado(self, nuevo_estado: str, version_esperada: int = None):
+        """Cambia el estado de la habitación (ConflictoVersionError si la versión no coincide)"""
+        self._verificar_version(version_esperada)
+        
         estados_validos = ["disponible", "ocupada", "limpieza", "mantenimiento"]
         if nuevo_estado in estados_validos:
+            anterior = self.__estado
             self.__estado = nuevo_estado
+            if anterior != nuevo_estado:
+                self._incrementar_version()
+                self._notificar("estado", anterior=anterior, nuevo=nuevo_estado)
             return True
         return False
     
     def agregar_huesped_al_historial(self, huesped: str):
         """Agrega un huesped al historial"""
+        self._incrementar_version()
         registro = {
             "huesped": huesped,
             "fecha": datetime.now().strftime("%Y-%m-%d %H:%M"),
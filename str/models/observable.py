@@ -0,0 +1,17 @@
+class Observable:
+    """Permite que otros objetos se suscriban a los cambios de una entidad (OBSERVADOR)"""
+    
+    def registrar_observador(self, observador):
+        """Registra un callable observador(entidad, evento, **datos)"""
+        if observador not in self._observadores:
+            self._observadores.append(observador)
+    
+    def eliminar_observador(self, observador):
+        """Elimina un observador registrado"""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+    
+    def _notificar(self, evento: str, **datos):
+        """Notifica un cambio a todos los observadores"""
+        for observador in list(self._observadores):
+            observador(self, evento, **datos)
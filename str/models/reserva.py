@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
 from typing import List
 
+from models.observable import Observable
+from models.versionado import Versionado
+from utils.validaciones import fecha_a_ordinal
 
-class Reserva(ABC):
+
+class Reserva(Observable, Versionado, ABC):
     """Clase abstracta base para todas las reservas (ABSTRACCION)"""
     
     def __init__(self, codigo_reserva: str, fecha_inicio: str, fecha_fin: str, habitacion):
@@ -15,6 +18,17 @@ class Reserva(ABC):
         
         # Atributo protegido
         self._huespedes = []  # Lista de huéspedes
+        self._version = 1
+        self._observadores = []
+    
+    def __setattr__(self, nombre, valor):
+        """Los atributos públicos de las subclases determinan el costo: notifica sus cambios.
+        Las listas se guardan como tuplas para que solo cambien reasignándolas (y notificando)."""
+        if isinstance(valor, list) and not nombre.startswith("_"):
+            valor = tuple(valor)
+        super().__setattr__(nombre, valor)
+        if not nombre.startswith("_") and "_observadores" in self.__dict__:
+            self._notificar("atributo", nombre=nombre)
     
     @abstractmethod
     def calcular_costo_total(self) -> float:
@@ -26,16 +40,25 @@ class Reserva(ABC):
         """Retorna política de cancelación (POLIMORFISMO)"""
         pass
     
-    def agregar_huesped(self, huesped: str):
+    def agregar_huesped(self, huesped: str, version_esperada: int = None):
         """Agrega un huésped a la reserva"""
+        self._verificar_version(version_esperada)
         self._huespedes.append(huesped)
+        self._incrementar_version()
+    
+    def cancelar(self, version_esperada: int = None):
+        """Registra la cancelación en la versión (ConflictoVersionError si cambió)"""
+        self._verificar_version(version_esperada)
+        self._incrementar_version()
+    
+    def obtener_habitaciones(self) -> List:
+        """Retorna todas las habitaciones que ocupa la reserva (POLIMORFISMO)"""
+        return [self.__habitacion]
     
     def __calcular_noches(self) -> int:
         """Calcula número de noches de la reserva (ENCAPSULAMIENTO)"""
         try:
-            fecha_inicio = datetime.strptime(self.__fecha_inicio, "%Y-%m-%d")
-            fecha_fin = datetime.strptime(self.__fecha_fin, "%Y-%m-%d")
-            return (fecha_fin - fecha_inicio).days
+            return fecha_a_ordinal(self.__fecha_fin) - fecha_a_ordinal(self.__fecha_inicio)
         except ValueError:
             return 1  # Valor por defecto si hay error en fechas
     
@@ -110,7 +133,7 @@ class ReservaGrupal(Reserva):
                  descuento_grupo: float = 15.0, coordinador: str = ""):
         # Para grupos, la habitación principal es la primera
         super().__init__(codigo_reserva, fecha_inicio, fecha_fin, habitaciones[0])
-        self.habitaciones = habitaciones  # Lista de habitaciones
+        self.habitaciones = habitaciones  # Tupla de habitaciones
         self.grupo_nombre = grupo_nombre
         self.num_personas = num_personas
         self.descuento_grupo = descuento_grupo
@@ -139,9 +162,16 @@ class ReservaGrupal(Reserva):
         """Política de cancelación: 1 semana"""
         return "Cancelación gratis hasta 1 semana antes. 30% de penalidad dentro de la semana."
     
-    def agregar_habitacion(self, habitacion):
-        """Agrega una habitación al grupo"""
-        self.habitaciones.append(habitacion)
+    def agregar_habitacion(self, habitacion, version_esperada: int = None):
+        """Agrega una habitación al grupo (si la reserva ya está registrada en el hotel,
+        usar HotelService.agregar_habitacion_a_reserva, que valida el calendario)"""
+        self._verificar_version(version_esperada)
+        self._incrementar_version()
+        self.habitaciones += (habitacion,)
+    
+    def obtener_habitaciones(self) -> List:
+        """Todas las habitaciones del grupo, no solo la principal"""
+        return list(self.habitaciones)
     
     def __str__(self):
         return (f"Grupal: {self.codigo_reserva} | Grupo: {self.grupo_nombre} | "
@@ -161,7 +191,7 @@ class ReservaCorporativa(Reserva):
         
         # Agregar todos los huéspedes
         for huesped in huespedes:
-            self.agregar_huesped(huesped)
+            self._huespedes.append(huesped)
     
     def calcular_costo_total(self) -> float:
         """Calcula costo total con descuento corporativo (20%)"""
@@ -199,7 +229,7 @@ class PaqueteTuristico(Reserva):
         
         # Agregar todos los huéspedes
         for huesped in huespedes:
-            self.agregar_huesped(huesped)
+            self._huespedes.append(huesped)
     
     def calcular_costo_total(self) -> float:
         """Calcula costo total del paquete completo"""
@@ -2,8 +2,10 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import List
 
+from models.observable import Observable
 
-class ServicioHotel(ABC):
+
+class ServicioHotel(Observable, ABC):
     """Clase abstracta base para todos los servicios (ABSTRACCION)"""
     
     def __init__(self, codigo_servicio: str, nombre: str, habitacion_solicitante: int):
@@ -15,6 +17,7 @@ class ServicioHotel(ABC):
         
         # Atributo protegido
         self._horario_disponible = "07:00-22:00"  # Horario por defecto
+        self._observadores = []
     
     @abstractmethod
     def calcular_costo(self) -> float:
@@ -32,6 +35,7 @@ class ServicioHotel(ABC):
             self.__fecha_solicitud = fecha_hora
         else:
             self.__fecha_solicitud = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self._notificar("solicitud", fecha_solicitud=self.__fecha_solicitud)
     
     def __aplicar_recargo_nocturno(self, costo_base: float, hora: str) -> float:
         """Aplica recargo por servicio nocturno (ENCAPSULAMIENTO)"""
@@ -0,0 +1,25 @@
+class ConflictoVersionError(Exception):
+    """La entidad cambió desde que se leyó (control de concurrencia optimista)"""
+    
+    def __init__(self, entidad, version_esperada: int, version_actual: int):
+        self.entidad = entidad
+        self.version_esperada = version_esperada
+        self.version_actual = version_actual
+        super().__init__(f"Conflicto de versión en {entidad}: se esperaba "
+                         f"v{version_esperada} pero la actual es v{version_actual}")
+
+
+class Versionado:
+    """Versión monótona creciente por entidad para detectar escrituras concurrentes"""
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def _verificar_version(self, version_esperada):
+        """Falla rápido si la versión esperada no coincide (None = sin verificación)"""
+        if version_esperada is not None and version_esperada != self._version:
+            raise ConflictoVersionError(self, version_esperada, self._version)
+    
+    def _incrementar_version(self):
+        self._version += 1
@@ -0,0 +1,87 @@
+import heapq
+import json
+import sys
+from datetime import date
+
+from utils.validaciones import fecha_a_ordinal
+
+
+class AuditoriaService:
+    """Auditorías sobre el libro completo de reservas"""
+    
+    def __init__(self, hotel_service):
+        self.hotel_service = hotel_service
+    
+    def detectar_solapamientos(self, reservas=None):
+        """Genera cada par de reservas que ocupa la misma habitación en noches comunes.
+        
+        Expande cada reserva a sus habitaciones (todas, en las grupales), ordena
+        una vez por (habitación, inicio) y barre cada habitación con un heap de
+        fechas de fin: O(n log n + k) para k conflictos. Las noches son
+        [inicio, fin), igual que en el calendario de disponibilidad.
+        """
+        if reservas is None:
+            reservas = self.hotel_service.reservas
+        
+        reservas = list(reservas)
+        intervalos = []
+        ordinales = {}  # Las fechas se repiten mucho: cada cadena se convierte una sola vez
+        for posicion, reserva in enumerate(reservas):
+            try:
+                inicio = ordinales.get(reserva.fecha_inicio)
+                if inicio is None:
+                    inicio = ordinales[reserva.fecha_inicio] = fecha_a_ordinal(reserva.fecha_inicio)
+                fin = ordinales.get(reserva.fecha_fin)
+                if fin is None:
+                    fin = ordinales[reserva.fecha_fin] = fecha_a_ordinal(reserva.fecha_fin)
+            except ValueError:
+                continue
+            if fin <= inicio:
+                continue
+            for habitacion in reserva.obtener_habitaciones():
+                intervalos.append((habitacion.numero, inicio, fin, posicion))
+        intervalos.sort()
+        
+        habitacion_actual = None
+        en_curso = []  # heap (fin, posicion) de la habitación actual
+        for numero, inicio, fin, posicion in intervalos:
+            if numero != habitacion_actual:
+                habitacion_actual = numero
+                en_curso = []
+            
+            while en_curso and en_curso[0][0] <= inicio:
+                heapq.heappop(en_curso)
+            
+            for fin_otra, otra in en_curso:
+                yield {
+                    "habitacion": numero,
+                    "reserva_a": reservas[otra],
+                    "reserva_b": reservas[posicion],
+                    "desde": date.fromordinal(inicio).strftime("%Y-%m-%d"),
+                    "hasta": date.fromordinal(min(fin, fin_otra)).strftime("%Y-%m-%d")
+                }
+            heapq.heappush(en_curso, (fin, posicion))
+    
+    def reporte_solapamientos(self, destino=None, formato: str = "texto", reservas=None) -> int:
+        """Escribe los conflictos a medida que aparecen (texto o JSON por línea); retorna cuántos hubo"""
+        destino = destino or sys.stdout
+        total = 0
+        
+        for conflicto in self.detectar_solapamientos(reservas):
+            total += 1
+            a, b = conflicto["reserva_a"], conflicto["reserva_b"]
+            if formato == "json":
+                destino.write(json.dumps({
+                    "habitacion": conflicto["habitacion"],
+                    "reserva_a": a.codigo_reserva,
+                    "reserva_b": b.codigo_reserva,
+                    "desde": conflicto["desde"],
+                    "hasta": conflicto["hasta"]
+                }, ensure_ascii=False) + "\n")
+            else:
+                destino.write(f"⚠️  Hab. {conflicto['habitacion']}: {a.codigo_reserva} "
+                              f"({a.fecha_inicio} al {a.fecha_fin}) se cruza con {b.codigo_reserva} "
+                              f"({b.fecha_inicio} al {b.fecha_fin}) "
+                              f"(noches del {conflicto['desde']} al {conflicto['hasta']})\n")
+        
+        return total
@@ -0,0 +1,34 @@
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class BloqueosHabitacion:
+    """Lock striping por número de habitación para reservas concurrentes"""
+    
+    def __init__(self, num_franjas: int = 64):
+        # RLock: una operación puede anidar otra sobre la misma habitación
+        self._franjas = [threading.RLock() for _ in range(num_franjas)]
+    
+    def _franja(self, numero) -> int:
+        return hash(numero) % len(self._franjas)
+    
+    @contextmanager
+    def bloquear(self, numeros):
+        """Adquiere las franjas de varias habitaciones en orden fijo (evita deadlocks)"""
+        indices = sorted({self._franja(numero) for numero in numeros})
+        adquiridos = []
+        try:
+            for indice in indices:
+                self._franjas[indice].acquire()
+                adquiridos.append(indice)
+            yield
+        finally:
+            for indice in reversed(adquiridos):
+                self._franjas[indice].release()
+
+
+class SinBloqueos:
+    """Versión sin sincronización para el modo de un solo hilo"""
+    
+    def bloquear(self, numeros):
+        return nullcontext()
@@ -0,0 +1,72 @@
+import copy
+import threading
+from collections import OrderedDict
+
+
+class CacheReportes:
+    """Resultados de reportes por (nombre, parámetros, versión de datos), con desalojo LRU.
+    
+    La versión de datos cambia con cada mutación del hotel, así que un
+    resultado guardado solo se reutiliza mientras los datos no cambiaron. Al
+    ver una versión nueva se descartan todas las entradas: ya nadie puede
+    pedirlas. Se entregan copias para que quien llama pueda modificar el
+    reporte sin alterar la caché.
+    """
+    
+    def __init__(self, capacidad: int = 128):
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()  # (nombre, parametros, version) -> resultado
+        self._version = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+    
+    def obtener(self, nombre: str, parametros: tuple, version: int, calcular):
+        """Resultado en caché o, si falta, el de calcular() (que queda guardado)"""
+        clave = (nombre, parametros, version)
+        with self._lock:
+            if version != self._version:
+                self._entradas.clear()
+                self._version = version
+            
+            resultado = self._entradas.get(clave)
+            if resultado is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(resultado)
+            self.fallos += 1
+        
+        # Se calcula fuera del lock: un reporte lento no bloquea los aciertos de otros
+        resultado = calcular()
+        
+        with self._lock:
+            if version == self._version:
+                self._entradas[clave] = copy.deepcopy(resultado)
+                self._entradas.move_to_end(clave)
+                while len(self._entradas) > self.capacidad:
+                    self._entradas.popitem(last=False)
+                    self.desalojos += 1
+        return resultado
+    
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+    
+    def estadisticas(self):
+        """Aciertos, fallos, desalojos, tamaño actual y tasa de aciertos (%)"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tamaño": len(self._entradas),
+                "capacidad": self.capacidad,
+                "tasa_aciertos": (self.aciertos / consultas * 100) if consultas else 0.0
+            }
+    
+    def __len__(self):
+        return len(self._entradas)
@@ -0,0 +1,210 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from service.hotel_service import HotelService
+from service.reserva_service import ReservaService
+from storage.json_storage import JSONStorage
+from utils.agregados import combinar
+
+
+# ========== CONSULTAS PARCIALES (se ejecutan dentro de cada propiedad) ==========
+# Funciones de módulo para que puedan enviarse a un proceso trabajador. Cada una
+# retorna un agregado parcial que se combina con los de las demás propiedades.
+
+def parcial_disponibilidad(hotel, fecha_inicio: str = None, fecha_fin: str = None):
+    """Habitaciones libres (hoy por estado, o en un rango de fechas) por tipo"""
+    if fecha_inicio and fecha_fin:
+        libres = hotel.obtener_habitaciones_libres(fecha_inicio, fecha_fin)
+    else:
+        libres = hotel.obtener_habitaciones_disponibles()
+    
+    por_tipo = {}
+    for habitacion in libres:
+        tipo = habitacion.__class__.__name__
+        por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+    return {"total": len(libres), "por_tipo": por_tipo,
+            "numeros": sorted(h.numero for h in libres)}
+
+
+def parcial_ocupacion(hotel):
+    """Contadores de ocupación por tipo y estado"""
+    return hotel.generar_reporte_ocupacion()
+
+
+def parcial_ocupacion_fecha(hotel, fecha: str):
+    """Habitaciones ocupadas en una fecha y total (misma semántica que ReservaService)"""
+    ocupacion = ReservaService(hotel).calcular_ocupacion_fecha(fecha)
+    if not ocupacion:
+        return {"habitaciones_ocupadas": 0, "habitaciones_totales": 0}
+    return {"habitaciones_ocupadas": ocupacion["habitaciones_ocupadas"],
+            "habitaciones_totales": ocupacion["habitaciones_totales"]}
+
+
+def parcial_ingresos(hotel):
+    """Ingresos potenciales por tipo e ingresos de reservas"""
+    return {
+        "potenciales_por_tipo": hotel.calcular_ingresos_potenciales(),
+        "reservas": sum(r.calcular_costo_total() for r in hotel.reservas),
+        "num_reservas": len(hotel.reservas)
+    }
+
+
+def parcial_nomina(hotel):
+    """Nómina mensual y número de empleados"""
+    return {"total": hotel.calcular_nomina_mensual(), "empleados": len(hotel.empleados)}
+
+
+def guardar_propiedad(hotel):
+    return hotel.guardar()
+
+
+# ========== PROPIEDADES ==========
+_hotel_trabajador = None  # HotelService del proceso trabajador
+
+
+def _iniciar_trabajador(data_dir: str, concurrente: bool):
+    global _hotel_trabajador
+    _hotel_trabajador = HotelService(concurrente=concurrente, storage=JSONStorage(data_dir))
+
+
+def _ejecutar_en_trabajador(funcion, args, kwargs):
+    return funcion(_hotel_trabajador, *args, **kwargs)
+
+
+class PropiedadLocal:
+    """Propiedad atendida en el mismo proceso"""
+    
+    def __init__(self, hotel_service):
+        self.hotel_service = hotel_service
+    
+    def ejecutar(self, funcion, *args, **kwargs) -> Future:
+        futuro = Future()
+        try:
+            futuro.set_result(funcion(self.hotel_service, *args, **kwargs))
+        except Exception as error:
+            futuro.set_exception(error)
+        return futuro
+    
+    def cerrar(self):
+        pass
+
+
+class PropiedadRemota:
+    """Propiedad atendida por su propio proceso trabajador (datos en su directorio)"""
+    
+    def __init__(self, data_dir: str, concurrente: bool = False):
+        self.data_dir = data_dir
+        self._ejecutor = ProcessPoolExecutor(max_workers=1, initializer=_iniciar_trabajador,
+                                             initargs=(data_dir, concurrente))
+    
+    def ejecutar(self, funcion, *args, **kwargs) -> Future:
+        """funcion debe ser de módulo (serializable); los resultados viajan por pickle"""
+        return self._ejecutor.submit(_ejecutar_en_trabajador, funcion, args, kwargs)
+    
+    def cerrar(self):
+        self._ejecutor.shutdown()
+
+
+# ========== COORDINADOR ==========
+class CadenaHotelera:
+    """Coordina varias propiedades, cada una con su propio HotelService.
+    
+    Las consultas de la cadena se reparten a todas las propiedades a la vez
+    (las remotas trabajan en paralelo, una por proceso) y se combinan sus
+    agregados parciales.
+    """
+    
+    def __init__(self):
+        self.propiedades = {}  # nombre -> PropiedadLocal | PropiedadRemota
+    
+    def agregar_propiedad(self, nombre: str, hotel_service=None, data_dir: str = None,
+                          en_proceso: bool = False, concurrente: bool = False) -> bool:
+        """Registra una propiedad: un HotelService ya creado, o uno que carga de data_dir
+        (en este proceso o, con en_proceso=True, en un proceso trabajador propio)"""
+        if nombre in self.propiedades:
+            return False
+        
+        if en_proceso:
+            if not data_dir:
+                raise ValueError("Una propiedad en proceso propio necesita data_dir")
+            propiedad = PropiedadRemota(data_dir, concurrente)
+        else:
+            if hotel_service is None:
+                storage = JSONStorage(data_dir) if data_dir else None
+                hotel_service = HotelService(concurrente=concurrente, storage=storage)
+            propiedad = PropiedadLocal(hotel_service)
+        
+        self.propiedades[nombre] = propiedad
+        return True
+    
+    def ejecutar_en(self, nombre: str, funcion, *args, **kwargs):
+        """Ejecuta funcion(hotel_service, ...) en una propiedad y retorna su resultado"""
+        return self.propiedades[nombre].ejecutar(funcion, *args, **kwargs).result()
+    
+    def repartir(self, funcion, *args, **kwargs):
+        """Ejecuta funcion en todas las propiedades; retorna {nombre: parcial}"""
+        futuros = {nombre: propiedad.ejecutar(funcion, *args, **kwargs)
+                   for nombre, propiedad in self.propiedades.items()}
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    
+    def _agregar(self, funcion, *args, **kwargs):
+        """Reparte la consulta y combina los parciales"""
+        parciales = self.repartir(funcion, *args, **kwargs)
+        total = {}
+        for parcial in parciales.values():
+            total = combinar(total, parcial)
+        return total, parciales
+    
+    # ========== CONSULTAS DE LA CADENA ==========
+    def disponibilidad(self, fecha_inicio: str = None, fecha_fin: str = None):
+        """Habitaciones libres en toda la cadena (por tipo y por propiedad)"""
+        total, parciales = self._agregar(parcial_disponibilidad, fecha_inicio, fecha_fin)
+        return {
+            "total": total.get("total", 0),
+            "por_tipo": total.get("por_tipo", {}),
+            "por_propiedad": {nombre: p["numeros"] for nombre, p in parciales.items()}
+        }
+    
+    def reporte_ocupacion(self):
+        """Reporte de ocupación por tipo de toda la cadena"""
+        total, parciales = self._agregar(parcial_ocupacion)
+        return {"cadena": total, "por_propiedad": parciales}
+    
+    def ocupacion_fecha(self, fecha: str):
+        """Porcentaje de ocupación de la cadena en una fecha"""
+        total, parciales = self._agregar(parcial_ocupacion_fecha, fecha)
+        if not total or not total["habitaciones_totales"]:
+            return None
+        
+        porcentaje = total["habitaciones_ocupadas"] / total["habitaciones_totales"] * 100
+        return {"fecha": fecha, **total, "porcentaje_ocupacion": round(porcentaje, 2),
+                "por_propiedad": parciales}
+    
+    def ingresos(self):
+        """Ingresos potenciales (por tipo) y de reservas de toda la cadena"""
+        total, parciales = self._agregar(parcial_ingresos)
+        total = {"potenciales_por_tipo": {}, "reservas": 0, "num_reservas": 0, **total}
+        total["potenciales_diarios"] = sum(total["potenciales_por_tipo"].values())
+        total["por_propiedad"] = parciales
+        return total
+    
+    def nomina(self):
+        """Nómina mensual de toda la cadena"""
+        total, parciales = self._agregar(parcial_nomina)
+        total = {"total": 0, "empleados": 0, **total}
+        total["por_propiedad"] = parciales
+        return total
+    
+    def guardar(self) -> bool:
+        """Persiste cada propiedad en su almacenamiento"""
+        return all(self.repartir(guardar_propiedad).values())
+    
+    def cerrar(self):
+        """Detiene los procesos trabajadores"""
+        for propiedad in self.propiedades.values():
+            propiedad.cerrar()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,136 @@
+from bisect import bisect_left
+
+from utils.validaciones import fecha_a_ordinal
+
+
+class CalendarioDisponibilidad:
+    """Calendario de disponibilidad: lista ordenada de intervalos [inicio, fin) por habitación.
+    
+    Junto a cada lista se mantiene el máximo acumulado de las fechas fin, así
+    la consulta sigue siendo correcta aunque haya intervalos solapados (los
+    datos guardados se cargan con forzar=True y pueden traerlos).
+    """
+    
+    def __init__(self):
+        # numero -> lista ordenada de (inicio, fin, codigo) en ordinales de día
+        self._intervalos = {}
+        # numero -> fin_maximo[i] = mayor fin entre intervalos[0..i]
+        self._fin_maximo = {}
+    
+    @staticmethod
+    def _rango(fecha_inicio: str, fecha_fin: str):
+        """Convierte fechas a (inicio, fin) ordinal; lanza ValueError si no son válidas"""
+        inicio = fecha_a_ordinal(fecha_inicio)
+        fin = fecha_a_ordinal(fecha_fin)
+        if fin <= inicio:
+            raise ValueError("La fecha fin debe ser posterior a la fecha inicio")
+        return inicio, fin
+    
+    def _libre(self, numero: int, inicio: int, fin: int) -> bool:
+        """Búsqueda binaria + máximo acumulado de fechas fin (O(log n))"""
+        intervalos = self._intervalos.get(numero)
+        if not intervalos:
+            return True
+        
+        # Primer intervalo que empieza en o después de 'fin'; de los anteriores
+        # basta el que termina más tarde
+        posicion = bisect_left(intervalos, (fin,))
+        return posicion == 0 or self._fin_maximo[numero][posicion - 1] <= inicio
+    
+    def _insertar(self, numero: int, intervalo):
+        intervalos = self._intervalos.setdefault(numero, [])
+        maximos = self._fin_maximo.setdefault(numero, [])
+        posicion = bisect_left(intervalos, intervalo)
+        intervalos.insert(posicion, intervalo)
+        
+        fin = intervalo[1]
+        maximos.insert(posicion, max(fin, maximos[posicion - 1]) if posicion else fin)
+        # Los siguientes solo cambian mientras su máximo sea menor que este fin
+        for i in range(posicion + 1, len(maximos)):
+            if maximos[i] >= fin:
+                break
+            maximos[i] = fin
+    
+    def _quitar(self, numero: int, posicion: int):
+        intervalos = self._intervalos[numero]
+        maximos = self._fin_maximo[numero]
+        del intervalos[posicion]
+        del maximos[posicion]
+        
+        # Se recalcula hasta que el máximo coincida con el que ya estaba
+        anterior = maximos[posicion - 1] if posicion else None
+        for i in range(posicion, len(maximos)):
+            nuevo = intervalos[i][1] if anterior is None else max(anterior, intervalos[i][1])
+            if nuevo == maximos[i]:
+                break
+            maximos[i] = anterior = nuevo
+    
+    def esta_libre(self, numero: int, fecha_inicio: str, fecha_fin: str) -> bool:
+        """Indica si la habitación está libre para todas las noches de [inicio, fin)"""
+        inicio, fin = self._rango(fecha_inicio, fecha_fin)
+        return self._libre(numero, inicio, fin)
+    
+    def habitaciones_libres(self, numeros, fecha_inicio: str, fecha_fin: str):
+        """Filtra los números de habitación libres para el rango dado"""
+        inicio, fin = self._rango(fecha_inicio, fecha_fin)
+        return [numero for numero in numeros if self._libre(numero, inicio, fin)]
+    
+    def conflictos_lote(self, solicitudes):
+        """Valida un lote de (indice, numeros, inicio, fin) contra el calendario y entre sí.
+        
+        Agrupa por habitación y ordena una sola vez; retorna dict indice -> mensaje.
+        """
+        por_habitacion = {}
+        for indice, numeros, inicio, fin in solicitudes:
+            for numero in numeros:
+                por_habitacion.setdefault(numero, []).append((inicio, fin, indice))
+        
+        conflictos = {}
+        for numero, intervalos in por_habitacion.items():
+            intervalos.sort()
+            fin_anterior, indice_anterior = None, None
+            
+            for inicio, fin, indice in intervalos:
+                if not self._libre(numero, inicio, fin):
+                    conflictos.setdefault(indice, f"Habitación {numero} ya reservada en esas fechas")
+                elif fin_anterior is not None and inicio < fin_anterior:
+                    conflictos.setdefault(indice, f"Habitación {numero} solapada con la solicitud {indice_anterior}")
+                
+                if fin_anterior is None or fin > fin_anterior:
+                    fin_anterior, indice_anterior = fin, indice
+        
+        return conflictos
+    
+    def agregar_reserva(self, reserva, forzar: bool = False) -> bool:
+        """Registra la reserva en todas sus habitaciones; rechaza solapamientos salvo con forzar"""
+        try:
+            inicio, fin = self._rango(reserva.fecha_inicio, reserva.fecha_fin)
+        except ValueError:
+            return False
+        
+        numeros = [h.numero for h in reserva.obtener_habitaciones()]
+        if not forzar and not all(self._libre(n, inicio, fin) for n in numeros):
+            return False
+        
+        for numero in numeros:
+            self._insertar(numero, (inicio, fin, reserva.codigo_reserva))
+        return True
+    
+    def eliminar_reserva(self, reserva):
+        """Libera los intervalos de la reserva en todas sus habitaciones"""
+        try:
+            inicio, fin = self._rango(reserva.fecha_inicio, reserva.fecha_fin)
+        except ValueError:
+            return
+        
+        intervalo = (inicio, fin, reserva.codigo_reserva)
+        for habitacion in reserva.obtener_habitaciones():
+            intervalos = self._intervalos.get(habitacion.numero, [])
+            posicion = bisect_left(intervalos, intervalo)
+            if posicion < len(intervalos) and intervalos[posicion] == intervalo:
+                self._quitar(habitacion.numero, posicion)
+    
+    def cargar(self, reservas):
+        """Construye el calendario desde reservas existentes (los conflictos previos no se rechazan)"""
+        for reserva in reservas:
+            self.agregar_reserva(reserva, forzar=True)
@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+from collections import deque
+
+
+# ========== EVENTOS DE DOMINIO ==========
+class Evento:
+    """Evento de dominio base; suscribirse a Evento recibe todos los eventos"""
+    
+    def __init__(self):
+        self.marca_tiempo = time.time()
+    
+    def __str__(self):
+        return self.__class__.__name__
+
+
+class HabitacionEstadoCambiado(Evento):
+    def __init__(self, habitacion, anterior: str, nuevo: str):
+        super().__init__()
+        self.habitacion = habitacion
+        self.anterior = anterior
+        self.nuevo = nuevo
+    
+    def __str__(self):
+        return f"Habitación {self.habitacion.numero}: {self.anterior} -> {self.nuevo}"
+
+
+class HabitacionModificada(Evento):
+    """Cambió un atributo que interviene en la tarifa de la habitación"""
+    
+    def __init__(self, habitacion, atributo: str):
+        super().__init__()
+        self.habitacion = habitacion
+        self.atributo = atributo
+    
+    def __str__(self):
+        return f"Habitación {self.habitacion.numero}: cambió {self.atributo}"
+
+
+class ReservaCreada(Evento):
+    def __init__(self, reserva):
+        super().__init__()
+        self.reserva = reserva
+    
+    def __str__(self):
+        return f"Reserva creada: {self.reserva.codigo_reserva}"
+
+
+class ReservaCancelada(Evento):
+    def __init__(self, reserva):
+        super().__init__()
+        self.reserva = reserva
+    
+    def __str__(self):
+        return f"Reserva cancelada: {self.reserva.codigo_reserva}"
+
+
+class ReservaModificada(Evento):
+    """Cambió algo que interviene en el costo o las habitaciones de una reserva registrada"""
+    
+    def __init__(self, reserva, atributo: str):
+        super().__init__()
+        self.reserva = reserva
+        self.atributo = atributo
+    
+    def __str__(self):
+        return f"Reserva {self.reserva.codigo_reserva}: cambió {self.atributo}"
+
+
+class HuespedAgregado(Evento):
+    def __init__(self, reserva, huesped: str):
+        super().__init__()
+        self.reserva = reserva
+        self.huesped = huesped
+    
+    def __str__(self):
+        return f"Huésped {self.huesped} agregado a {self.reserva.codigo_reserva}"
+
+
+class EvaluacionRegistrada(Evento):
+    def __init__(self, empleado, evaluacion: dict):
+        super().__init__()
+        self.empleado = empleado
+        self.evaluacion = evaluacion
+    
+    def __str__(self):
+        return f"Evaluación de {self.empleado.codigo}: {self.evaluacion['calificacion']}"
+
+
+class EmpleadoContratado(Evento):
+    def __init__(self, empleado):
+        super().__init__()
+        self.empleado = empleado
+    
+    def __str__(self):
+        return f"Empleado contratado: {self.empleado.codigo}"
+
+
+class EmpleadoModificado(Evento):
+    """Cambió un atributo que interviene en el salario del empleado"""
+    
+    def __init__(self, empleado, atributo: str):
+        super().__init__()
+        self.empleado = empleado
+        self.atributo = atributo
+    
+    def __str__(self):
+        return f"Empleado {self.empleado.codigo}: cambió {self.atributo}"
+
+
+class SolicitudServicioRegistrada(Evento):
+    def __init__(self, servicio, fecha_solicitud: str):
+        super().__init__()
+        self.servicio = servicio
+        self.fecha_solicitud = fecha_solicitud
+    
+    def __str__(self):
+        return f"Solicitud de servicio {self.servicio.codigo_servicio} ({self.fecha_solicitud})"
+
+
+# ========== BUS DE EVENTOS ==========
+class BusEventos:
+    """Bus de eventos en proceso con suscriptores síncronos y asíncronos (cola)"""
+    
+    def __init__(self):
+        self._sincronos = {}   # tipo -> [manejador]
+        self._asincronos = {}  # tipo -> [manejador]
+        self._cache = {}       # tipo concreto -> (sincronos, asincronos) resueltos por MRO
+        self._cola = queue.Queue()
+        self._hilo = None
+        self._lock = threading.Lock()
+    
+    def suscribir(self, tipo_evento, manejador, asincrono: bool = False):
+        """Suscribe un manejador a un tipo de evento (y sus subclases)"""
+        with self._lock:
+            destino = self._asincronos if asincrono else self._sincronos
+            destino.setdefault(tipo_evento, []).append(manejador)
+            self._cache.clear()
+        
+        if asincrono:
+            self._iniciar_hilo()
+    
+    def desuscribir(self, tipo_evento, manejador):
+        with self._lock:
+            for destino in (self._sincronos, self._asincronos):
+                if manejador in destino.get(tipo_evento, []):
+                    destino[tipo_evento].remove(manejador)
+            self._cache.clear()
+    
+    def _resolver(self, tipo):
+        """Manejadores para un tipo concreto, calculados una vez por tipo"""
+        resueltos = self._cache.get(tipo)
+        if resueltos is None:
+            with self._lock:
+                sincronos = [m for base in tipo.__mro__ for m in self._sincronos.get(base, [])]
+                asincronos = [m for base in tipo.__mro__ for m in self._asincronos.get(base, [])]
+                resueltos = self._cache[tipo] = (sincronos, asincronos)
+        return resueltos
+    
+    def publicar(self, evento):
+        """Entrega el evento: síncronos en el acto, asíncronos a la cola"""
+        sincronos, asincronos = self._resolver(type(evento))
+        
+        for manejador in sincronos:
+            manejador(evento)
+        for manejador in asincronos:
+            self._cola.put((manejador, evento))
+    
+    @property
+    def hilo_activo(self) -> bool:
+        """True si ya arrancó el hilo que atiende a los suscriptores asíncronos"""
+        return self._hilo is not None
+    
+    def _iniciar_hilo(self):
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._procesar_cola, daemon=True)
+                self._hilo.start()
+    
+    def _procesar_cola(self):
+        while True:
+            manejador, evento = self._cola.get()
+            try:
+                manejador(evento)
+            except Exception as e:
+                print(f"❌ Error en suscriptor asíncrono de {evento}: {e}")
+            finally:
+                self._cola.task_done()
+    
+    def esperar(self):
+        """Bloquea hasta que la cola asíncrona quede vacía"""
+        self._cola.join()
+
+
+class RegistroAuditoria:
+    """Bitácora de auditoría alimentada por el bus (suscriptor asíncrono)"""
+    
+    def __init__(self, bus: BusEventos, max_registros: int = 10000):
+        self.registros = deque(maxlen=max_registros)
+        bus.suscribir(Evento, self._registrar, asincrono=True)
+    
+    def _registrar(self, evento):
+        fecha = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(evento.marca_tiempo))
+        self.registros.append(f"[{fecha}] {evento}")
@@ -2,17 +2,225 @@ from models.habitacion import *
 from models.reserva import *
 from models.servicio import *
 from models.empleado import *
+import itertools
+import threading
+import time
+from contextlib import nullcontext
+
+from service.bloqueos import BloqueosHabitacion, SinBloqueos
+from service.indice_habitaciones import IndiceHabitaciones
+from service.calendario_disponibilidad import CalendarioDisponibilidad
+from service.mapa_ocupacion import MapaOcupacion
+from service.registro_reservas import RegistroReservas
+from service.eventos import (BusEventos, Evento, HabitacionEstadoCambiado, HabitacionModificada,
+                             ReservaCreada, ReservaCancelada, ReservaModificada, HuespedAgregado,
+                             EvaluacionRegistrada, EmpleadoModificado, EmpleadoContratado,
+                             SolicitudServicioRegistrada)
+from service.indices_reservas import IndiceHuespedes, IndiceMensual
+from service.linea_ocupacion import LineaOcupacion
+from service.reservas_activas import ReservasActivas
+from service.vistas_reportes import VistaIngresos, VistaNomina
+from storage.serializacion import (habitacion_desde_dict, reserva_desde_dict, empleado_desde_dict,
+                                   servicio_desde_dict)
+from utils.validaciones import validar_fecha, obtener_fecha_actual, fecha_a_ordinal
 
 
 class HotelService:
     """Servicio principal del hotel - Coordina todas las operaciones"""
     
-    def __init__(self):
-        self.habitaciones = []
-        self.reservas = []
-        self.servicios = []
-        self.empleados = []
-        self._inicializar_datos()
+    # Tipos aceptados por crear_reservas_lote
+    TIPOS_RESERVA = {
+        "individual": ReservaIndividual,
+        "grupal": ReservaGrupal,
+        "corporativa": ReservaCorporativa,
+        "paquete": PaqueteTuristico
+    }
+    
+    def __init__(self, concurrente: bool = False, storage=None, datos_ejemplo: bool = None,
+                 verbose: bool = False):
+        """Con 'storage' arranca sin datos de ejemplo e hidrata cada colección
+        desde el almacenamiento la primera vez que se usa (arranque rápido).
+        Con 'verbose' informa los tiempos de arranque y de hidratación.
+        """
+        inicio = time.perf_counter()
+        self.verbose = verbose
+        
+        # Modo concurrente: locks por habitación (striping) + lock global corto para índices
+        self.concurrente = concurrente
+        self._bloqueos = BloqueosHabitacion() if concurrente else SinBloqueos()
+        self._lock_indices = threading.RLock() if concurrente else nullcontext()
+        
+        # Bus de eventos de dominio: índices, reportes y auditoría se suscriben aquí
+        self.eventos = BusEventos()
+        
+        # Versión global de los datos: cambia con cada evento o alta/baja sin evento propio
+        # (la caché de reportes la usa para saber si un resultado sigue vigente)
+        self._versiones = itertools.count(1)
+        self._version_datos = 0
+        self.eventos.suscribir(Evento, lambda e: self._nueva_version())
+        
+        self._habitaciones = []
+        self._reservas = RegistroReservas()  # Índice por código con bajas O(1)
+        self._servicios = []
+        self._empleados = []
+        self._indice_habitaciones = IndiceHabitaciones(self._lock_indices)
+        self.calendario = CalendarioDisponibilidad()
+        self.mapa_ocupacion = None  # Opcional, ver habilitar_mapa_ocupacion
+        self._indice_huespedes = None  # Se construye en la primera búsqueda por huésped
+        self._linea_ocupacion = None   # Se construye en la primera consulta de ocupación por fecha
+        self._indice_mensual = None    # Se construye en el primer reporte mensual
+        self._reservas_activas = None  # Barrido de reservas en curso, en la primera consulta
+        self._vista_ingresos = None    # Vistas materializadas de reportes, en el primer reporte
+        self._vista_nomina = None
+        
+        # Agregados cacheados: tarifa/salario ya sumado por entidad + entidades por recalcular
+        # (None = aún no construidos; ver calcular_ingresos_potenciales / calcular_nomina_mensual)
+        self._tarifas = None
+        self._ingresos_por_tipo = {}
+        self._tarifas_pendientes = {}
+        self._salarios = None
+        self._nomina_total = 0
+        self._salarios_pendientes = {}
+        
+        # Colecciones que aún deben cargarse desde el almacenamiento
+        self.storage = storage
+        self._por_hidratar = {"habitaciones", "reservas", "empleados", "servicios"} if storage else set()
+        
+        if datos_ejemplo if datos_ejemplo is not None else storage is None:
+            self._inicializar_datos()
+        
+        if verbose:
+            duracion = (time.perf_counter() - inicio) * 1000
+            modo = f"carga diferida desde {storage.data_dir}" if storage else "datos en memoria"
+            print(f"⏱️  Sistema listo en {duracion:.1f} ms ({modo})")
+    
+    # ========== HIDRATACION DIFERIDA ==========
+    @property
+    def habitaciones(self):
+        if "habitaciones" in self._por_hidratar:
+            self._hidratar_habitaciones()
+        return self._habitaciones
+    
+    @property
+    def reservas(self):
+        """Tupla de reservas vigentes (para registrar o cancelar, usar los métodos del servicio)"""
+        if "reservas" in self._por_hidratar:
+            self._hidratar_reservas()
+        with self._lock_indices:
+            return self._reservas.lista()
+    
+    @property
+    def empleados(self):
+        if "empleados" in self._por_hidratar:
+            self._hidratar_empleados()
+        return self._empleados
+    
+    @property
+    def servicios(self):
+        if "servicios" in self._por_hidratar:
+            self._hidratar_servicios()
+        return self._servicios
+    
+    @property
+    def version_datos(self) -> int:
+        """Cambia cada vez que se modifican los datos del hotel"""
+        return self._version_datos
+    
+    def _nueva_version(self):
+        self._version_datos = next(self._versiones)  # next() es atómico: no se pierden cambios
+    
+    def _asegurar_habitaciones(self):
+        if "habitaciones" in self._por_hidratar:
+            self._hidratar_habitaciones()
+    
+    def _asegurar_reservas(self):
+        if "reservas" in self._por_hidratar:
+            self._hidratar_reservas()
+    
+    def _asegurar_empleados(self):
+        if "empleados" in self._por_hidratar:
+            self._hidratar_empleados()
+    
+    def _asegurar_servicios(self):
+        if "servicios" in self._por_hidratar:
+            self._hidratar_servicios()
+    
+    def _hidratar_habitaciones(self):
+        """Carga habitaciones del almacenamiento en el primer acceso"""
+        with self._lock_indices:
+            if "habitaciones" not in self._por_hidratar:
+                return
+            self._por_hidratar.discard("habitaciones")
+            
+            inicio = time.perf_counter()
+            for datos in self.storage.cargar_habitaciones():
+                self.agregar_habitacion(habitacion_desde_dict(datos))
+            if self.verbose:
+                print(f"⏱️  Habitaciones hidratadas en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    
+    def _hidratar_reservas(self):
+        """Carga reservas (y su calendario) en el primer acceso"""
+        self._asegurar_habitaciones()
+        with self._lock_indices:
+            if "reservas" not in self._por_hidratar:
+                return
+            self._por_hidratar.discard("reservas")
+            
+            inicio = time.perf_counter()
+            habitaciones = {h.numero: h for h in self._habitaciones}
+            for datos in self.storage.cargar_reservas():
+                try:
+                    reserva = reserva_desde_dict(datos, habitaciones)
+                except KeyError:
+                    print(f"❌ Reserva {datos.get('codigo_reserva')} ignorada: habitación inexistente")
+                    continue
+                if not self._reservas.agregar(reserva):
+                    print(f"❌ Reserva {reserva.codigo_reserva} ignorada: código duplicado")
+                    continue
+                reserva.registrar_observador(self._publicar_cambio)
+            
+            # Los datos guardados se aceptan tal cual (ver auditoría de solapamientos)
+            reservas = self._reservas.lista()
+            self.calendario.cargar(reservas)
+            if self.mapa_ocupacion:
+                self.mapa_ocupacion.cargar_reservas(reservas)
+            if self.verbose:
+                print(f"⏱️  Reservas hidratadas en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    
+    def _hidratar_empleados(self):
+        """Carga empleados en el primer acceso"""
+        with self._lock_indices:
+            if "empleados" not in self._por_hidratar:
+                return
+            self._por_hidratar.discard("empleados")
+            
+            for datos in self.storage.cargar_empleados():
+                self.contratar_empleado(empleado_desde_dict(datos))
+    
+    def _hidratar_servicios(self):
+        """Carga órdenes de servicio en el primer acceso"""
+        with self._lock_indices:
+            if "servicios" not in self._por_hidratar:
+                return
+            self._por_hidratar.discard("servicios")
+            
+            for datos in self.storage.cargar_servicios():
+                self.agregar_servicio(servicio_desde_dict(datos))
+    
+    def guardar(self, storage=None) -> bool:
+        """Persiste las colecciones cargadas (las no hidratadas ya están en disco)"""
+        storage = storage or self.storage
+        exito = True
+        
+        if "habitaciones" not in self._por_hidratar:
+            exito = storage.guardar_habitaciones(self._habitaciones) and exito
+        if "reservas" not in self._por_hidratar:
+            exito = storage.guardar_reservas(self.reservas) and exito
+        if "empleados" not in self._por_hidratar:
+            exito = storage.guardar_empleados(self._empleados) and exito
+        if "servicios" not in self._por_hidratar:
+            exito = storage.guardar_servicios(self._servicios) and exito
+        return exito
     
     def _inicializar_datos(self):
         """Inicializa datos de ejemplo"""
@@ -28,164 +236,618 @@ class HotelService:
     def _crear_habitaciones_ejemplo(self):
         """Crea 3 habitaciones de cada tipo"""
         # 3 Habitaciones Simples
-        self.habitaciones.append(HabitacionSimple(101, 1, True, "jardin", True))
-        self.habitaciones.append(HabitacionSimple(102, 1, True, "calle", False))
-        self.habitaciones.append(HabitacionSimple(103, 1, True, "interior", True))
+        self.agregar_habitacion(HabitacionSimple(101, 1, True, "jardin", True))
+        self.agregar_habitacion(HabitacionSimple(102, 1, True, "calle", False))
+        self.agregar_habitacion(HabitacionSimple(103, 1, True, "interior", True))
         
         # 3 Habitaciones Dobles
-        self.habitaciones.append(HabitacionDoble(201, 2, "2 camas individuales", "calle", True))
-        self.habitaciones.append(HabitacionDoble(202, 2, "cama queen", "marina", True))
-        self.habitaciones.append(HabitacionDoble(203, 2, "cama king", "montaña", True))
+        self.agregar_habitacion(HabitacionDoble(201, 2, "2 camas individuales", "calle", True))
+        self.agregar_habitacion(HabitacionDoble(202, 2, "cama queen", "marina", True))
+        self.agregar_habitacion(HabitacionDoble(203, 2, "cama king", "montaña", True))
         
         # 3 Suites
-        self.habitaciones.append(Suite(301, 3, True, True, True, 2))
-        self.habitaciones.append(Suite(302, 3, True, False, True, 1))
-        self.habitaciones.append(Suite(303, 3, True, True, False, 3))
+        self.agregar_habitacion(Suite(301, 3, True, True, True, 2))
+        self.agregar_habitacion(Suite(302, 3, True, False, True, 1))
+        self.agregar_habitacion(Suite(303, 3, True, True, False, 3))
         
         # 3 Penthouse
-        self.habitaciones.append(Penthouse(401, 4, True, True, True))
-        self.habitaciones.append(Penthouse(402, 4, False, True, False))
-        self.habitaciones.append(Penthouse(403, 4, True, False, True))
+        self.agregar_habitacion(Penthouse(401, 4, True, True, True))
+        self.agregar_habitacion(Penthouse(402, 4, False, True, False))
+        self.agregar_habitacion(Penthouse(403, 4, True, False, True))
     
     def _contratar_personal_ejemplo(self):
         """Contrata personal de ejemplo"""
         # 2 Recepcionistas
-        self.empleados.append(Recepcionista("Ana García", "REC-001", "matutino", 1500, ["español", "inglés"]))
-        self.empleados.append(Recepcionista("Carlos López", "REC-002", "vespertino", 1500, ["español", "inglés", "francés"]))
+        self.contratar_empleado(Recepcionista("Ana García", "REC-001", "matutino", 1500, ["español", "inglés"]))
+        self.contratar_empleado(Recepcionista("Carlos López", "REC-002", "vespertino", 1500, ["español", "inglés", "francés"]))
         
         # 2 Housekeeping
-        self.empleados.append(Housekeeping("María Rodríguez", "HK-001", "matutino", 1200, [101, 102, 103], 1))
-        self.empleados.append(Housekeeping("Pedro Sánchez", "HK-002", "vespertino", 1200, [201, 202, 203], 2))
+        self.contratar_empleado(Housekeeping("María Rodríguez", "HK-001", "matutino", 1200, [101, 102, 103], 1))
+        self.contratar_empleado(Housekeeping("Pedro Sánchez", "HK-002", "vespertino", 1200, [201, 202, 203], 2))
         
         # 2 Mantenimiento
-        self.empleados.append(Mantenimiento("Juan Martínez", "MT-001", "nocturno", 1300, "electricidad", True))
-        self.empleados.append(Mantenimiento("Laura Fernández", "MT-002", "diurno", 1300, "plomería", False))
+        self.contratar_empleado(Mantenimiento("Juan Martínez", "MT-001", "nocturno", 1300, "electricidad", True))
+        self.contratar_empleado(Mantenimiento("Laura Fernández", "MT-002", "diurno", 1300, "plomería", False))
         
         # 2 Gerentes
-        self.empleados.append(Gerente("Roberto Vargas", "GER-001", "administrativo", 2500, "recepcion", 3))
-        self.empleados.append(Gerente("Sofía Ramírez", "GER-002", "administrativo", 2500, "servicios", 5))
+        self.contratar_empleado(Gerente("Roberto Vargas", "GER-001", "administrativo", 2500, "recepcion", 3))
+        self.contratar_empleado(Gerente("Sofía Ramírez", "GER-002", "administrativo", 2500, "servicios", 5))
     
     def _crear_reservas_ejemplo(self):
         """Crea reservas de ejemplo"""
         if len(self.habitaciones) >= 7:
             # 2 Reservas Individuales
-            self.reservas.append(ReservaIndividual(
+            self.agregar_reserva(ReservaIndividual(
                 "RES-001", "2024-01-15", "2024-01-18", 
                 self.habitaciones[0], "Sr. Alejandro Torres", "negocios", True
             ))
-            self.reservas.append(ReservaIndividual(
+            self.agregar_reserva(ReservaIndividual(
                 "RES-004", "2024-01-20", "2024-01-22", 
                 self.habitaciones[1], "Sra. Laura Mendoza", "vacaciones", False
             ))
             
             # 2 Reservas Grupales
-            self.reservas.append(ReservaGrupal(
+            self.agregar_reserva(ReservaGrupal(
                 "RES-002", "2024-01-25", "2024-01-30", 
                 [self.habitaciones[3], self.habitaciones[4]], 
                 "Familia González", 3, 15.0, "Sra. González"
             ))
             
             # 2 Reservas Corporativas
-            self.reservas.append(ReservaCorporativa(
+            self.agregar_reserva(ReservaCorporativa(
                 "RES-003", "2024-02-01", "2024-02-05", 
                 self.habitaciones[6], ["Ejecutivo 1", "Ejecutivo 2"], 
                 "Tech Solutions", True, True
             ))
             
             # 2 Paquetes Turísticos
-            self.reservas.append(PaqueteTuristico(
+            self.agregar_reserva(PaqueteTuristico(
                 "RES-005", "2024-02-10", "2024-02-15", 
                 self.habitaciones[9], ["Grupo Internacional"], 
                 "Tour Ciudad", True, 3, True
             ))
     
+    # ========== OPERACIONES HABITACIONES ==========
     def obtener_habitaciones_disponibles(self):
         """Retorna lista de habitaciones disponibles"""
-        return [h for h in self.habitaciones if h.estado == "disponible"]
+        self._asegurar_habitaciones()
+        return self._indice_habitaciones.por_estado("disponible")
     
-    def obtener_habitacion_por_numero(self, numero: int):
-        """Busca habitación por número"""
-        for habitacion in self.habitaciones:
-            if habitacion.numero == numero:
-                return habitacion
-        return None
+    def obtener_habitaciones_por_estado(self, estado: str):
+        """Retorna habitaciones en un estado dado"""
+        self._asegurar_habitaciones()
+        return self._indice_habitaciones.por_estado(estado)
     
+    def agregar_habitacion(self, habitacion) -> bool:
+        """Agrega una habitación al inventario (número único)"""
+        self._asegurar_habitaciones()
+        with self._lock_indices:
+            if not self._indice_habitaciones.agregar(habitacion):
+                return False
+            
+            self._habitaciones.append(habitacion)
+            if self.mapa_ocupacion:
+                self.mapa_ocupacion.agregar_habitacion(habitacion.numero)
+            self._invalidar_agregados(habitacion)
+        
+        habitacion.registrar_observador(self._publicar_cambio)
+        self._nueva_version()
+        return True
+
+    def eliminar_habitacion(self, numero: int):
+        """Retira una habitación del inventario"""
+        self._asegurar_habitaciones()
+        with self._lock_indices:
+            habitacion = self._indice_habitaciones.eliminar(numero)
+            if habitacion:
+                self._habitaciones.remove(habitacion)
+                if self.mapa_ocupacion:
+                    self.mapa_ocupacion.eliminar_habitacion(numero)
+                habitacion.eliminar_observador(self._publicar_cambio)
+                self._descontar_tarifa(habitacion)
+                self._nueva_version()
+            return habitacion
+
+    def obtener_habitacion_por_numero(self, numero: int):
+        """Busca habitación por número (O(1) sobre el índice)"""
+        self._asegurar_habitaciones()
+        return self._indice_habitaciones.obtener(numero)
+
+    def obtener_habitaciones_por_numeros(self, numeros):
+        """Busca varias habitaciones; retorna dict numero -> habitación (o None)"""
+        self._asegurar_habitaciones()
+        indice = self._indice_habitaciones
+        return {numero: indice.obtener(numero) for numero in numeros}
+
+    def cambiar_estado_habitacion(self, numero: int, nuevo_estado: str, version_esperada: int = None) -> bool:
+        """Cambia el estado verificando la versión leída (concurrencia optimista)"""
+        self._asegurar_habitaciones()
+        habitacion = self.obtener_habitacion_por_numero(numero)
+        if not habitacion:
+            return False
+        
+        with self._bloqueos.bloquear([numero]):
+            return habitacion.cambiar_estado(nuevo_estado, version_esperada)
+
     def obtener_habitaciones_por_tipo(self, tipo: str):
         """Filtra habitaciones por tipo"""
+        self._asegurar_habitaciones()
         tipo = tipo.lower()
         tipos_validos = {
-            "simple": HabitacionSimple,
-            "doble": HabitacionDoble,
-            "suite": Suite,
-            "penthouse": Penthouse
+            "simple": "HabitacionSimple",
+            "doble": "HabitacionDoble",
+            "suite": "Suite",
+            "penthouse": "Penthouse"
         }
         
         if tipo not in tipos_validos:
             return []
         
-        return [h for h in self.habitaciones if isinstance(h, tipos_validos[tipo])]
+        return self._indice_habitaciones.por_tipo(tipos_validos[tipo])
+    
+    # ========== PERSONAL Y SERVICIOS ==========
+    def contratar_empleado(self, empleado):
+        """Agrega un empleado y publica sus evaluaciones en el bus"""
+        self._asegurar_empleados()
+        with self._lock_indices:
+            self._empleados.append(empleado)
+            self._invalidar_agregados(empleado)
+        empleado.registrar_observador(self._publicar_cambio)
+        self.eventos.publicar(EmpleadoContratado(empleado))
+    
+    def agregar_servicio(self, servicio):
+        """Registra un servicio y publica sus solicitudes en el bus"""
+        self._asegurar_servicios()
+        self._servicios.append(servicio)
+        servicio.registrar_observador(self._publicar_cambio)
+        self._nueva_version()
+    
+    def _publicar_cambio(self, entidad, evento: str, **datos):
+        """Observador de entidades: traduce sus notificaciones a eventos de dominio"""
+        if evento == "estado":
+            self.eventos.publicar(HabitacionEstadoCambiado(entidad, datos["anterior"], datos["nuevo"]))
+        elif evento == "evaluacion":
+            self._invalidar_agregados(entidad)
+            self.eventos.publicar(EvaluacionRegistrada(entidad, datos["evaluacion"]))
+        elif evento == "atributo" and isinstance(entidad, Reserva):
+            # Bajo el lock de sus habitaciones y solo si sigue registrada: no puede
+            # llegar a los índices después de su ReservaCancelada
+            with self._bloqueos.bloquear(h.numero for h in entidad.obtener_habitaciones()):
+                if self._reservas.obtener(entidad.codigo_reserva) is entidad:
+                    self.eventos.publicar(ReservaModificada(entidad, datos["nombre"]))
+        elif evento == "atributo":
+            self._invalidar_agregados(entidad)
+            if isinstance(entidad, Habitacion):
+                self.eventos.publicar(HabitacionModificada(entidad, datos["nombre"]))
+            else:
+                self.eventos.publicar(EmpleadoModificado(entidad, datos["nombre"]))
+        elif evento == "solicitud":
+            self.eventos.publicar(SolicitudServicioRegistrada(entidad, datos["fecha_solicitud"]))
     
     # ========== OPERACIONES RESERVAS ==========
+    def agregar_reserva(self, reserva) -> bool:
+        """Registra una reserva si su código es nuevo y sus habitaciones están libres en esas fechas"""
+        self._asegurar_reservas()
+        with self._bloqueos.bloquear(h.numero for h in reserva.obtener_habitaciones()):
+            with self._lock_indices:
+                if reserva.codigo_reserva in self._reservas:
+                    return False
+                if not self.calendario.agregar_reserva(reserva):
+                    return False
+                self._reservas.agregar(reserva)
+                reserva.registrar_observador(self._publicar_cambio)
+                if self.mapa_ocupacion:
+                    self.mapa_ocupacion.agregar_reserva(reserva)
+            
+            # Bajo el lock de habitaciones: una cancelación posterior no puede adelantarse
+            self.eventos.publicar(ReservaCreada(reserva))
+        return True
+    
+    def recorrer_reservas(self, despues_de: int = 0, tamaño_tramo: int = 500):
+        """Genera (secuencia, reserva) en orden de registro, por tramos.
+        
+        El lock se toma solo para copiar cada tramo, no mientras el consumidor
+        procesa: las reservas registradas durante el recorrido aparecen al final
+        y las canceladas antes de alcanzarlas ya no se entregan.
+        """
+        self._asegurar_reservas()
+        while True:
+            with self._lock_indices:
+                tramo = self._reservas.tramo(despues_de, tamaño_tramo)
+            if not tramo:
+                return
+            yield from tramo
+            despues_de = tramo[-1][0]
+    
+    def obtener_reserva_por_codigo(self, codigo: str):
+        """Busca una reserva por código (O(1) sobre el registro)"""
+        self._asegurar_reservas()
+        return self._reservas.obtener(codigo)
+    
+    def agregar_huesped(self, codigo_reserva: str, huesped: str, version_esperada: int = None) -> bool:
+        """Agrega un huésped a una reserva registrada (ConflictoVersionError si cambió)"""
+        reserva = self.obtener_reserva_por_codigo(codigo_reserva)
+        if not reserva:
+            return False
+        
+        with self._bloqueos.bloquear(h.numero for h in reserva.obtener_habitaciones()):
+            reserva.agregar_huesped(huesped, version_esperada)
+            self.eventos.publicar(HuespedAgregado(reserva, huesped))
+        return True
+    
+    def agregar_habitacion_a_reserva(self, codigo_reserva: str, numero_habitacion: int,
+                                     version_esperada: int = None) -> bool:
+        """Suma una habitación a una reserva grupal registrada si está libre en sus fechas.
+        
+        Actualiza calendario y mapa de ocupación; la reserva notifica el cambio de
+        'habitaciones' (ReservaModificada) para que índices y reportes recalculen
+        su costo (ConflictoVersionError si cambió).
+        """
+        reserva = self.obtener_reserva_por_codigo(codigo_reserva)
+        habitacion = self.obtener_habitacion_por_numero(numero_habitacion)
+        if not isinstance(reserva, ReservaGrupal) or not habitacion:
+            return False
+        
+        numeros = [h.numero for h in reserva.obtener_habitaciones()] + [numero_habitacion]
+        with self._bloqueos.bloquear(numeros):
+            with self._lock_indices:
+                if numero_habitacion in numeros[:-1]:
+                    return False
+                try:
+                    if not self.calendario.esta_libre(numero_habitacion, reserva.fecha_inicio,
+                                                      reserva.fecha_fin):
+                        return False
+                except ValueError:
+                    return False
+                
+                self.calendario.eliminar_reserva(reserva)
+                if self.mapa_ocupacion:
+                    self.mapa_ocupacion.eliminar_reserva(reserva)
+                try:
+                    reserva.agregar_habitacion(habitacion, version_esperada)
+                finally:
+                    # Los demás intervalos ya estaban aceptados: se vuelven a registrar tal cual
+                    self.calendario.agregar_reserva(reserva, forzar=True)
+                    if self.mapa_ocupacion:
+                        self.mapa_ocupacion.agregar_reserva(reserva)
+        return True
+    
+    def buscar_reservas_por_huesped(self, nombre: str):
+        """Reservas con algún huésped (o grupo) que contenga 'nombre', vía índice de trigramas"""
+        return self._obtener_indice_huespedes().buscar(nombre)
+    
+    def buscar_reservas_por_huesped_aproximado(self, nombre: str, max_distancia: int = 2):
+        """Búsqueda tolerante a tildes, tratamientos y errores de tipeo: [(reserva, distancia)]"""
+        return self._obtener_indice_huespedes().buscar_aproximado(nombre, max_distancia)
+    
+    def obtener_linea_ocupacion(self):
+        """Línea de ocupación diaria (arreglo de diferencias), construida en el primer uso"""
+        self._asegurar_reservas()
+        with self._lock_indices:
+            if self._linea_ocupacion is None:
+                self._linea_ocupacion = LineaOcupacion(self._reservas.lista(), self.eventos,
+                                                       self._lock_indices)
+            return self._linea_ocupacion
+    
+    def obtener_indice_mensual(self):
+        """Reservas por (año, mes) de inicio con ingresos en caché, construido en el primer uso"""
+        self._asegurar_reservas()
+        with self._lock_indices:
+            if self._indice_mensual is None:
+                self._indice_mensual = IndiceMensual(self._reservas.lista(), self.eventos,
+                                                     self._lock_indices)
+            return self._indice_mensual
+    
+    def obtener_reservas_activas(self, fecha: str = None):
+        """Reservas en curso en la fecha (hoy por defecto), O(k) sobre las activas"""
+        self._asegurar_reservas()
+        with self._lock_indices:
+            if self._reservas_activas is None:
+                self._reservas_activas = ReservasActivas(self._reservas.lista(), self.eventos,
+                                                         self._lock_indices)
+        return self._reservas_activas.activas(fecha or obtener_fecha_actual())
+    
+    def obtener_vista_ingresos(self):
+        """Ingresos por tipo de reserva y mes, mantenidos por el bus (se construye una vez)"""
+        self._asegurar_reservas()
+        with self._lock_indices:
+            if self._vista_ingresos is None:
+                self._vista_ingresos = VistaIngresos(self._reservas.lista(), self.eventos,
+                                                     self._lock_indices)
+            return self._vista_ingresos
+    
+    def obtener_vista_nomina(self):
+        """Personal y nómina por rol y turno, mantenidos por el bus (se construye una vez)"""
+        empleados = self.empleados
+        with self._lock_indices:
+            if self._vista_nomina is None:
+                self._vista_nomina = VistaNomina(empleados, self.eventos, self._lock_indices)
+            return self._vista_nomina
+    
+    def _obtener_indice_huespedes(self):
+        """Índice de huéspedes, construido en la primera búsqueda"""
+        self._asegurar_reservas()
+        with self._lock_indices:
+            if self._indice_huespedes is None:
+                self._indice_huespedes = IndiceHuespedes(self._reservas.lista(), self.eventos,
+                                                         self._lock_indices)
+            return self._indice_huespedes
+    
+    def eliminar_reserva(self, reserva, version_esperada: int = None) -> bool:
+        """Retira una reserva y libera sus fechas en el calendario.
+        
+        La versión se verifica e incrementa bajo el lock de sus habitaciones:
+        nadie la modifica entre la verificación y el retiro
+        (ConflictoVersionError si cambió desde que se leyó).
+        """
+        self._asegurar_reservas()
+        with self._bloqueos.bloquear(h.numero for h in reserva.obtener_habitaciones()):
+            with self._lock_indices:
+                if self._reservas.obtener(reserva.codigo_reserva) is not reserva:
+                    return False  # Ya cancelada por otro hilo
+                reserva.cancelar(version_esperada)
+                self._reservas.eliminar(reserva)
+                reserva.eliminar_observador(self._publicar_cambio)
+                if self.mapa_ocupacion:
+                    self.mapa_ocupacion.eliminar_reserva(reserva)
+            
+            self.calendario.eliminar_reserva(reserva)
+            self.eventos.publicar(ReservaCancelada(reserva))
+        return True
+    
+    def habilitar_mapa_ocupacion(self, fecha_origen: str = None, dias: int = 730, ruta: str = None):
+        """Activa el mapa NumPy habitaciones x días (lo abre desde 'ruta' si ya existe
+        y corresponde a las habitaciones y reservas actuales; si no, lo reconstruye)"""
+        numeros = [h.numero for h in self.habitaciones]
+        reservas = self.reservas
+        huella = MapaOcupacion.huella(reservas) if ruta else None
+        mapa = MapaOcupacion.cargar(ruta, numeros=numeros, huella=huella) if ruta else None
+        
+        if mapa is None:
+            mapa = MapaOcupacion(numeros, fecha_origen or obtener_fecha_actual(), dias)
+            mapa.cargar_reservas(reservas)
+            if ruta:
+                mapa.guardar(ruta, huella)
+                mapa = MapaOcupacion.cargar(ruta)
+        
+        self.mapa_ocupacion = mapa
+        return mapa
+    
+    def esta_disponible(self, numero_habitacion: int, fecha_inicio: str, fecha_fin: str) -> bool:
+        """Indica si una habitación está libre para el rango [inicio, fin)"""
+        self._asegurar_reservas()
+        if not self.obtener_habitacion_por_numero(numero_habitacion):
+            return False
+        return self.calendario.esta_libre(numero_habitacion, fecha_inicio, fecha_fin)
+    
+    def obtener_habitaciones_libres(self, fecha_inicio: str, fecha_fin: str):
+        """Retorna las habitaciones libres para el rango [inicio, fin)"""
+        self._asegurar_reservas()
+        numeros = self.calendario.habitaciones_libres(
+            [h.numero for h in self.habitaciones], fecha_inicio, fecha_fin
+        )
+        return list(self.obtener_habitaciones_por_numeros(numeros).values())
+    
     def crear_reserva_individual(self, codigo: str, fecha_inicio: str, fecha_fin: str,
                                 numero_habitacion: int, huesped: str, proposito: str,
                                 incluye_desayuno: bool):
-        """Crea una nueva reserva individual"""
+        """Crea una nueva reserva individual (None si hay conflicto de fechas)"""
+        self._asegurar_reservas()
         habitacion = self.obtener_habitacion_por_numero(numero_habitacion)
         if not habitacion:
             return None
         
+        if not (validar_fecha(fecha_inicio) and validar_fecha(fecha_fin)):
+            return None
+        
         reserva = ReservaIndividual(codigo, fecha_inicio, fecha_fin, habitacion, 
                                    huesped, proposito, incluye_desayuno)
-        self.reservas.append(reserva)
-        habitacion.cambiar_estado("ocupada")
-        habitacion.agregar_huesped_al_historial(huesped)
+        with self._bloqueos.bloquear([numero_habitacion]):
+            if not self.agregar_reserva(reserva):
+                return None
+            
+            habitacion.cambiar_estado("ocupada")
+            habitacion.agregar_huesped_al_historial(huesped)
         
         return reserva
     
+    def crear_reservas_lote(self, especificaciones, storage=None):
+        """Crea muchas reservas de cualquier tipo de forma atómica.
+        
+        Cada especificación es un dict con 'tipo' (ver TIPOS_RESERVA), los
+        argumentos del constructor de esa reserva y 'habitacion' (número) o
+        'habitaciones' (lista de números, para grupales). Se valida todo el
+        lote en una pasada; si hay errores no se crea ninguna reserva.
+        Retorna {"reservas": [...], "errores": {indice: mensaje}}.
+        """
+        self._asegurar_reservas()
+        errores = {}
+        pendientes = []  # (indice, especificacion, numeros, inicio, fin)
+        
+        codigos = set()
+        numeros_pedidos = set()
+        
+        # Pasada 1: validaciones por especificación (fechas, tipo, códigos)
+        for indice, spec in enumerate(especificaciones):
+            if spec.get("tipo") not in self.TIPOS_RESERVA:
+                errores[indice] = f"Tipo de reserva inválido: {spec.get('tipo')}"
+                continue
+            
+            codigo = spec.get("codigo_reserva")
+            if not codigo or codigo in codigos:
+                errores[indice] = f"Código de reserva vacío o duplicado: {codigo}"
+                continue
+            codigos.add(codigo)
+            
+            try:
+                inicio = fecha_a_ordinal(spec["fecha_inicio"])
+                fin = fecha_a_ordinal(spec["fecha_fin"])
+            except (KeyError, ValueError):
+                errores[indice] = "Fechas ausentes o con formato inválido"
+                continue
+            if fin <= inicio:
+                errores[indice] = "La fecha fin debe ser posterior a la fecha inicio"
+                continue
+            
+            numeros = list(spec.get("habitaciones") or []) if spec["tipo"] == "grupal" else [spec.get("habitacion")]
+            numeros_pedidos.update(numeros)
+            pendientes.append((indice, spec, numeros, inicio, fin))
+        
+        # El resto se valida y aplica con las habitaciones del lote bloqueadas
+        with self._bloqueos.bloquear(numeros_pedidos):
+            return self._aplicar_lote(pendientes, numeros_pedidos, errores, storage)
+    
+    def _aplicar_lote(self, pendientes, numeros_pedidos, errores, storage):
+        """Pasadas 2 y 3 del lote (habitaciones, solapamientos) y confirmación atómica"""
+        for indice, spec, _, _, _ in pendientes:
+            if spec["codigo_reserva"] in self._reservas:
+                errores[indice] = f"Código de reserva duplicado: {spec['codigo_reserva']}"
+        
+        # Pasada 2: existencia de habitaciones con una sola consulta al índice
+        habitaciones = self.obtener_habitaciones_por_numeros(numeros_pedidos)
+        validas = []
+        for pendiente in pendientes:
+            faltantes = [n for n in pendiente[2] if habitaciones.get(n) is None]
+            if faltantes or not pendiente[2]:
+                errores[pendiente[0]] = f"Habitaciones inexistentes: {faltantes}"
+            elif pendiente[0] not in errores:
+                validas.append(pendiente)
+        
+        # Pasada 3: solapamientos contra el calendario y dentro del lote
+        errores.update(self.calendario.conflictos_lote(
+            (indice, numeros, inicio, fin) for indice, _, numeros, inicio, fin in validas
+        ))
+        
+        # Construcción de objetos (sin tocar el estado del hotel todavía)
+        construidas = []  # (indice, reserva)
+        for indice, spec, numeros, _, _ in validas:
+            if indice in errores:
+                continue
+            
+            argumentos = {k: v for k, v in spec.items() if k not in ("tipo", "habitacion", "habitaciones")}
+            if spec["tipo"] == "grupal":
+                argumentos["habitaciones"] = [habitaciones[n] for n in numeros]
+            else:
+                argumentos["habitacion"] = habitaciones[numeros[0]]
+            
+            try:
+                construidas.append((indice, self.TIPOS_RESERVA[spec["tipo"]](**argumentos)))
+            except TypeError as e:
+                errores[indice] = f"Argumentos inválidos: {e}"
+        
+        if errores:
+            return {"reservas": [], "errores": errores}
+        nuevas = [reserva for _, reserva in construidas]
+        
+        # Confirmación atómica: todo validado, se aplica el lote completo
+        with self._lock_indices:
+            # Los códigos se revisaron sin el lock de índices: otro hilo pudo
+            # registrar alguno en otras habitaciones desde entonces
+            for indice, reserva in construidas:
+                if reserva.codigo_reserva in self._reservas:
+                    errores[indice] = f"Código de reserva duplicado: {reserva.codigo_reserva}"
+            if errores:
+                return {"reservas": [], "errores": errores}
+            
+            registradas = []
+            for indice, reserva in construidas:
+                if not self._reservas.agregar(reserva):
+                    for anterior in registradas:
+                        self._reservas.eliminar(anterior)
+                    errores[indice] = f"Código de reserva duplicado: {reserva.codigo_reserva}"
+                    return {"reservas": [], "errores": errores}
+                registradas.append(reserva)
+            for reserva in nuevas:
+                reserva.registrar_observador(self._publicar_cambio)
+            
+            for reserva in nuevas:
+                self.calendario.agregar_reserva(reserva, forzar=True)
+            if self.mapa_ocupacion:
+                for reserva in nuevas:
+                    self.mapa_ocupacion.agregar_reserva(reserva)
+        
+        # El llamador mantiene bloqueadas las habitaciones del lote mientras se publica
+        for reserva in nuevas:
+            self.eventos.publicar(ReservaCreada(reserva))
+        
+        # Igual que crear_reserva_individual: ocupar y registrar a los huéspedes
+        for reserva in nuevas:
+            for habitacion in reserva.obtener_habitaciones():
+                habitacion.cambiar_estado("ocupada")
+                for huesped in reserva.huespedes:
+                    habitacion.agregar_huesped_al_historial(huesped)
+        
+        if storage:
+            storage.guardar_reservas(self.reservas)
+        
+        return {"reservas": nuevas, "errores": {}}
+    
     def generar_reporte_ocupacion(self):
-        """Genera reporte de ocupación por tipo"""
-        reporte = {}
-        
-        for habitacion in self.habitaciones:
-            tipo = habitacion.__class__.__name__
-            if tipo not in reporte:
-                reporte[tipo] = {
-                    "total": 0,
-                    "disponibles": 0,
-                    "ocupadas": 0,
-                    "en_limpieza": 0,
-                    "en_mantenimiento": 0
-                }
-            
-            reporte[tipo]["total"] += 1
-            
-            if habitacion.estado == "disponible":
-                reporte[tipo]["disponibles"] += 1
-            elif habitacion.estado == "ocupada":
-                reporte[tipo]["ocupadas"] += 1
-            elif habitacion.estado == "limpieza":
-                reporte[tipo]["en_limpieza"] += 1
-            elif habitacion.estado == "mantenimiento":
-                reporte[tipo]["en_mantenimiento"] += 1
-        
-        return reporte
+        """Genera reporte de ocupación por tipo (contadores vivos del índice)"""
+        self._asegurar_habitaciones()
+        return self._indice_habitaciones.reporte_ocupacion()
     
     def calcular_ingresos_potenciales(self):
-        """Calcula ingresos potenciales por tipo de habitación"""
-        ingresos = {}
+        """Calcula ingresos potenciales por tipo de habitación.
         
-        for habitacion in self.habitaciones:
-            tipo = habitacion.__class__.__name__
-            if tipo not in ingresos:
-                ingresos[tipo] = 0
+        El total por tipo se mantiene en caché; solo se recalculan (por delta)
+        las habitaciones agregadas o modificadas desde la última consulta.
+        """
+        with self._lock_indices:
+            if self._tarifas is None:
+                self._tarifas = {}
+                self._ingresos_por_tipo = {}
+                self._tarifas_pendientes = dict.fromkeys(self.habitaciones)
             
-            ingresos[tipo] += habitacion.calcular_tarifa_noche()
-        
-        return ingresos
+            for habitacion in self._tarifas_pendientes:
+                tipo = habitacion.__class__.__name__
+                tarifa = habitacion.calcular_tarifa_noche()
+                anterior = self._tarifas.get(habitacion)
+                self._tarifas[habitacion] = tarifa
+                if anterior is None:
+                    self._ingresos_por_tipo[tipo] = self._ingresos_por_tipo.get(tipo, 0) + tarifa
+                else:
+                    self._ingresos_por_tipo[tipo] += tarifa - anterior
+            self._tarifas_pendientes.clear()
+            
+            return dict(self._ingresos_por_tipo)
     
     def calcular_nomina_mensual(self):
-        """Calcula nómina mensual total"""
-        total = 0
-        for empleado in self.empleados:
-            total += empleado.calcular_salario_mensual()
-        return total
+        """Calcula nómina mensual total (en caché, ajustada por delta como los ingresos)"""
+        with self._lock_indices:
+            if self._salarios is None:
+                self._salarios = {}
+                self._nomina_total = 0
+                self._salarios_pendientes = dict.fromkeys(self.empleados)
+            
+            for empleado in self._salarios_pendientes:
+                salario = empleado.calcular_salario_mensual()
+                self._nomina_total += salario - self._salarios.get(empleado, 0)
+                self._salarios[empleado] = salario
+            self._salarios_pendientes.clear()
+            
+            return self._nomina_total
+    
+    def _invalidar_agregados(self, entidad):
+        """Marca una habitación o empleado para recalcular su aporte a los agregados"""
+        with self._lock_indices:
+            if isinstance(entidad, Habitacion):
+                if self._tarifas is not None:
+                    self._tarifas_pendientes[entidad] = None
+            elif self._salarios is not None:
+                self._salarios_pendientes[entidad] = None
+    
+    def _descontar_tarifa(self, habitacion):
+        """Quita del caché el aporte de una habitación retirada"""
+        if self._tarifas is None:
+            return
+        self._tarifas_pendientes.pop(habitacion, None)
+        anterior = self._tarifas.pop(habitacion, None)
+        if anterior is None:
+            return
+        
+        tipo = habitacion.__class__.__name__
+        if self._indice_habitaciones.contar_tipo(tipo):
+            self._ingresos_por_tipo[tipo] -= anterior
+        else:
+            del self._ingresos_por_tipo[tipo]
@@ -0,0 +1,108 @@
+from contextlib import nullcontext
+
+
+class IndiceHabitaciones:
+    """Índice central de habitaciones por número, tipo y estado"""
+    
+    ESTADOS = ["disponible", "ocupada", "limpieza", "mantenimiento"]
+    
+    # Clave del reporte de ocupación para cada estado
+    CLAVES_REPORTE = {
+        "disponible": "disponibles",
+        "ocupada": "ocupadas",
+        "limpieza": "en_limpieza",
+        "mantenimiento": "en_mantenimiento"
+    }
+    
+    def __init__(self, lock=None):
+        # Lock global corto para actualizar el índice (modo concurrente)
+        self._lock = lock or nullcontext()
+        self._por_numero = {}
+        self._por_tipo = {}         # tipo -> {numero: habitacion}
+        self._por_estado = {estado: {} for estado in self.ESTADOS}
+        self._por_tipo_estado = {}  # (tipo, estado) -> {numero: habitacion}
+    
+    def agregar(self, habitacion) -> bool:
+        """Indexa una habitación y se suscribe a sus cambios de estado"""
+        with self._lock:
+            if habitacion.numero in self._por_numero:
+                return False
+            
+            self._por_numero[habitacion.numero] = habitacion
+            self._por_tipo.setdefault(habitacion.__class__.__name__, {})[habitacion.numero] = habitacion
+            self._ubicar(habitacion, habitacion.estado)
+            habitacion.registrar_observador(self._al_cambiar_habitacion)
+            return True
+    
+    def eliminar(self, numero: int):
+        """Retira una habitación del índice"""
+        with self._lock:
+            habitacion = self._por_numero.pop(numero, None)
+            if not habitacion:
+                return None
+            
+            tipo = habitacion.__class__.__name__
+            del self._por_tipo[tipo][numero]
+            self._desubicar(habitacion, habitacion.estado)
+            habitacion.eliminar_observador(self._al_cambiar_habitacion)
+            return habitacion
+    
+    def _ubicar(self, habitacion, estado: str):
+        """Agrega la habitación a los conjuntos de su estado"""
+        tipo = habitacion.__class__.__name__
+        self._por_estado.setdefault(estado, {})[habitacion.numero] = habitacion
+        self._por_tipo_estado.setdefault((tipo, estado), {})[habitacion.numero] = habitacion
+    
+    def _desubicar(self, habitacion, estado: str):
+        """Quita la habitación de los conjuntos de su estado"""
+        tipo = habitacion.__class__.__name__
+        self._por_estado[estado].pop(habitacion.numero, None)
+        self._por_tipo_estado[(tipo, estado)].pop(habitacion.numero, None)
+    
+    def _al_cambiar_habitacion(self, habitacion, evento: str, **datos):
+        """Observador: mueve la habitación entre conjuntos al cambiar de estado"""
+        if evento == "estado":
+            with self._lock:
+                self._desubicar(habitacion, datos["anterior"])
+                self._ubicar(habitacion, datos["nuevo"])
+    
+    # ========== CONSULTAS ==========
+    def obtener(self, numero: int):
+        return self._por_numero.get(numero)
+    
+    def por_estado(self, estado: str):
+        """Habitaciones en un estado, O(k)"""
+        with self._lock:
+            return list(self._por_estado.get(estado, {}).values())
+    
+    def por_tipo(self, tipo: str):
+        """Habitaciones de un tipo (nombre de clase), O(k)"""
+        with self._lock:
+            return list(self._por_tipo.get(tipo, {}).values())
+    
+    def contar(self, tipo: str, estado: str) -> int:
+        return len(self._por_tipo_estado.get((tipo, estado), {}))
+    
+    def contar_tipo(self, tipo: str) -> int:
+        return len(self._por_tipo.get(tipo, {}))
+    
+    def contar_estado(self, estado: str) -> int:
+        return len(self._por_estado.get(estado, {}))
+    
+    def __len__(self):
+        return len(self._por_numero)
+    
+    def reporte_ocupacion(self):
+        """Reporte de ocupación por tipo a partir de los contadores"""
+        reporte = {}
+        
+        with self._lock:
+            for tipo, habitaciones in self._por_tipo.items():
+                if not habitaciones:
+                    continue
+                
+                reporte[tipo] = {"total": len(habitaciones)}
+                for estado, clave in self.CLAVES_REPORTE.items():
+                    reporte[tipo][clave] = self.contar(tipo, estado)
+        
+        return reporte
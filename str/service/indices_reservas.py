@@ -0,0 +1,361 @@
+from array import array
+from contextlib import nullcontext
+from datetime import date
+
+from service.eventos import (ReservaCreada, ReservaCancelada, ReservaModificada, HuespedAgregado,
+                             HabitacionModificada)
+from utils.validaciones import normalizar_nombre, distancia_edicion, fecha_a_ordinal
+
+
+def textos_huesped(reserva):
+    """Nombres buscables de una reserva, en minúsculas: huéspedes, huésped y grupo"""
+    textos = [h.lower() for h in reserva.huespedes]
+    if hasattr(reserva, 'huesped'):
+        textos.append(reserva.huesped.lower())
+    if hasattr(reserva, 'grupo_nombre'):
+        textos.append(reserva.grupo_nombre.lower())
+    return list(dict.fromkeys(textos))
+
+
+def trigramas(texto: str):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def palabras_normalizadas(textos):
+    """Palabras sin tildes ni tratamientos de una lista de nombres"""
+    return set(" ".join(normalizar_nombre(t) for t in textos).split())
+
+
+def radio_tolerado(palabra: str, maximo: int) -> int:
+    """Errores admitidos según la longitud: ninguno en palabras muy cortas"""
+    if len(palabra) <= 2:
+        return 0
+    return min(maximo, 1 if len(palabra) <= 5 else 2)
+
+
+class ArbolBK:
+    """Árbol BK de palabras bajo distancia de edición: búsqueda por radio sin recorrer todo"""
+    
+    def __init__(self):
+        self._raiz = None  # (palabra, {distancia: hijo})
+        self._tamaño = 0
+    
+    def agregar(self, palabra: str) -> bool:
+        if self._raiz is None:
+            self._raiz = (palabra, {})
+            self._tamaño = 1
+            return True
+        
+        nodo = self._raiz
+        while True:
+            distancia = distancia_edicion(palabra, nodo[0])
+            if distancia == 0:
+                return False
+            hijo = nodo[1].get(distancia)
+            if hijo is None:
+                nodo[1][distancia] = (palabra, {})
+                self._tamaño += 1
+                return True
+            nodo = hijo
+    
+    def buscar(self, palabra: str, radio: int):
+        """Palabras a distancia <= radio; retorna {palabra: distancia}"""
+        encontradas = {}
+        pendientes = [self._raiz] if self._raiz else []
+        while pendientes:
+            actual, hijos = pendientes.pop()
+            distancia = distancia_edicion(palabra, actual)
+            if distancia <= radio:
+                encontradas[actual] = distancia
+            # Desigualdad triangular: solo pueden estar en hijos a distancia [d - r, d + r]
+            for clave in range(max(1, distancia - radio), distancia + radio + 1):
+                hijo = hijos.get(clave)
+                if hijo is not None:
+                    pendientes.append(hijo)
+        return encontradas
+    
+    def __len__(self):
+        return self._tamaño
+
+
+class IndiceHuespedes:
+    """Índice invertido de trigramas sobre los nombres de huéspedes de las reservas.
+    
+    Cada reserva recibe un id creciente (orden de registro); cada trigrama
+    guarda los ids que lo contienen (array de enteros, ordenado por
+    construcción). Una búsqueda por subcadena intersecta las listas de sus
+    trigramas y verifica los candidatos contra los nombres. Las cancelaciones
+    dejan el id muerto y se reconstruye cuando los muertos son mayoría.
+    
+    Para búsquedas tolerantes (tildes, tratamientos, errores de tipeo) guarda
+    además las palabras normalizadas de cada nombre con sus ids y un árbol BK
+    sobre ese vocabulario.
+    """
+    
+    RECONSTRUIR_DESDE = 1024  # Ids muertos mínimos antes de reconstruir
+    
+    def __init__(self, reservas=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._vaciar()
+        
+        for reserva in reservas:
+            self.agregar(reserva)
+        
+        if eventos:
+            eventos.suscribir(ReservaCreada, lambda e: self.agregar(e.reserva))
+            eventos.suscribir(ReservaCancelada, lambda e: self.eliminar(e.reserva))
+            eventos.suscribir(HuespedAgregado, lambda e: self.agregar_nombre(e.reserva, e.huesped))
+            eventos.suscribir(ReservaModificada, lambda e: self.actualizar(e.reserva))
+    
+    def _vaciar(self):
+        self._vivos = []        # id -> reserva (None si se canceló)
+        self._textos = []       # id -> nombres en minúsculas
+        self._ids = {}          # codigo -> id
+        self._postings = {}     # trigrama -> array de ids
+        self._palabras = {}     # palabra normalizada -> array de ids
+        self._arbol = ArbolBK()
+        self._muertos = 0
+    
+    def agregar(self, reserva):
+        with self._lock:
+            if reserva.codigo_reserva in self._ids:
+                return
+            
+            id_reserva = len(self._vivos)
+            textos = textos_huesped(reserva)
+            self._ids[reserva.codigo_reserva] = id_reserva
+            self._vivos.append(reserva)
+            self._textos.append(textos)
+            
+            for trigrama in set().union(*map(trigramas, textos)):
+                posting = self._postings.get(trigrama)
+                if posting is None:
+                    posting = self._postings[trigrama] = array('I')
+                posting.append(id_reserva)
+            
+            for palabra in palabras_normalizadas(textos):
+                posting = self._palabras.get(palabra)
+                if posting is None:
+                    posting = self._palabras[palabra] = array('I')
+                    self._arbol.agregar(palabra)
+                posting.append(id_reserva)
+    
+    def agregar_nombre(self, reserva, nombre: str):
+        """Indexa un huésped agregado después de registrar la reserva"""
+        with self._lock:
+            id_reserva = self._ids.get(reserva.codigo_reserva)
+            if id_reserva is None:
+                return
+            
+            nombre = nombre.lower()
+            textos = self._textos[id_reserva]
+            if nombre in textos:
+                return
+            
+            existentes = set().union(*map(trigramas, textos))
+            palabras_existentes = palabras_normalizadas(textos)
+            textos.append(nombre)
+            for trigrama in trigramas(nombre) - existentes:
+                self._insertar_ordenado(self._postings.setdefault(trigrama, array('I')), id_reserva)
+            
+            for palabra in palabras_normalizadas([nombre]) - palabras_existentes:
+                if palabra not in self._palabras:
+                    self._palabras[palabra] = array('I')
+                    self._arbol.agregar(palabra)
+                self._insertar_ordenado(self._palabras[palabra], id_reserva)
+    
+    def actualizar(self, reserva):
+        """Vuelve a indexar la reserva si cambiaron sus nombres (huésped, grupo)"""
+        with self._lock:
+            id_reserva = self._ids.get(reserva.codigo_reserva)
+            if id_reserva is None or set(textos_huesped(reserva)) <= set(self._textos[id_reserva]):
+                return
+            self.eliminar(reserva)
+            self.agregar(reserva)
+    
+    @staticmethod
+    def _insertar_ordenado(posting, id_reserva: int):
+        """Id ya existente: se inserta en orden para mantener la lista ordenada"""
+        posicion = len(posting)
+        while posicion and posting[posicion - 1] > id_reserva:
+            posicion -= 1
+        posting.insert(posicion, id_reserva)
+    
+    def eliminar(self, reserva):
+        with self._lock:
+            id_reserva = self._ids.pop(reserva.codigo_reserva, None)
+            if id_reserva is None:
+                return
+            
+            self._vivos[id_reserva] = None
+            self._textos[id_reserva] = None
+            self._muertos += 1
+            
+            if self._muertos >= self.RECONSTRUIR_DESDE and self._muertos * 2 > len(self._vivos):
+                vivas = [r for r in self._vivos if r is not None]
+                self._vaciar()
+                for reserva_viva in vivas:
+                    self.agregar(reserva_viva)
+    
+    def buscar(self, nombre: str):
+        """Reservas con algún huésped que contenga 'nombre' (sin distinguir mayúsculas),
+        en orden de registro"""
+        consulta = nombre.lower()
+        
+        with self._lock:
+            claves = trigramas(consulta)
+            if not claves:
+                # Consultas de menos de 3 letras: recorrido sobre los nombres ya en minúsculas
+                candidatos = range(len(self._vivos))
+            else:
+                postings = sorted((self._postings.get(t, ()) for t in claves), key=len)
+                if not postings[0]:
+                    return []
+                
+                # Intersección empezando por las listas más cortas; el resto lo resuelve la verificación
+                candidatos = set(postings[0])
+                for posting in postings[1:3]:
+                    candidatos.intersection_update(posting)
+                candidatos = sorted(candidatos)
+            
+            textos = self._textos
+            return [self._vivos[i] for i in candidatos
+                    if textos[i] is not None and any(consulta in t for t in textos[i])]
+    
+    def buscar_aproximado(self, nombre: str, max_distancia: int = 2):
+        """Reservas cuyos nombres contienen, con tolerancia, todas las palabras de 'nombre'.
+        
+        Ignora tildes, mayúsculas y tratamientos (Sr., Dra., ...) y admite hasta
+        'max_distancia' errores por palabra (menos en palabras cortas). Retorna
+        [(reserva, distancia_total)] ordenado de mejor a peor coincidencia.
+        """
+        consulta = normalizar_nombre(nombre).split()
+        if not consulta:
+            return []
+        
+        with self._lock:
+            # Por palabra de la consulta: palabras del vocabulario cercanas y mejor distancia por id
+            similares_por_palabra = []
+            distancias = None  # id -> suma de distancias (palabras en cualquier nombre)
+            for palabra in dict.fromkeys(consulta):
+                similares = self._arbol.buscar(palabra, radio_tolerado(palabra, max_distancia))
+                mejores = {}
+                for similar, distancia in similares.items():
+                    for id_reserva in self._palabras[similar]:
+                        if distancia < mejores.get(id_reserva, max_distancia + 1):
+                            mejores[id_reserva] = distancia
+                
+                similares_por_palabra.append(similares)
+                if distancias is None:
+                    distancias = mejores
+                else:
+                    distancias = {i: d + mejores[i] for i, d in distancias.items() if i in mejores}
+                if not distancias:
+                    return []
+            
+            ranking = []
+            for id_reserva, distancia in distancias.items():
+                if self._vivos[id_reserva] is None:
+                    continue
+                if len(similares_por_palabra) > 1:
+                    # Varias palabras: deben coincidir dentro de un mismo nombre
+                    distancia = self._distancia_en_un_nombre(id_reserva, similares_por_palabra)
+                    if distancia is None:
+                        continue
+                ranking.append((distancia, id_reserva))
+            
+            ranking.sort()
+            return [(self._vivos[i], d) for d, i in ranking]
+    
+    def _distancia_en_un_nombre(self, id_reserva: int, similares_por_palabra):
+        """Mejor suma de distancias con todas las palabras en un solo nombre (None si no hay)"""
+        mejor = None
+        for texto in self._textos[id_reserva]:
+            palabras = normalizar_nombre(texto).split()
+            total = 0
+            for similares in similares_por_palabra:
+                distancia = min((similares[p] for p in palabras if p in similares), default=None)
+                if distancia is None:
+                    break
+                total += distancia
+            else:
+                mejor = total if mejor is None else min(mejor, total)
+        return mejor
+    
+    def __len__(self):
+        return len(self._ids)
+
+
+class IndiceMensual:
+    """Reservas agrupadas por (año, mes) de su fecha de inicio, con ingresos por mes en caché.
+    
+    Un reporte mensual toca solo su grupo. El ingreso de un mes se suma por
+    delta al registrar reservas y se recalcula (solo ese mes) tras una
+    cancelación; un cambio de tarifa de una habitación invalida todos los meses.
+    """
+    
+    def __init__(self, reservas=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._meses = {}     # (año, mes) -> {codigo: reserva}, en orden de registro
+        self._ingresos = {}  # (año, mes) -> ingresos en caché (ausente = recalcular)
+        
+        for reserva in reservas:
+            self.agregar(reserva)
+        
+        if eventos:
+            eventos.suscribir(ReservaCreada, lambda e: self.agregar(e.reserva))
+            eventos.suscribir(ReservaCancelada, lambda e: self.eliminar(e.reserva))
+            eventos.suscribir(ReservaModificada, lambda e: self.invalidar_mes(e.reserva))
+            eventos.suscribir(HabitacionModificada, lambda e: self.invalidar())
+    
+    @staticmethod
+    def _clave(reserva):
+        try:
+            inicio = date.fromordinal(fecha_a_ordinal(reserva.fecha_inicio))
+        except ValueError:
+            return None  # Fecha inválida: no pertenece a ningún mes
+        return inicio.year, inicio.month
+    
+    def agregar(self, reserva):
+        clave = self._clave(reserva)
+        if clave is None:
+            return
+        
+        with self._lock:
+            self._meses.setdefault(clave, {})[reserva.codigo_reserva] = reserva
+            if clave in self._ingresos:
+                self._ingresos[clave] += reserva.calcular_costo_total()
+    
+    def eliminar(self, reserva):
+        clave = self._clave(reserva)
+        with self._lock:
+            if self._meses.get(clave, {}).pop(reserva.codigo_reserva, None) is not None:
+                self._ingresos.pop(clave, None)
+    
+    def invalidar(self):
+        """Descarta los ingresos en caché (cambió alguna tarifa)"""
+        with self._lock:
+            self._ingresos.clear()
+    
+    def invalidar_mes(self, reserva):
+        """Cambió el costo de una reserva: recalcular solo el ingreso de su mes"""
+        clave = self._clave(reserva)
+        with self._lock:
+            self._ingresos.pop(clave, None)
+    
+    def reservas_mes(self, año: int, mes: int):
+        """Reservas que inician en el mes, en orden de registro"""
+        with self._lock:
+            return list(self._meses.get((año, mes), {}).values())
+    
+    def ingresos_mes(self, año: int, mes: int) -> float:
+        """Suma de calcular_costo_total() de las reservas del mes (en caché)"""
+        clave = (año, mes)
+        with self._lock:
+            ingresos = self._ingresos.get(clave)
+            if ingresos is None:
+                ingresos = 0
+                for reserva in self._meses.get(clave, {}).values():
+                    ingresos += reserva.calcular_costo_total()
+                self._ingresos[clave] = ingresos
+            return ingresos
@@ -0,0 +1,80 @@
+from contextlib import nullcontext
+
+from service.eventos import ReservaCreada, ReservaCancelada
+from utils.validaciones import fecha_a_ordinal
+
+
+class LineaOcupacion:
+    """Reservas vigentes por día como arreglo de diferencias sobre ordinales de fecha.
+    
+    Registrar o cancelar una reserva toca solo dos posiciones (+1 el día de
+    inicio, -1 el día siguiente al fin: el fin es inclusivo, como en
+    calcular_ocupacion_fecha). Las sumas acumuladas se reconstruyen al
+    consultar tras un cambio, y cada día se responde en O(1).
+    """
+    
+    def __init__(self, reservas=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._origen = None      # Ordinal del primer día cubierto
+        self._diferencias = []   # _diferencias[d - _origen]: cambio de ocupación el día d
+        self._acumulado = None   # Sumas prefijas (None = hay que recalcular)
+        
+        for reserva in reservas:
+            self.agregar(reserva)
+        
+        if eventos:
+            eventos.suscribir(ReservaCreada, lambda e: self.agregar(e.reserva))
+            eventos.suscribir(ReservaCancelada, lambda e: self.eliminar(e.reserva))
+    
+    def _ajustar(self, reserva, signo: int):
+        try:
+            inicio = fecha_a_ordinal(reserva.fecha_inicio)
+            fin = fecha_a_ordinal(reserva.fecha_fin) + 1
+        except ValueError:
+            return  # Fechas inválidas: no cuenta en ningún día
+        if fin <= inicio:
+            return
+        
+        with self._lock:
+            if self._origen is None:
+                self._origen = inicio
+            if inicio < self._origen:
+                self._diferencias[:0] = [0] * (self._origen - inicio)
+                self._origen = inicio
+            faltan = fin - self._origen + 1 - len(self._diferencias)
+            if faltan > 0:
+                self._diferencias.extend([0] * faltan)
+            
+            self._diferencias[inicio - self._origen] += signo
+            self._diferencias[fin - self._origen] -= signo
+            self._acumulado = None
+    
+    def agregar(self, reserva):
+        self._ajustar(reserva, 1)
+    
+    def eliminar(self, reserva):
+        self._ajustar(reserva, -1)
+    
+    def _sumas(self):
+        acumulado = self._acumulado
+        if acumulado is None:
+            with self._lock:
+                acumulado, total = [], 0
+                for diferencia in self._diferencias:
+                    total += diferencia
+                    acumulado.append(total)
+                self._acumulado = acumulado
+        return acumulado
+    
+    def ocupadas(self, ordinal: int) -> int:
+        """Reservas vigentes en el día (ordinal), O(1)"""
+        acumulado = self._sumas()
+        posicion = ordinal - (self._origen or 0)
+        if 0 <= posicion < len(acumulado):
+            return acumulado[posicion]
+        return 0
+    
+    def serie(self, inicio: int, fin: int):
+        """Reservas vigentes para cada día de [inicio, fin] (ordinales, inclusivo)"""
+        self._sumas()
+        return [self.ocupadas(dia) for dia in range(inicio, fin + 1)]
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+from datetime import date
+
+from utils.validaciones import fecha_a_ordinal
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él el mapa no está disponible
+    np = None
+
+
+class MapaOcupacion:
+    """Matriz habitaciones x días sobre un horizonte móvil (requiere NumPy).
+    
+    Cada celda cuenta las reservas que ocupan esa habitación esa noche (uint8,
+    el mismo byte por celda que un booleano): liberar una reserva solapada con
+    otra cargada a la fuerza no deja la noche como libre.
+    """
+    
+    TIPO = np.uint8 if np is not None else None
+    
+    def __init__(self, numeros, fecha_origen: str, dias: int = 730, matriz=None):
+        if np is None:
+            raise ImportError("MapaOcupacion requiere NumPy (pip install numpy)")
+        
+        self.numeros = list(numeros)
+        self._filas = {numero: fila for fila, numero in enumerate(self.numeros)}
+        self.origen = fecha_a_ordinal(fecha_origen)
+        self.dias = dias
+        
+        if matriz is None:
+            matriz = np.zeros((len(self.numeros), dias), dtype=self.TIPO)
+        self.matriz = matriz
+    
+    # ========== CONSTRUCCION ==========
+    def _columnas(self, fecha_inicio: str, fecha_fin: str):
+        """Columnas [a, b) del rango, recortadas al horizonte"""
+        inicio = fecha_a_ordinal(fecha_inicio) - self.origen
+        fin = fecha_a_ordinal(fecha_fin) - self.origen
+        return max(inicio, 0), min(fin, self.dias)
+    
+    def _marcar(self, reserva, delta: int):
+        try:
+            a, b = self._columnas(reserva.fecha_inicio, reserva.fecha_fin)
+        except ValueError:
+            return
+        if a >= b:
+            return
+        
+        filas = [self._filas[h.numero] for h in reserva.obtener_habitaciones()
+                 if h.numero in self._filas]
+        if not filas:
+            return
+        bloque = self.matriz[filas, a:b]
+        if delta > 0:
+            self.matriz[filas, a:b] = np.where(bloque < np.iinfo(self.TIPO).max, bloque + 1, bloque)
+        else:
+            self.matriz[filas, a:b] = np.where(bloque > 0, bloque - 1, 0)
+    
+    def agregar_reserva(self, reserva):
+        """Suma las noches de la reserva en todas sus habitaciones"""
+        self._marcar(reserva, 1)
+    
+    def eliminar_reserva(self, reserva):
+        """Descuenta las noches de la reserva (quedan ocupadas si otra las cubre)"""
+        self._marcar(reserva, -1)
+    
+    def cargar_reservas(self, reservas):
+        for reserva in reservas:
+            self._marcar(reserva, 1)
+    
+    def agregar_habitacion(self, numero: int):
+        """Agrega una fila vacía para una habitación nueva (la matriz pasa a memoria hasta guardar)"""
+        if numero in self._filas:
+            return
+        
+        self._filas[numero] = len(self.numeros)
+        self.numeros.append(numero)
+        self.matriz = np.vstack([self.matriz, np.zeros((1, self.dias), dtype=self.TIPO)])
+    
+    def eliminar_habitacion(self, numero: int):
+        """Quita la fila de una habitación retirada (la matriz pasa a memoria hasta guardar)"""
+        fila = self._filas.get(numero)
+        if fila is None:
+            return
+        
+        del self.numeros[fila]
+        self._filas = {numero: fila for fila, numero in enumerate(self.numeros)}
+        self.matriz = np.delete(self.matriz, fila, axis=0)
+    
+    def avanzar(self, nueva_fecha_origen: str, reservas=()):
+        """Desplaza el horizonte y marca las reservas que caen en los días nuevos"""
+        desplazamiento = fecha_a_ordinal(nueva_fecha_origen) - self.origen
+        if desplazamiento <= 0:
+            return
+        
+        if desplazamiento < self.dias:
+            self.matriz[:, :-desplazamiento] = self.matriz[:, desplazamiento:]
+            self.matriz[:, -desplazamiento:] = 0
+        else:
+            self.matriz[:, :] = 0
+        
+        dias_conservados = max(self.dias - desplazamiento, 0)
+        self.origen += desplazamiento
+        
+        # Solo las reservas que llegan a los días recién abiertos necesitan marcarse
+        limite = self.origen + dias_conservados
+        for reserva in reservas:
+            try:
+                if fecha_a_ordinal(reserva.fecha_fin) > limite:
+                    self._marcar(reserva, 1)
+            except ValueError:
+                continue
+    
+    # ========== CONSULTAS ==========
+    def _columnas_consulta(self, fecha_inicio: str, fecha_fin: str):
+        inicio = fecha_a_ordinal(fecha_inicio) - self.origen
+        fin = fecha_a_ordinal(fecha_fin) - self.origen
+        if fin <= inicio:
+            raise ValueError("La fecha fin debe ser posterior a la fecha inicio")
+        if inicio < 0 or fin > self.dias:
+            raise ValueError("Rango fuera del horizonte del mapa de ocupación")
+        return inicio, fin
+    
+    def habitaciones_libres(self, fecha_inicio: str, fecha_fin: str):
+        """Números de habitación libres en todas las noches de [inicio, fin)"""
+        a, b = self._columnas_consulta(fecha_inicio, fecha_fin)
+        libres = ~self.matriz[:, a:b].any(axis=1)
+        return [self.numeros[fila] for fila in np.flatnonzero(libres)]
+    
+    def esta_libre(self, numero: int, fecha_inicio: str, fecha_fin: str) -> bool:
+        a, b = self._columnas_consulta(fecha_inicio, fecha_fin)
+        fila = self._filas.get(numero)
+        return fila is not None and not self.matriz[fila, a:b].any()
+    
+    def ocupacion_diaria(self, fecha_inicio: str, fecha_fin: str):
+        """Habitaciones ocupadas por noche en [inicio, fin)"""
+        a, b = self._columnas_consulta(fecha_inicio, fecha_fin)
+        return np.count_nonzero(self.matriz[:, a:b], axis=0)
+    
+    # ========== PERSISTENCIA ==========
+    @staticmethod
+    def huella(reservas) -> str:
+        """Huella del contenido que marca el mapa: (código, habitaciones, fechas) de cada
+        reserva, independiente del orden (suma de digests de 128 bits)"""
+        total = 0
+        for reserva in reservas:
+            clave = "|".join([reserva.codigo_reserva, reserva.fecha_inicio, reserva.fecha_fin,
+                              *(str(h.numero) for h in reserva.obtener_habitaciones())])
+            total += int.from_bytes(hashlib.blake2b(clave.encode(), digest_size=16).digest(), "big")
+        return format(total % (1 << 128), "032x")
+    
+    @staticmethod
+    def _ruta_matriz(ruta: str) -> str:
+        """np.save agrega ".npy" si falta: guardar y cargar usan siempre la ruta con extensión"""
+        return ruta if ruta.endswith(".npy") else ruta + ".npy"
+    
+    @classmethod
+    def _ruta_metadatos(cls, ruta: str) -> str:
+        return cls._ruta_matriz(ruta) + ".json"
+    
+    def guardar(self, ruta: str, huella: str = None):
+        """Guarda la matriz como .npy y los metadatos (con la huella de las reservas) en un .json adjunto"""
+        np.save(self._ruta_matriz(ruta), self.matriz)
+        metadatos = {
+            "numeros": self.numeros,
+            "origen": date.fromordinal(self.origen).strftime("%Y-%m-%d"),
+            "dias": self.dias,
+            "huella": huella
+        }
+        with open(self._ruta_metadatos(ruta), 'w', encoding='utf-8') as f:
+            json.dump(metadatos, f)
+    
+    @classmethod
+    def cargar(cls, ruta: str, mmap_mode: str = "r+", numeros=None, huella: str = None):
+        """Abre un mapa guardado como archivo memory-mapped.
+        
+        Con 'numeros' y 'huella' retorna None si el mapa guardado no
+        corresponde a esas habitaciones o a esas reservas (ver huella()).
+        """
+        if np is None:
+            raise ImportError("MapaOcupacion requiere NumPy (pip install numpy)")
+        ruta_matriz = cls._ruta_matriz(ruta)
+        if not os.path.exists(ruta_matriz) or not os.path.exists(cls._ruta_metadatos(ruta)):
+            return None
+        
+        with open(cls._ruta_metadatos(ruta), 'r', encoding='utf-8') as f:
+            metadatos = json.load(f)
+        
+        if numeros is not None and metadatos["numeros"] != list(numeros):
+            return None
+        if huella is not None and metadatos.get("huella") != huella:
+            return None
+        
+        matriz = np.load(ruta_matriz, mmap_mode=mmap_mode)
+        if matriz.dtype != cls.TIPO:
+            return None  # Formato anterior (booleano): se reconstruye
+        return cls(metadatos["numeros"], metadatos["origen"], metadatos["dias"], matriz)
+    
+    def sincronizar(self):
+        """Escribe a disco los cambios de un mapa memory-mapped"""
+        if hasattr(self.matriz, "flush"):
+            self.matriz.flush()
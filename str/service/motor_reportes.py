@@ -0,0 +1,77 @@
+import time
+
+
+def agregar_porcentajes(ocupacion):
+    """Agrega a cada tipo del reporte de ocupación el porcentaje de cada estado"""
+    for datos in ocupacion.values():
+        total = datos["total"]
+        if total > 0:
+            datos["porcentaje_disponibles"] = (datos["disponibles"] / total) * 100
+            datos["porcentaje_ocupadas"] = (datos["ocupadas"] / total) * 100
+            datos["porcentaje_limpieza"] = (datos["en_limpieza"] / total) * 100
+            datos["porcentaje_mantenimiento"] = (datos["en_mantenimiento"] / total) * 100
+    return ocupacion
+
+
+class MotorReportes:
+    """Reportes financiero, de ocupación y de personal.
+    
+    Habitaciones y empleados no se recorren: la ocupación sale de los
+    contadores del índice de habitaciones, las tarifas y la nómina de los
+    agregados en caché del hotel, y el personal de la vista de nómina. Solo
+    las reservas se recorren, una vez, para sumar sus ingresos. El tiempo de
+    cada etapa queda en 'tiempos' (segundos).
+    """
+    
+    def __init__(self, hotel_service):
+        self.hotel_service = hotel_service
+        self.tiempos = {}
+    
+    def _etapa_habitaciones(self):
+        ocupacion = agregar_porcentajes(self.hotel_service.generar_reporte_ocupacion())
+        return ocupacion, self.hotel_service.calcular_ingresos_potenciales()
+    
+    def _etapa_reservas(self):
+        ingresos = 0
+        for reserva in self.hotel_service.reservas:
+            ingresos += reserva.calcular_costo_total()
+        return ingresos
+    
+    def _etapa_empleados(self):
+        personal = self.hotel_service.obtener_vista_nomina().reporte()
+        return personal, self.hotel_service.calcular_nomina_mensual()
+    
+    def ejecutar(self):
+        """Calcula los tres reportes; retorna un dict con ellos y los tiempos por etapa"""
+        tiempos = {}
+        
+        inicio = time.perf_counter()
+        ocupacion, ingresos_por_tipo = self._etapa_habitaciones()
+        tiempos["habitaciones"] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        ingresos_reservas = self._etapa_reservas()
+        tiempos["reservas"] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        personal, nomina = self._etapa_empleados()
+        tiempos["empleados"] = time.perf_counter() - inicio
+        
+        tiempos["total"] = sum(tiempos.values())
+        self.tiempos = tiempos
+        
+        potencial_diario = sum(ingresos_por_tipo.values())
+        return {
+            "financiero": {
+                "ingresos_potenciales_diarios": potencial_diario,
+                "ingresos_potenciales_mensuales": potencial_diario * 30,
+                "ingresos_reservas_activas": ingresos_reservas,
+                "costos_nomina_mensual": nomina,
+                "margen_estimado_mensual": (potencial_diario * 30) - nomina
+            },
+            "ingresos_por_tipo": ingresos_por_tipo,
+            "ocupacion": ocupacion,
+            "personal": personal,
+            "tiempos": dict(tiempos)
+        }
+
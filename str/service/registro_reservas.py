@@ -0,0 +1,97 @@
+from bisect import bisect_right
+
+
+class RegistroReservas:
+    """Reservas en orden de registro con índice por código.
+
+    Alta, baja y búsqueda por código son O(1): la baja deja una lápida (None)
+    en su posición en lugar de desplazar la lista. Las lápidas se compactan
+    solo cuando superan la mitad de las posiciones. lista() entrega una tupla
+    de las reservas vigentes que se reutiliza hasta el siguiente alta o baja.
+    Cada alta recibe además un número de secuencia creciente que no cambia al
+    compactar, para poder retomar un recorrido por tramos con tramo().
+    """
+
+    COMPACTAR_DESDE = 1024  # Lápidas mínimas antes de compactar
+
+    def __init__(self):
+        self._posiciones = []      # reserva o None (lápida)
+        self._por_codigo = {}      # codigo -> posición
+        self._lapidas = 0
+        self._vigentes = None      # Tupla entregada por lista(); None tras un alta o baja
+        self._secuencias = []      # Secuencia de cada posición (creciente, incluye lápidas)
+        self._ultima_secuencia = 0
+
+    def agregar(self, reserva) -> bool:
+        """Registra la reserva; False si su código ya existe"""
+        codigo = reserva.codigo_reserva
+        if codigo in self._por_codigo:
+            return False
+
+        self._por_codigo[codigo] = len(self._posiciones)
+        self._posiciones.append(reserva)
+        self._ultima_secuencia += 1
+        self._secuencias.append(self._ultima_secuencia)
+        self._vigentes = None
+        return True
+
+    def eliminar(self, reserva) -> bool:
+        """Retira la reserva dejando una lápida; False si no está registrada"""
+        posicion = self._por_codigo.get(reserva.codigo_reserva)
+        if posicion is None or self._posiciones[posicion] is not reserva:
+            return False
+
+        del self._por_codigo[reserva.codigo_reserva]
+        self._posiciones[posicion] = None
+        self._lapidas += 1
+        self._vigentes = None
+
+        if self._lapidas >= self.COMPACTAR_DESDE and self._lapidas * 2 > len(self._posiciones):
+            self.compactar()
+        return True
+
+    def obtener(self, codigo: str):
+        posicion = self._por_codigo.get(codigo)
+        return None if posicion is None else self._posiciones[posicion]
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self._por_codigo
+
+    def __len__(self):
+        return len(self._por_codigo)
+
+    def compactar(self):
+        """Quita las lápidas y recalcula las posiciones, O(n)"""
+        if not self._lapidas:
+            return
+
+        vivas = [i for i, r in enumerate(self._posiciones) if r is not None]
+        self._secuencias = [self._secuencias[i] for i in vivas]
+        self._posiciones = [self._posiciones[i] for i in vivas]
+        self._por_codigo = {r.codigo_reserva: i for i, r in enumerate(self._posiciones)}
+        self._lapidas = 0
+
+    def lista(self):
+        """Tupla de reservas vigentes, en orden de registro (no compacta)"""
+        if self._vigentes is None:
+            if self._lapidas:
+                self._vigentes = tuple(r for r in self._posiciones if r is not None)
+            else:
+                self._vigentes = tuple(self._posiciones)
+        return self._vigentes
+
+    def tramo(self, despues_de: int = 0, cantidad: int = 500):
+        """Hasta 'cantidad' pares (secuencia, reserva) vigentes con secuencia > despues_de.
+
+        Ubica el punto de partida por búsqueda binaria sobre las secuencias, así
+        que retomar un recorrido cuesta O(log n + cantidad) aunque entre tramos
+        se hayan registrado, cancelado o compactado reservas.
+        """
+        posicion = bisect_right(self._secuencias, despues_de)
+        resultado = []
+        while posicion < len(self._posiciones) and len(resultado) < cantidad:
+            reserva = self._posiciones[posicion]
+            if reserva is not None:
+                resultado.append((self._secuencias[posicion], reserva))
+            posicion += 1
+        return resultado
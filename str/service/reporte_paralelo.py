@@ -0,0 +1,190 @@
+import math
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from storage.serializacion import (habitacion_a_dict, habitacion_desde_dict, reserva_a_dict,
+                                   reserva_desde_dict)
+from utils.agregados import combinar
+from utils.validaciones import fecha_a_ordinal
+
+
+# ========== AGREGADOS PARCIALES ==========
+# Cada partición produce un dict de números que se combina con combinar()
+# (asociativa), así que el orden en que terminan los trabajadores no importa.
+
+def agregar_reservas(reservas, año: int):
+    """Reservas del año: ingresos y cantidad por mes de inicio y por tipo, y noches
+    vendidas dentro del año (noches [inicio, fin), por habitación ocupada)"""
+    inicio_año = date(año, 1, 1).toordinal()
+    fin_año = date(año + 1, 1, 1).toordinal()
+    parcial = {"total_reservas": 0, "ingresos_totales": 0, "noches_vendidas": 0,
+               "meses": {}, "por_tipo": {}}
+    
+    for reserva in reservas:
+        try:
+            inicio = fecha_a_ordinal(reserva.fecha_inicio)
+            fin = fecha_a_ordinal(reserva.fecha_fin)
+        except ValueError:
+            continue  # Fecha inválida: no pertenece a ningún año (como en el reporte mensual)
+        if inicio >= fin_año:
+            continue
+        
+        noches = min(fin, fin_año) - max(inicio, inicio_año)
+        if noches > 0:
+            parcial["noches_vendidas"] += noches * len(reserva.obtener_habitaciones())
+        
+        if inicio < inicio_año:
+            continue  # Empezó el año anterior: sus ingresos son de ese año
+        
+        costo = reserva.calcular_costo_total()
+        parcial["total_reservas"] += 1
+        parcial["ingresos_totales"] += costo
+        for grupos, clave in ((parcial["meses"], date.fromordinal(inicio).month),
+                              (parcial["por_tipo"], reserva.__class__.__name__)):
+            datos = grupos.setdefault(clave, {"total_reservas": 0, "ingresos_totales": 0})
+            datos["total_reservas"] += 1
+            datos["ingresos_totales"] += costo
+    
+    return parcial
+
+
+def agregar_habitaciones(habitaciones):
+    """Habitaciones y tarifa por noche sumada, por tipo"""
+    por_tipo = {}
+    for habitacion in habitaciones:
+        tipo = habitacion.__class__.__name__
+        datos = por_tipo.setdefault(tipo, {"total": 0, "tarifa_noche": 0})
+        datos["total"] += 1
+        datos["tarifa_noche"] += habitacion.calcular_tarifa_noche()
+    return {"habitaciones": por_tipo}
+
+
+# ========== TRABAJADORES ==========
+_snapshot = None  # {"habitaciones": [...], "reservas": [...]} del proceso trabajador
+
+
+def _iniciar_trabajador(habitaciones, reservas, serializado: bytes):
+    """Con fork recibe las listas del padre (copia en escritura, sin serializar);
+    si no, un snapshot serializado una sola vez, y reconstruye las habitaciones"""
+    global _snapshot
+    if serializado is None:
+        _snapshot = {"habitaciones": habitaciones, "reservas": reservas, "por_numero": None}
+        return
+    
+    datos = pickle.loads(serializado)
+    habitaciones = [habitacion_desde_dict(d) for d in datos["habitaciones"]]
+    _snapshot = {"habitaciones": habitaciones, "reservas": datos["reservas"],
+                 "por_numero": {h.numero: h for h in habitaciones}}
+
+
+def _parcial_reservas(inicio: int, fin: int, año: int):
+    reservas = _snapshot["reservas"][inicio:fin]
+    if _snapshot["por_numero"] is not None:
+        # Snapshot en diccionarios: solo se reconstruye la partición de esta tarea
+        reservas = (reserva_desde_dict(d, _snapshot["por_numero"]) for d in reservas)
+    return agregar_reservas(reservas, año)
+
+
+def _parcial_habitaciones(inicio: int, fin: int):
+    return agregar_habitaciones(_snapshot["habitaciones"][inicio:fin])
+
+
+def _rangos(total: int, particiones: int):
+    tamaño = max(1, math.ceil(total / particiones))
+    return [(inicio, min(inicio + tamaño, total)) for inicio in range(0, total, tamaño)]
+
+
+# ========== REPORTE ==========
+UMBRAL_PARALELO = 20000  # Con menos reservas, arrancar procesos cuesta más de lo que ahorra
+
+
+def _nucleos_disponibles() -> int:
+    """Núcleos que este proceso puede usar (respeta la afinidad de CPU si el sistema la expone)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _hay_otros_hilos(hotel_service) -> bool:
+    """Hacer fork con otros hilos en marcha puede dejar locks tomados en los hijos"""
+    return (hotel_service.concurrente or hotel_service.eventos.hilo_activo
+            or threading.active_count() > 1)
+
+
+def generar_reporte_anual(hotel_service, año: int, procesos: int = None, particiones: int = None):
+    """Reporte de cierre de año particionado sobre un ProcessPoolExecutor.
+    
+    Reservas y habitaciones se dividen en 'particiones' rangos (por defecto 4 por
+    proceso) y cada tarea viaja solo con su rango: los trabajadores leen los
+    datos del snapshot recibido al arrancar. 'procesos' no pasa de los núcleos
+    disponibles. Se calcula en este proceso con las mismas funciones con
+    procesos=1, con pocas reservas si no se indica, o si hay otros hilos en
+    marcha (hotel concurrente o suscriptores asíncronos del bus).
+    """
+    inicio_reloj = time.perf_counter()
+    habitaciones = list(hotel_service.habitaciones)
+    reservas = hotel_service.reservas  # Tupla: el registro no la modifica después de entregarla
+    
+    nucleos = _nucleos_disponibles()
+    if procesos is None:
+        procesos = 1 if len(reservas) < UMBRAL_PARALELO else nucleos
+    procesos = min(procesos, nucleos)
+    if _hay_otros_hilos(hotel_service):
+        procesos = 1
+    particiones = particiones or procesos * 4
+    
+    if procesos <= 1:
+        total = combinar(agregar_reservas(reservas, año), agregar_habitaciones(habitaciones))
+        particiones = 1
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            contexto = multiprocessing.get_context("fork")
+            initargs = (habitaciones, reservas, None)
+        else:
+            contexto = None
+            serializado = pickle.dumps({
+                "habitaciones": [habitacion_a_dict(h) for h in habitaciones],
+                "reservas": [reserva_a_dict(r) for r in reservas]
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+            initargs = (None, None, serializado)
+        
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                 initializer=_iniciar_trabajador, initargs=initargs) as ejecutor:
+            futuros = [ejecutor.submit(_parcial_reservas, inicio, fin, año)
+                       for inicio, fin in _rangos(len(reservas), particiones)]
+            futuros += [ejecutor.submit(_parcial_habitaciones, inicio, fin)
+                        for inicio, fin in _rangos(len(habitaciones), particiones)]
+            
+            total = {}
+            for futuro in futuros:
+                total = combinar(total, futuro.result())
+    
+    total = {"total_reservas": 0, "ingresos_totales": 0, "noches_vendidas": 0,
+             "meses": {}, "por_tipo": {}, "habitaciones": {}, **total}
+    dias = date(año + 1, 1, 1).toordinal() - date(año, 1, 1).toordinal()
+    num_habitaciones = sum(datos["total"] for datos in total["habitaciones"].values())
+    noches_disponibles = num_habitaciones * dias
+    tarifas = sum(datos["tarifa_noche"] for datos in total["habitaciones"].values())
+    
+    return {
+        "año": año,
+        "total_reservas": total["total_reservas"],
+        "ingresos_totales": total["ingresos_totales"],
+        "meses": {mes: total["meses"].get(mes, {"total_reservas": 0, "ingresos_totales": 0})
+                  for mes in range(1, 13)},
+        "por_tipo_reserva": total["por_tipo"],
+        "habitaciones": total["habitaciones"],
+        "noches_vendidas": total["noches_vendidas"],
+        "noches_disponibles": noches_disponibles,
+        "porcentaje_ocupacion": round(total["noches_vendidas"] / noches_disponibles * 100, 2)
+                                if noches_disponibles else 0,
+        "ingresos_potenciales": tarifas * dias,
+        "procesos": procesos,
+        "particiones": particiones,
+        "tiempo": time.perf_counter() - inicio_reloj
+    }
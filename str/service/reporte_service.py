@@ -1,84 +1,84 @@
 from datetime import datetime
+from service.cache_reportes import CacheReportes
+from service.motor_reportes import MotorReportes, agregar_porcentajes
+from service import reporte_paralelo
 from utils.validaciones import formatear_dinero
 
 
 class ReporteService:
     """Servicio para generación de reportes"""
     
-    def __init__(self, hotel_service):
+    def __init__(self, hotel_service, cache: CacheReportes = None):
+        """'cache' permite compartir resultados entre varios servicios del mismo hotel"""
         self.hotel_service = hotel_service
+        self.motor = MotorReportes(hotel_service)
+        self.cache = cache or CacheReportes()
     
-    def generar_reporte_financiero(self):
-        """Genera reporte financiero completo"""
-        reporte = {}
-        
-        # Ingresos por habitaciones (potenciales)
-        ingresos_potenciales = self.hotel_service.calcular_ingresos_potenciales()
-        total_ingresos_potenciales = sum(ingresos_potenciales.values())
-        
-        # Ingresos por reservas activas
-        ingresos_reservas = sum(r.calcular_costo_total() for r in self.hotel_service.reservas)
-        
-        # Costos (nómina)
-        costos_nomina = self.hotel_service.calcular_nomina_mensual()
+    def _en_cache(self, nombre: str, calcular, *parametros):
+        """Reutiliza el resultado mientras la versión de datos del hotel no cambie"""
+        return self.cache.obtener(nombre, parametros, self.hotel_service.version_datos, calcular)
+    
+    def estadisticas_cache(self):
+        return self.cache.estadisticas()
+    
+    def generar_reportes(self):
+        """Reportes financiero, de ocupación y de personal en una pasada por colección.
         
-        # Margen estimado
-        margen_mensual = (total_ingresos_potenciales * 30) - costos_nomina
+        Incluye los tiempos de cada etapa en la clave "tiempos"; si el resultado
+        sale de la caché, "desde_cache" es True y los tiempos son los del
+        cálculo original.
+        """
+        calculado = []
         
-        reporte["financiero"] = {
-            "ingresos_potenciales_diarios": total_ingresos_potenciales,
-            "ingresos_potenciales_mensuales": total_ingresos_potenciales * 30,
-            "ingresos_reservas_activas": ingresos_reservas,
-            "costos_nomina_mensual": costos_nomina,
-            "margen_estimado_mensual": margen_mensual
-        }
+        def calcular():
+            calculado.append(True)
+            return self.motor.ejecutar()
         
-        return reporte
+        reportes = self._en_cache("generales", calcular)
+        reportes["desde_cache"] = not calculado
+        return reportes
+    
+    def generar_reporte_financiero(self):
+        """Genera reporte financiero completo"""
+        return {"financiero": self.generar_reportes()["financiero"]}
     
     def generar_reporte_ocupacion_detallado(self):
-        """Genera reporte detallado de ocupación"""
-        reporte = self.hotel_service.generar_reporte_ocupacion()
+        """Genera reporte detallado de ocupación.
         
-        # Calcular porcentajes
-        for tipo, datos in reporte.items():
-            total = datos["total"]
-            if total > 0:
-                datos["porcentaje_disponibles"] = (datos["disponibles"] / total) * 100
-                datos["porcentaje_ocupadas"] = (datos["ocupadas"] / total) * 100
-                datos["porcentaje_limpieza"] = (datos["en_limpieza"] / total) * 100
-                datos["porcentaje_mantenimiento"] = (datos["en_mantenimiento"] / total) * 100
-        
-        return reporte
+        Parte de los contadores por tipo y estado del índice de habitaciones,
+        que se ajustan en cada cambio de estado: no recorre las habitaciones.
+        """
+        return self._en_cache("ocupacion_detallado", self._calcular_ocupacion_detallado)
+    
+    def _calcular_ocupacion_detallado(self):
+        return agregar_porcentajes(self.hotel_service.generar_reporte_ocupacion())
     
     def generar_reporte_personal(self):
-        """Genera reporte detallado del personal"""
-        reporte = {
-            "total_empleados": len(self.hotel_service.empleados),
-            "por_departamento": {},
-            "salarios_totales": {},
-            "empleados_por_turno": {}
-        }
+        """Genera reporte detallado del personal (vista materializada, sin recorrer empleados)"""
+        return self._en_cache("personal", self.hotel_service.obtener_vista_nomina().reporte)
+    
+    def generar_reporte_ingresos(self):
+        """Ingresos de las reservas por tipo y por mes de inicio (vista materializada)"""
+        return self._en_cache("ingresos", self.hotel_service.obtener_vista_ingresos().reporte)
+    
+    def generar_reporte_anual(self, año: int, procesos: int = None, particiones: int = None):
+        """Reporte de cierre de año: ingresos por mes y tipo, noches vendidas y ocupación.
         
-        # Agrupar empleados
-        for empleado in self.hotel_service.empleados:
-            tipo = empleado.__class__.__name__
-            
-            # Por departamento/tipo
-            if tipo not in reporte["por_departamento"]:
-                reporte["por_departamento"][tipo] = 0
-            reporte["por_departamento"][tipo] += 1
-            
-            # Salarios por tipo
-            if tipo not in reporte["salarios_totales"]:
-                reporte["salarios_totales"][tipo] = 0
-            reporte["salarios_totales"][tipo] += empleado.calcular_salario_mensual()
-            
-            # Por turno
-            turno = empleado.turno
-            if turno not in reporte["empleados_por_turno"]:
-                reporte["empleados_por_turno"][turno] = 0
-            reporte["empleados_por_turno"][turno] += 1
+        Con muchas reservas reparte particiones de reservas y habitaciones en un
+        ProcessPoolExecutor y combina los agregados parciales (ver reporte_paralelo).
+        
+        La caché distingue procesos y particiones pedidos: "procesos",
+        "particiones" y "tiempo" describen la ejecución que produjo el
+        resultado, y "desde_cache" indica si se reutilizó.
+        """
+        calculado = []
+        
+        def calcular():
+            calculado.append(True)
+            return reporte_paralelo.generar_reporte_anual(self.hotel_service, año, procesos, particiones)
         
+        reporte = self._en_cache("anual", calcular, año, procesos, particiones)
+        reporte["desde_cache"] = not calculado
         return reporte
     
     def generar_reporte_servicios_mas_solicitados(self, servicios_ejemplo):
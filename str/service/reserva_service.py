@@ -1,5 +1,28 @@
 from models.reserva import *
-from datetime import datetime
+from datetime import date
+import base64
+import json
+
+from service.indices_reservas import textos_huesped
+from utils.validaciones import fecha_a_ordinal
+
+
+def codificar_cursor(secuencia: int) -> str:
+    """Cursor opaco para retomar una consulta después de la reserva con esa secuencia"""
+    datos = json.dumps({"s": secuencia}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(datos).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> int:
+    """Secuencia guardada en un cursor; ValueError si el cursor no es válido"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        secuencia = json.loads(base64.urlsafe_b64decode(cursor + relleno))["s"]
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise ValueError(f"Cursor inválido: {cursor!r}")
+    if not isinstance(secuencia, int) or secuencia < 0:
+        raise ValueError(f"Cursor inválido: {cursor!r}")
+    return secuencia
 
 
 class ReservaService:
@@ -10,75 +33,133 @@ class ReservaService:
     
     def buscar_reserva_por_codigo(self, codigo: str):
         """Busca reserva por código"""
-        for reserva in self.hotel_service.reservas:
-            if reserva.codigo_reserva == codigo:
-                return reserva
-        return None
+        return self.hotel_service.obtener_reserva_por_codigo(codigo)
     
     def buscar_reservas_por_huesped(self, nombre_huesped: str):
         """Busca reservas por nombre de huésped"""
-        resultados = []
-        nombre_buscar = nombre_huesped.lower()
+        return self.hotel_service.buscar_reservas_por_huesped(nombre_huesped)
+    
+    def buscar_reservas_similares(self, nombre_huesped: str, max_distancia: int = 2):
+        """Busca reservas tolerando tildes, tratamientos y errores de tipeo (ordenadas por similitud)"""
+        return self.hotel_service.buscar_reservas_por_huesped_aproximado(nombre_huesped, max_distancia)
+    
+    def _filtro(self, fecha_desde=None, fecha_hasta=None, tipo=None, habitacion=None, huesped=None):
+        """Predicado que combina los filtros dados (los None no filtran)"""
+        condiciones = []
+        if fecha_desde is not None:
+            condiciones.append(lambda r: r.fecha_fin >= fecha_desde)
+        if fecha_hasta is not None:
+            condiciones.append(lambda r: r.fecha_inicio <= fecha_hasta)
+        if isinstance(tipo, str):
+            condiciones.append(lambda r: r.__class__.__name__ == tipo)
+        elif tipo is not None:
+            condiciones.append(lambda r: isinstance(r, tipo))
+        if habitacion is not None:
+            condiciones.append(lambda r: any(h.numero == habitacion for h in r.obtener_habitaciones()))
+        if huesped:
+            consulta = huesped.lower()
+            condiciones.append(lambda r: any(consulta in texto for texto in textos_huesped(r)))
+        return lambda r: all(condicion(r) for condicion in condiciones)
+    
+    def _consultar(self, cursor=None, **filtros):
+        """Genera (secuencia, reserva) de las reservas que pasan los filtros"""
+        despues_de = decodificar_cursor(cursor) if cursor else 0
+        cumple = self._filtro(**filtros)
+        for secuencia, reserva in self.hotel_service.recorrer_reservas(despues_de):
+            if cumple(reserva):
+                yield secuencia, reserva
+    
+    def consultar_reservas(self, fecha_desde: str = None, fecha_hasta: str = None, tipo=None,
+                           habitacion: int = None, huesped: str = None, cursor: str = None):
+        """Genera las reservas que cumplen los filtros, en orden de registro y en memoria constante.
+        
+        El rango de fechas (YYYY-MM-DD, ambos extremos opcionales) retiene las
+        reservas que se solapan con él; 'tipo' es el nombre de la clase o la
+        clase misma; 'habitacion' es un número; 'huesped' busca por subcadena.
+        Con 'cursor' (de paginar_reservas) continúa donde terminó esa página.
+        """
+        for _, reserva in self._consultar(cursor, fecha_desde=fecha_desde, fecha_hasta=fecha_hasta,
+                                          tipo=tipo, habitacion=habitacion, huesped=huesped):
+            yield reserva
+    
+    def paginar_reservas(self, limite: int = 20, cursor: str = None, **filtros):
+        """Una página de consultar_reservas y el cursor de la siguiente (None si no hay más)"""
+        if limite < 1:
+            raise ValueError("El límite debe ser al menos 1")
         
-        for reserva in self.hotel_service.reservas:
-            # Buscar en huéspedes de la reserva
-            for huesped in reserva.huespedes:
-                if nombre_buscar in huesped.lower():
-                    resultados.append(reserva)
-                    break
-            
-            # Buscar en atributos específicos
-            if hasattr(reserva, 'huesped') and nombre_buscar in reserva.huesped.lower():
-                if reserva not in resultados:
-                    resultados.append(reserva)
-            
-            if hasattr(reserva, 'grupo_nombre') and nombre_buscar in reserva.grupo_nombre.lower():
-                if reserva not in resultados:
-                    resultados.append(reserva)
+        reservas = []
+        siguiente = None
+        for secuencia, reserva in self._consultar(cursor, **filtros):
+            if len(reservas) == limite:
+                siguiente = codificar_cursor(ultima)
+                break
+            reservas.append(reserva)
+            ultima = secuencia
         
-        return resultados
+        return {"reservas": reservas, "cursor": siguiente}
     
     def calcular_ocupacion_fecha(self, fecha: str):
         """Calcula ocupación para una fecha específica"""
         try:
-            fecha_consulta = datetime.strptime(fecha, "%Y-%m-%d")
-            ocupadas = 0
-            
-            for reserva in self.hotel_service.reservas:
-                fecha_inicio = datetime.strptime(reserva.fecha_inicio, "%Y-%m-%d")
-                fecha_fin = datetime.strptime(reserva.fecha_fin, "%Y-%m-%d")
-                
-                if fecha_inicio <= fecha_consulta <= fecha_fin:
-                    ocupadas += 1
-            
-            total = len(self.hotel_service.habitaciones)
-            if total > 0:
-                porcentaje = (ocupadas / total) * 100
-                return {
-                    "fecha": fecha,
-                    "habitaciones_ocupadas": ocupadas,
-                    "habitaciones_totales": total,
-                    "porcentaje_ocupacion": round(porcentaje, 2)
-                }
-            
+            dia = fecha_a_ordinal(fecha)
         except ValueError:
-            pass
+            return None
+        
+        total = len(self.hotel_service.habitaciones)
+        if total > 0:
+            ocupadas = self.hotel_service.obtener_linea_ocupacion().ocupadas(dia)
+            porcentaje = (ocupadas / total) * 100
+            return {
+                "fecha": fecha,
+                "habitaciones_ocupadas": ocupadas,
+                "habitaciones_totales": total,
+                "porcentaje_ocupacion": round(porcentaje, 2)
+            }
         
         return None
     
-    def cancelar_reserva(self, codigo_reserva: str) -> bool:
-        """Cancela una reserva"""
+    def calcular_ocupacion_rango(self, fecha_inicio: str, fecha_fin: str):
+        """Serie diaria de ocupación entre dos fechas (ambas inclusive) en una sola consulta"""
+        try:
+            inicio, fin = fecha_a_ordinal(fecha_inicio), fecha_a_ordinal(fecha_fin)
+        except ValueError:
+            return None
+        
+        total = len(self.hotel_service.habitaciones)
+        if total == 0 or fin < inicio:
+            return None
+        
+        serie = self.hotel_service.obtener_linea_ocupacion().serie(inicio, fin)
+        return {
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "habitaciones_totales": total,
+            "serie": [
+                {
+                    "fecha": date.fromordinal(inicio + i).strftime("%Y-%m-%d"),
+                    "habitaciones_ocupadas": ocupadas,
+                    "porcentaje_ocupacion": round(ocupadas / total * 100, 2)
+                }
+                for i, ocupadas in enumerate(serie)
+            ]
+        }
+    
+    def cancelar_reserva(self, codigo_reserva: str, version_esperada: int = None) -> bool:
+        """Cancela una reserva (ConflictoVersionError si cambió desde que se leyó)"""
         reserva = self.buscar_reserva_por_codigo(codigo_reserva)
         
         if not reserva:
             print(f"❌ No se encontró reserva con código: {codigo_reserva}")
             return False
         
-        # Liberar habitación
-        reserva.habitacion.cambiar_estado("disponible")
+        # Remover reserva de la lista y del calendario (verifica la versión bajo lock)
+        if not self.hotel_service.eliminar_reserva(reserva, version_esperada):
+            print(f"❌ No se encontró reserva con código: {codigo_reserva}")
+            return False
         
-        # Remover reserva de la lista
-        self.hotel_service.reservas.remove(reserva)
+        # Liberar habitaciones (todas, en reservas grupales)
+        for habitacion in reserva.obtener_habitaciones():
+            habitacion.cambiar_estado("disponible")
         
         print(f"✅ Reserva {codigo_reserva} cancelada exitosamente")
         print(f"💡 Política aplicada: {reserva.politica_cancelacion()}")
@@ -87,33 +168,34 @@ class ReservaService:
     
     def generar_reporte_mensual(self, mes: int, año: int):
         """Genera reporte mensual de reservas"""
-        reservas_mes = []
-        ingresos_mes = 0
-        
-        for reserva in self.hotel_service.reservas:
-            try:
-                fecha_reserva = datetime.strptime(reserva.fecha_inicio, "%Y-%m-%d")
-                if fecha_reserva.month == mes and fecha_reserva.year == año:
-                    reservas_mes.append(reserva)
-                    ingresos_mes += reserva.calcular_costo_total()
-            except ValueError:
-                continue
+        indice = self.hotel_service.obtener_indice_mensual()
+        reservas_mes = indice.reservas_mes(año, mes)
         
         return {
             "mes": mes,
             "año": año,
             "total_reservas": len(reservas_mes),
-            "ingresos_totales": ingresos_mes,
+            "ingresos_totales": indice.ingresos_mes(año, mes),
             "reservas": reservas_mes
         }
     
+    def generar_reporte_anual(self, año: int):
+        """Resumen por mes de un año (solo toca los grupos de ese año)"""
+        indice = self.hotel_service.obtener_indice_mensual()
+        meses = {}
+        for mes in range(1, 13):
+            meses[mes] = {
+                "total_reservas": len(indice.reservas_mes(año, mes)),
+                "ingresos_totales": indice.ingresos_mes(año, mes)
+            }
+        
+        return {
+            "año": año,
+            "total_reservas": sum(m["total_reservas"] for m in meses.values()),
+            "ingresos_totales": sum(m["ingresos_totales"] for m in meses.values()),
+            "meses": meses
+        }
+    
     def obtener_reservas_activas(self):
         """Retorna reservas que están activas (fecha actual dentro del rango)"""
-        fecha_actual = datetime.now().strftime("%Y-%m-%d")
-        reservas_activas = []
-        
-        for reserva in self.hotel_service.reservas:
-            if reserva.fecha_inicio <= fecha_actual <= reserva.fecha_fin:
-                reservas_activas.append(reserva)
-        
-        return reservas_activas
+        return self.hotel_service.obtener_reservas_activas()
@@ -0,0 +1,104 @@
+import heapq
+from contextlib import nullcontext
+
+from service.eventos import ReservaCreada, ReservaCancelada
+from utils.validaciones import fecha_a_ordinal
+
+
+class ReservasActivas:
+    """Conjunto de reservas en curso mantenido por barrido sobre el calendario.
+    
+    Las reservas futuras esperan en un heap por fecha de inicio; al avanzar el
+    cursor (el día consultado) entran al conjunto activo y a un heap por fecha
+    de fin, del que salen cuando su estadía termina. Consultar "quién está en
+    el hotel" cuesta O(k) en las reservas activas y avanzar un día solo mueve
+    las que empiezan o terminan. Las cancelaciones se borran del conjunto
+    activo al instante y de los heaps de forma diferida (al salir de ellos).
+    """
+    
+    def __init__(self, reservas=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._registradas = {}  # codigo -> (secuencia, inicio, fin, reserva)
+        self._secuencia = 0     # Orden de registro, para devolver las activas en ese orden
+        self._vaciar_barrido()
+        
+        for reserva in reservas:
+            self.agregar(reserva)
+        
+        if eventos:
+            eventos.suscribir(ReservaCreada, lambda e: self.agregar(e.reserva))
+            eventos.suscribir(ReservaCancelada, lambda e: self.eliminar(e.reserva))
+    
+    def _vaciar_barrido(self):
+        self._cursor = None
+        self._por_iniciar = []  # heap (inicio, secuencia, codigo)
+        self._por_terminar = []  # heap (fin, secuencia, codigo)
+        self._activas = {}      # codigo -> (secuencia, reserva)
+    
+    def _vigente(self, secuencia: int, codigo: str) -> bool:
+        """Borrado diferido: la entrada del heap sigue correspondiendo a una reserva registrada"""
+        registro = self._registradas.get(codigo)
+        return registro is not None and registro[0] == secuencia
+    
+    def agregar(self, reserva):
+        try:
+            inicio = fecha_a_ordinal(reserva.fecha_inicio)
+            fin = fecha_a_ordinal(reserva.fecha_fin)
+        except ValueError:
+            return  # Fechas inválidas: nunca está activa
+        
+        with self._lock:
+            codigo = reserva.codigo_reserva
+            if codigo in self._registradas:
+                return
+            
+            self._secuencia += 1
+            secuencia = self._secuencia
+            self._registradas[codigo] = (secuencia, inicio, fin, reserva)
+            
+            if self._cursor is None or inicio > self._cursor:
+                heapq.heappush(self._por_iniciar, (inicio, secuencia, codigo))
+            elif fin >= self._cursor:
+                self._activas[codigo] = (secuencia, reserva)
+                heapq.heappush(self._por_terminar, (fin, secuencia, codigo))
+            # Si ya terminó antes del cursor queda solo en el archivo
+    
+    def eliminar(self, reserva):
+        with self._lock:
+            codigo = reserva.codigo_reserva
+            if self._registradas.pop(codigo, None) is not None:
+                self._activas.pop(codigo, None)
+    
+    def _avanzar(self, dia: int):
+        """Mueve el cursor hasta 'dia'; hacia atrás reinicia el barrido desde el archivo"""
+        if self._cursor is not None and dia < self._cursor:
+            self._vaciar_barrido()
+            self._por_iniciar = [(inicio, secuencia, codigo)
+                                 for codigo, (secuencia, inicio, _, _) in self._registradas.items()]
+            heapq.heapify(self._por_iniciar)
+        self._cursor = dia
+        
+        while self._por_iniciar and self._por_iniciar[0][0] <= dia:
+            _, secuencia, codigo = heapq.heappop(self._por_iniciar)
+            if not self._vigente(secuencia, codigo):
+                continue
+            _, _, fin, reserva = self._registradas[codigo]
+            if fin >= dia:
+                self._activas[codigo] = (secuencia, reserva)
+                heapq.heappush(self._por_terminar, (fin, secuencia, codigo))
+        
+        while self._por_terminar and self._por_terminar[0][0] < dia:
+            _, secuencia, codigo = heapq.heappop(self._por_terminar)
+            activa = self._activas.get(codigo)
+            if activa is not None and activa[0] == secuencia:
+                del self._activas[codigo]
+    
+    def activas(self, fecha: str):
+        """Reservas con inicio <= fecha <= fin, en orden de registro"""
+        dia = fecha_a_ordinal(fecha)
+        with self._lock:
+            self._avanzar(dia)
+            return [reserva for _, reserva in sorted(self._activas.values(), key=lambda a: a[0])]
+    
+    def __len__(self):
+        return len(self._activas)
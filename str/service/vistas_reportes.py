@@ -0,0 +1,180 @@
+from contextlib import nullcontext
+
+from service.eventos import (ReservaCreada, ReservaCancelada, ReservaModificada, HabitacionModificada,
+                             EmpleadoContratado, EvaluacionRegistrada, EmpleadoModificado)
+from utils.validaciones import fecha_a_ordinal
+
+
+class VistaIngresos:
+    """Ingresos por tipo de reserva y mes de inicio, mantenidos por delta.
+    
+    Registrar o cancelar una reserva suma o resta su costo en su grupo
+    (tipo, "YYYY-MM"); un cambio de tarifa recalcula solo las reservas de esa
+    habitación. Las reservas con fechas inválidas quedan en el mes None.
+    Consultar no depende de la cantidad de reservas, solo de la de grupos.
+    """
+    
+    def __init__(self, reservas=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._aportes = {}         # codigo -> (tipo, mes, costo, reserva)
+        self._por_habitacion = {}  # numero -> {codigo: None}
+        self._grupos = {}          # (tipo, mes) -> [reservas, ingresos]
+        self._por_tipo = {}        # tipo -> [reservas, ingresos]
+        self._por_mes = {}         # mes -> [reservas, ingresos]
+        
+        for reserva in reservas:
+            self.agregar(reserva)
+        
+        if eventos:
+            eventos.suscribir(ReservaCreada, lambda e: self.agregar(e.reserva))
+            eventos.suscribir(ReservaCancelada, lambda e: self.eliminar(e.reserva))
+            eventos.suscribir(ReservaModificada, lambda e: self.actualizar(e.reserva))
+            eventos.suscribir(HabitacionModificada, lambda e: self.recalcular_habitacion(e.habitacion))
+    
+    @staticmethod
+    def _mes(reserva):
+        try:
+            fecha_a_ordinal(reserva.fecha_inicio)
+        except ValueError:
+            return None
+        return reserva.fecha_inicio[:7]
+    
+    @staticmethod
+    def _ajustar(totales, clave, reservas: int, ingresos: float):
+        acumulado = totales.get(clave)
+        if acumulado is None:
+            acumulado = totales[clave] = [0, 0]
+        acumulado[0] += reservas
+        acumulado[1] += ingresos
+        if not acumulado[0]:
+            del totales[clave]  # Sin reservas: no arrastrar restos de redondeo
+    
+    def _aplicar(self, tipo: str, mes, reservas: int, ingresos: float):
+        self._ajustar(self._grupos, (tipo, mes), reservas, ingresos)
+        self._ajustar(self._por_tipo, tipo, reservas, ingresos)
+        self._ajustar(self._por_mes, mes, reservas, ingresos)
+    
+    def agregar(self, reserva):
+        costo = reserva.calcular_costo_total()
+        tipo = reserva.__class__.__name__
+        mes = self._mes(reserva)
+        
+        with self._lock:
+            codigo = reserva.codigo_reserva
+            if codigo in self._aportes:
+                return
+            self._aportes[codigo] = (tipo, mes, costo, reserva)
+            for habitacion in reserva.obtener_habitaciones():
+                self._por_habitacion.setdefault(habitacion.numero, {})[codigo] = None
+            self._aplicar(tipo, mes, 1, costo)
+    
+    def eliminar(self, reserva):
+        with self._lock:
+            aporte = self._aportes.pop(reserva.codigo_reserva, None)
+            if aporte is None:
+                return
+            tipo, mes, costo, _ = aporte
+            for habitacion in reserva.obtener_habitaciones():
+                codigos = self._por_habitacion.get(habitacion.numero)
+                if codigos is not None:
+                    codigos.pop(reserva.codigo_reserva, None)
+            self._aplicar(tipo, mes, -1, -costo)
+    
+    def actualizar(self, reserva):
+        """La reserva cambió (por ejemplo, sus habitaciones): vuelve a registrar su aporte"""
+        with self._lock:
+            self.eliminar(reserva)
+            self.agregar(reserva)
+    
+    def recalcular_habitacion(self, habitacion):
+        """Cambió la tarifa: ajusta por delta el costo de las reservas de esa habitación"""
+        with self._lock:
+            for codigo in self._por_habitacion.get(habitacion.numero, ()):
+                tipo, mes, anterior, reserva = self._aportes[codigo]
+                costo = reserva.calcular_costo_total()
+                self._aportes[codigo] = (tipo, mes, costo, reserva)
+                self._aplicar(tipo, mes, 0, costo - anterior)
+    
+    def reporte(self):
+        """Ingresos totales, por tipo, por mes y por tipo y mes"""
+        with self._lock:
+            por_tipo_mes = {}
+            for (tipo, mes), (_, ingresos) in self._grupos.items():
+                por_tipo_mes.setdefault(tipo, {})[mes] = ingresos
+            
+            return {
+                "total_reservas": len(self._aportes),
+                "ingresos_totales": sum(ingresos for _, ingresos in self._por_tipo.values()),
+                "por_tipo": {tipo: ingresos for tipo, (_, ingresos) in self._por_tipo.items()},
+                "por_mes": {mes: ingresos for mes, (_, ingresos) in self._por_mes.items()},
+                "por_tipo_mes": por_tipo_mes
+            }
+
+
+class VistaNomina:
+    """Personal y nómina por rol y turno, mantenidos por delta.
+    
+    Cada empleado aporta su salario a su grupo (rol, turno); una evaluación
+    o un cambio de atributo recalcula solo el salario de ese empleado.
+    """
+    
+    def __init__(self, empleados=(), eventos=None, lock=None):
+        self._lock = lock or nullcontext()
+        self._salarios = {}           # empleado -> salario aportado
+        self._por_departamento = {}   # rol -> empleados
+        self._salarios_totales = {}   # rol -> salarios
+        self._por_turno = {}          # turno -> empleados
+        self._por_rol_turno = {}      # rol -> {turno: salarios}
+        self._nomina = 0
+        
+        for empleado in empleados:
+            self.agregar(empleado)
+        
+        if eventos:
+            eventos.suscribir(EmpleadoContratado, lambda e: self.agregar(e.empleado))
+            eventos.suscribir(EvaluacionRegistrada, lambda e: self.recalcular(e.empleado))
+            eventos.suscribir(EmpleadoModificado, lambda e: self.recalcular(e.empleado))
+    
+    def agregar(self, empleado):
+        salario = empleado.calcular_salario_mensual()
+        rol = empleado.__class__.__name__
+        turno = empleado.turno
+        
+        with self._lock:
+            if empleado in self._salarios:
+                return
+            self._salarios[empleado] = salario
+            self._por_departamento[rol] = self._por_departamento.get(rol, 0) + 1
+            self._por_turno[turno] = self._por_turno.get(turno, 0) + 1
+            self._sumar_salario(rol, turno, salario)
+    
+    def _sumar_salario(self, rol: str, turno: str, monto: float):
+        self._salarios_totales[rol] = self._salarios_totales.get(rol, 0) + monto
+        por_turno = self._por_rol_turno.setdefault(rol, {})
+        por_turno[turno] = por_turno.get(turno, 0) + monto
+        self._nomina += monto
+    
+    def recalcular(self, empleado):
+        """Ajusta por delta el aporte de un empleado cuyo salario pudo cambiar"""
+        salario = empleado.calcular_salario_mensual()
+        with self._lock:
+            anterior = self._salarios.get(empleado)
+            if anterior is None:
+                return
+            self._salarios[empleado] = salario
+            self._sumar_salario(empleado.__class__.__name__, empleado.turno, salario - anterior)
+    
+    @property
+    def nomina_total(self) -> float:
+        return self._nomina
+    
+    def reporte(self):
+        """Reporte de personal (mismo formato que el recorrido completo) más la nómina por rol y turno"""
+        with self._lock:
+            return {
+                "total_empleados": len(self._salarios),
+                "por_departamento": dict(self._por_departamento),
+                "salarios_totales": dict(self._salarios_totales),
+                "empleados_por_turno": dict(self._por_turno),
+                "nomina_por_rol_turno": {rol: dict(turnos) for rol, turnos in self._por_rol_turno.items()}
+            }
@@ -1,16 +1,34 @@
 import json
 import os
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
+from models.versionado import ConflictoVersionError
+from storage.serializacion import (habitacion_a_dict, reserva_a_dict, empleado_a_dict,
+                                   servicio_a_dict)
+
 
 class JSONStorage:
-    """Maneja el almacenamiento de datos en archivos JSON"""
+    """Maneja el almacenamiento de datos en archivos JSON.
+    
+    Habitaciones y reservas se guardan con control de concurrencia optimista:
+    al cargarlas se recuerda la versión leída de cada una y, antes de
+    sobrescribir el archivo, se verifica que en disco sigan esas mismas
+    versiones. Si otro proceso guardó cambios entretanto, se lanza
+    ConflictoVersionError en lugar de pisarlos. Un archivo que esta instancia
+    nunca cargó se escribe sin verificación.
+    """
+    
+    ESPERA_BLOQUEO = 10  # Segundos máximos esperando el archivo .lock de otro proceso
     
     def __init__(self, data_dir="data"):
         self.data_dir = data_dir
         self.archivo_habitaciones = os.path.join(data_dir, "habitaciones.json")
         self.archivo_reservas = os.path.join(data_dir, "reservas.json")
         self.archivo_empleados = os.path.join(data_dir, "empleados.json")
+        self.archivo_servicios = os.path.join(data_dir, "servicios.json")
+        self._versiones_leidas = {}  # archivo -> {clave: versión en disco al cargar o guardar}
         
         # Crear directorio si no existe
         self._crear_directorio()
@@ -21,44 +39,76 @@ class JSONStorage:
             os.makedirs(self.data_dir)
             print(f"📂 Directorio {self.data_dir} creado")
     
-    def guardar_habitaciones(self, habitaciones):
-        """Guarda lista de habitaciones en JSON"""
+    @contextmanager
+    def _bloqueo_archivo(self, archivo):
+        """Exclusión entre procesos con un archivo .lock creado de forma atómica"""
+        ruta = archivo + ".lock"
+        limite = time.monotonic() + self.ESPERA_BLOQUEO
+        while True:
+            try:
+                descriptor = os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > limite:
+                    raise TimeoutError(f"{ruta} sigue bloqueado; bórrelo si ningún proceso está guardando")
+                time.sleep(0.01)
         try:
-            datos = []
-            for habitacion in habitaciones:
-                # Convertir objeto a diccionario
-                habitacion_dict = {
-                    'tipo': habitacion.__class__.__name__,
-                    'numero': habitacion.numero,
-                    'piso': habitacion.piso,
-                    'estado': habitacion.estado,
-                    'tarifa_base': habitacion.tarifa_base,
-                    'servicios_incluidos': habitacion.servicios_incluidos,
-                    'historial_huespedes': getattr(habitacion, '_historial_huespedes', [])
-                }
-                
-                # Agregar atributos específicos según tipo
-                if hasattr(habitacion, 'vista'):
-                    habitacion_dict['vista'] = habitacion.vista
-                if hasattr(habitacion, 'baño_compartido'):
-                    habitacion_dict['baño_compartido'] = habitacion.baño_compartido
-                if hasattr(habitacion, 'tipo_camas'):
-                    habitacion_dict['tipo_camas'] = habitacion.tipo_camas
-                if hasattr(habitacion, 'sala_estar'):
-                    habitacion_dict['sala_estar'] = habitacion.sala_estar
-                if hasattr(habitacion, 'num_habitaciones'):
-                    habitacion_dict['num_habitaciones'] = habitacion.num_habitaciones
-                if hasattr(habitacion, 'piso_completo'):
-                    habitacion_dict['piso_completo'] = habitacion.piso_completo
-                
-                datos.append(habitacion_dict)
-            
-            with open(self.archivo_habitaciones, 'w', encoding='utf-8') as f:
+            yield
+        finally:
+            os.close(descriptor)
+            os.remove(ruta)
+    
+    @staticmethod
+    def _versiones(datos, campo: str):
+        return {d[campo]: d.get('version', 1) for d in datos}
+    
+    def _leer_versiones(self, archivo, campo: str):
+        if not os.path.exists(archivo):
+            return {}
+        with open(archivo, 'r', encoding='utf-8') as f:
+            return self._versiones(json.load(f), campo)
+    
+    def _verificar_versiones(self, archivo, campo: str, coleccion: str):
+        """Lanza ConflictoVersionError si el archivo cambió desde la última carga o guardado"""
+        leidas = self._versiones_leidas.get(archivo)
+        if leidas is None:
+            return
+        
+        en_disco = self._leer_versiones(archivo, campo)
+        for clave in leidas.keys() | en_disco.keys():
+            # Modificada, agregada o eliminada por otro proceso
+            if leidas.get(clave) != en_disco.get(clave):
+                raise ConflictoVersionError(f"{coleccion} {clave} ({archivo})",
+                                            leidas.get(clave), en_disco.get(clave))
+    
+    def _guardar_versionado(self, archivo, datos, campo: str, coleccion: str):
+        """Escribe 'datos' si el archivo no cambió en disco desde que se leyó"""
+        with self._bloqueo_archivo(archivo):
+            self._verificar_versiones(archivo, campo, coleccion)
+            
+            with open(archivo, 'w', encoding='utf-8') as f:
                 json.dump(datos, f, indent=2, ensure_ascii=False)
+            self._versiones_leidas[archivo] = self._versiones(datos, campo)
+    
+    def _cargar_versionado(self, archivo, campo: str):
+        """Lee el archivo y recuerda las versiones para verificarlas al guardar"""
+        with self._bloqueo_archivo(archivo):
+            with open(archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        self._versiones_leidas[archivo] = self._versiones(datos, campo)
+        return datos
+    
+    def guardar_habitaciones(self, habitaciones):
+        """Guarda lista de habitaciones en JSON (ConflictoVersionError si otro proceso las cambió)"""
+        try:
+            datos = [habitacion_a_dict(habitacion) for habitacion in habitaciones]
+            self._guardar_versionado(self.archivo_habitaciones, datos, 'numero', 'habitaciones')
             
             print(f"💾 {len(habitaciones)} habitaciones guardadas en {self.archivo_habitaciones}")
             return True
             
+        except ConflictoVersionError:
+            raise
         except Exception as e:
             print(f"❌ Error al guardar habitaciones: {e}")
             return False
@@ -70,8 +120,7 @@ class JSONStorage:
             return []
         
         try:
-            with open(self.archivo_habitaciones, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
+            datos = self._cargar_versionado(self.archivo_habitaciones, 'numero')
             
             print(f"📂 {len(datos)} habitaciones cargadas desde {self.archivo_habitaciones}")
             return datos
@@ -84,36 +133,16 @@ class JSONStorage:
             return []
     
     def guardar_reservas(self, reservas):
-        """Guarda lista de reservas en JSON"""
+        """Guarda lista de reservas en JSON (ConflictoVersionError si otro proceso las cambió)"""
         try:
-            datos = []
-            for reserva in reservas:
-                # Convertir objeto a diccionario básico
-                reserva_dict = {
-                    'tipo': reserva.__class__.__name__,
-                    'codigo_reserva': reserva.codigo_reserva,
-                    'fecha_inicio': reserva.fecha_inicio,
-                    'fecha_fin': reserva.fecha_fin,
-                    'numero_habitacion': reserva.habitacion.numero if reserva.habitacion else None,
-                    'huespedes': getattr(reserva, '_huespedes', [])
-                }
-                
-                # Agregar atributos específicos según tipo
-                if hasattr(reserva, 'huesped'):
-                    reserva_dict['huesped'] = reserva.huesped
-                if hasattr(reserva, 'proposito_visita'):
-                    reserva_dict['proposito_visita'] = reserva.proposito_visita
-                if hasattr(reserva, 'empresa'):
-                    reserva_dict['empresa'] = reserva.empresa
-                
-                datos.append(reserva_dict)
-            
-            with open(self.archivo_reservas, 'w', encoding='utf-8') as f:
-                json.dump(datos, f, indent=2, ensure_ascii=False)
+            datos = [reserva_a_dict(reserva) for reserva in reservas]
+            self._guardar_versionado(self.archivo_reservas, datos, 'codigo_reserva', 'reservas')
             
             print(f"💾 {len(reservas)} reservas guardadas en {self.archivo_reservas}")
             return True
             
+        except ConflictoVersionError:
+            raise
         except Exception as e:
             print(f"❌ Error al guardar reservas: {e}")
             return False
@@ -125,8 +154,7 @@ class JSONStorage:
             return []
         
         try:
-            with open(self.archivo_reservas, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
+            datos = self._cargar_versionado(self.archivo_reservas, 'codigo_reserva')
             
             print(f"📂 {len(datos)} reservas cargadas desde {self.archivo_reservas}")
             return datos
@@ -138,6 +166,107 @@ class JSONStorage:
             print(f"❌ Error inesperado al cargar reservas: {e}")
             return []
     
+    def guardar_empleados(self, empleados):
+        """Guarda lista de empleados en JSON"""
+        try:
+            datos = [empleado_a_dict(empleado) for empleado in empleados]
+            
+            with open(self.archivo_empleados, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, indent=2, ensure_ascii=False)
+            
+            print(f"💾 {len(empleados)} empleados guardados en {self.archivo_empleados}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al guardar empleados: {e}")
+            return False
+    
+    def cargar_empleados(self):
+        """Carga empleados desde JSON"""
+        if not os.path.exists(self.archivo_empleados):
+            print(f"📂 Archivo {self.archivo_empleados} no existe")
+            return []
+        
+        try:
+            with open(self.archivo_empleados, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            
+            print(f"📂 {len(datos)} empleados cargados desde {self.archivo_empleados}")
+            return datos
+            
+        except json.JSONDecodeError:
+            print(f"❌ Error al leer {self.archivo_empleados}, archivo JSON corrupto")
+            return []
+        except Exception as e:
+            print(f"❌ Error inesperado al cargar empleados: {e}")
+            return []
+    
+    def guardar_servicios(self, servicios):
+        """Guarda lista de órdenes de servicio en JSON"""
+        try:
+            datos = [servicio_a_dict(servicio) for servicio in servicios]
+            
+            with open(self.archivo_servicios, 'w', encoding='utf-8') as f:
+                json.dump(datos, f, indent=2, ensure_ascii=False)
+            
+            print(f"💾 {len(servicios)} servicios guardados en {self.archivo_servicios}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al guardar servicios: {e}")
+            return False
+    
+    def cargar_servicios(self):
+        """Carga órdenes de servicio desde JSON"""
+        if not os.path.exists(self.archivo_servicios):
+            print(f"📂 Archivo {self.archivo_servicios} no existe")
+            return []
+        
+        try:
+            with open(self.archivo_servicios, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            
+            print(f"📂 {len(datos)} servicios cargados desde {self.archivo_servicios}")
+            return datos
+            
+        except json.JSONDecodeError:
+            print(f"❌ Error al leer {self.archivo_servicios}, archivo JSON corrupto")
+            return []
+        except Exception as e:
+            print(f"❌ Error inesperado al cargar servicios: {e}")
+            return []
+    
+    def guardar_stream(self, coleccion: str, elementos):
+        """Escribe una colección elemento a elemento, sin armar la lista en memoria.
+        
+        'coleccion' es habitaciones, reservas, empleados o servicios; 'elementos'
+        puede ser cualquier iterable (por ejemplo, un generador).
+        """
+        destinos = {
+            'habitaciones': (self.archivo_habitaciones, habitacion_a_dict),
+            'reservas': (self.archivo_reservas, reserva_a_dict),
+            'empleados': (self.archivo_empleados, empleado_a_dict),
+            'servicios': (self.archivo_servicios, servicio_a_dict)
+        }
+        archivo, a_dict = destinos[coleccion]
+        
+        try:
+            total = 0
+            with open(archivo, 'w', encoding='utf-8') as f:
+                f.write("[")
+                for elemento in elementos:
+                    f.write(",\n" if total else "\n")
+                    f.write(json.dumps(a_dict(elemento), ensure_ascii=False))
+                    total += 1
+                f.write("\n]\n")
+            
+            print(f"💾 {total} {coleccion} guardados en {archivo}")
+            return total
+            
+        except Exception as e:
+            print(f"❌ Error al guardar {coleccion}: {e}")
+            return 0
+    
     def obtener_info_archivos(self):
         """Retorna información sobre los archivos de datos"""
         info = {}
@@ -145,7 +274,8 @@ class JSONStorage:
         archivos = {
             'habitaciones': self.archivo_habitaciones,
             'reservas': self.archivo_reservas,
-            'empleados': self.archivo_empleados
+            'empleados': self.archivo_empleados,
+            'servicios': self.archivo_servicios
         }
         
         for nombre, archivo in archivos.items():
@@ -0,0 +1,165 @@
+from models.habitacion import HabitacionSimple, HabitacionDoble, Suite, Penthouse
+from models.reserva import ReservaIndividual, ReservaGrupal, ReservaCorporativa, PaqueteTuristico
+from models.empleado import Recepcionista, Housekeeping, Mantenimiento, Gerente
+from models.servicio import ServicioRestaurante, ServicioSpa, ServicioLavanderia, RoomService
+
+
+# Atributos propios de cada clase, en el orden de su constructor
+CAMPOS_HABITACION = {
+    "HabitacionSimple": (HabitacionSimple, ("cama_individual", "vista", "baño_compartido")),
+    "HabitacionDoble": (HabitacionDoble, ("tipo_camas", "vista", "baño_privado")),
+    "Suite": (Suite, ("sala_estar", "cocina", "jacuzzi", "num_habitaciones")),
+    "Penthouse": (Penthouse, ("piso_completo", "terraza", "servicio_mayordomo"))
+}
+
+CAMPOS_RESERVA = {
+    "ReservaIndividual": (ReservaIndividual, ("huesped", "proposito_visita", "incluye_desayuno")),
+    "ReservaGrupal": (ReservaGrupal, ("grupo_nombre", "num_personas", "descuento_grupo", "coordinador")),
+    "ReservaCorporativa": (ReservaCorporativa, ("empresa", "convenio", "facturacion_directa")),
+    "PaqueteTuristico": (PaqueteTuristico, ("tour_incluido", "transporte", "num_comidas", "guia_turistica"))
+}
+
+CAMPOS_EMPLEADO = {
+    "Recepcionista": (Recepcionista, ("idiomas",)),
+    "Housekeeping": (Housekeeping, ("habitaciones_asignadas", "piso", "supervisor")),
+    "Mantenimiento": (Mantenimiento, ("especialidad", "disponibilidad_24h")),
+    "Gerente": (Gerente, ("departamento", "personal_a_cargo"))
+}
+
+CAMPOS_SERVICIO = {
+    "ServicioRestaurante": (ServicioRestaurante, ("num_personas", "tipo_menu", "ubicacion_servir")),
+    "ServicioSpa": (ServicioSpa, ("tratamiento", "duracion_minutos", "terapeuta")),
+    "ServicioLavanderia": (ServicioLavanderia, ("num_prendas", "tipo_servicio", "urgencia")),
+    "RoomService": (RoomService, ("items_pedido", "hora_entrega", "piso"))
+}
+
+
+# ========== HABITACIONES ==========
+def habitacion_a_dict(habitacion) -> dict:
+    """Convierte una habitación a diccionario serializable"""
+    datos = {
+        'tipo': habitacion.__class__.__name__,
+        'numero': habitacion.numero,
+        'piso': habitacion.piso,
+        'estado': habitacion.estado,
+        'version': habitacion.version,
+        'tarifa_base': habitacion.tarifa_base,
+        'servicios_incluidos': habitacion.servicios_incluidos,
+        'historial_huespedes': getattr(habitacion, '_historial_huespedes', [])
+    }
+    
+    _, campos = CAMPOS_HABITACION[datos['tipo']]
+    for campo in campos:
+        datos[campo] = getattr(habitacion, campo)
+    return datos
+
+
+def habitacion_desde_dict(datos: dict):
+    """Reconstruye una habitación desde su diccionario"""
+    clase, campos = CAMPOS_HABITACION[datos['tipo']]
+    habitacion = clase(datos['numero'], datos['piso'], *[datos[campo] for campo in campos])
+    
+    habitacion.cambiar_estado(datos.get('estado', "disponible"))
+    habitacion._historial_huespedes = list(datos.get('historial_huespedes', []))
+    habitacion._version = datos.get('version', 1)
+    return habitacion
+
+
+# ========== RESERVAS ==========
+def reserva_a_dict(reserva) -> dict:
+    """Convierte una reserva a diccionario serializable"""
+    datos = {
+        'tipo': reserva.__class__.__name__,
+        'codigo_reserva': reserva.codigo_reserva,
+        'fecha_inicio': reserva.fecha_inicio,
+        'fecha_fin': reserva.fecha_fin,
+        'version': reserva.version,
+        'numero_habitacion': reserva.habitacion.numero if reserva.habitacion else None,
+        'numeros_habitaciones': [h.numero for h in reserva.obtener_habitaciones()],
+        'huespedes': getattr(reserva, '_huespedes', [])
+    }
+    
+    _, campos = CAMPOS_RESERVA[datos['tipo']]
+    for campo in campos:
+        datos[campo] = getattr(reserva, campo)
+    return datos
+
+
+def reserva_desde_dict(datos: dict, habitaciones_por_numero: dict):
+    """Reconstruye una reserva enlazando sus habitaciones por número"""
+    clase, campos = CAMPOS_RESERVA[datos['tipo']]
+    argumentos = {campo: datos[campo] for campo in campos}
+    
+    if datos['tipo'] == "ReservaGrupal":
+        numeros = datos.get('numeros_habitaciones') or [datos['numero_habitacion']]
+        habitacion = [habitaciones_por_numero[n] for n in numeros]
+    else:
+        habitacion = habitaciones_por_numero[datos['numero_habitacion']]
+        if datos['tipo'] in ("ReservaCorporativa", "PaqueteTuristico"):
+            argumentos['huespedes'] = []
+    
+    reserva = clase(datos['codigo_reserva'], datos['fecha_inicio'], datos['fecha_fin'],
+                    habitacion, **argumentos)
+    reserva._huespedes = list(datos.get('huespedes', []))
+    reserva._version = datos.get('version', 1)
+    return reserva
+
+
+# ========== EMPLEADOS ==========
+def empleado_a_dict(empleado) -> dict:
+    """Convierte un empleado a diccionario serializable"""
+    datos = {
+        'tipo': empleado.__class__.__name__,
+        'nombre': empleado.nombre,
+        'codigo': empleado.codigo,
+        'turno': empleado.turno,
+        'salario_base': empleado.salario_base,
+        'evaluaciones': empleado.evaluaciones
+    }
+    
+    _, campos = CAMPOS_EMPLEADO[datos['tipo']]
+    for campo in campos:
+        datos[campo] = getattr(empleado, campo)
+    if hasattr(empleado, 'bono_ocupacion'):
+        datos['bono_ocupacion'] = empleado.bono_ocupacion
+    return datos
+
+
+def empleado_desde_dict(datos: dict):
+    """Reconstruye un empleado desde su diccionario"""
+    clase, campos = CAMPOS_EMPLEADO[datos['tipo']]
+    empleado = clase(datos['nombre'], datos['codigo'], datos['turno'], datos['salario_base'],
+                     *[datos[campo] for campo in campos])
+    
+    empleado._evaluaciones = list(datos.get('evaluaciones', []))
+    if 'bono_ocupacion' in datos:
+        empleado.bono_ocupacion = datos['bono_ocupacion']
+    return empleado
+
+
+# ========== SERVICIOS ==========
+def servicio_a_dict(servicio) -> dict:
+    """Convierte una orden de servicio a diccionario serializable"""
+    datos = {
+        'tipo': servicio.__class__.__name__,
+        'codigo_servicio': servicio.codigo_servicio,
+        'nombre': servicio.nombre,
+        'habitacion_solicitante': servicio.habitacion_solicitante,
+        'fecha_solicitud': servicio._ServicioHotel__fecha_solicitud
+    }
+    
+    _, campos = CAMPOS_SERVICIO[datos['tipo']]
+    for campo in campos:
+        datos[campo] = getattr(servicio, campo)
+    return datos
+
+
+def servicio_desde_dict(datos: dict):
+    """Reconstruye una orden de servicio desde su diccionario"""
+    clase, campos = CAMPOS_SERVICIO[datos['tipo']]
+    servicio = clase(datos['codigo_servicio'], datos['nombre'], datos['habitacion_solicitante'],
+                     *[datos[campo] for campo in campos])
+    
+    if datos.get('fecha_solicitud'):
+        servicio._ServicioHotel__fecha_solicitud = datos['fecha_solicitud']
+    return servicio
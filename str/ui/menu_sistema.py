@@ -1,8 +1,18 @@
+from models.versionado import ConflictoVersionError
+from service.reserva_service import ReservaService
+from service.auditoria_service import AuditoriaService
+from service.reporte_service import ReporteService
+
+
 class SistemaHotelMenu:
     """Clase que maneja todos los menús del sistema"""
     
+    RESERVAS_POR_PAGINA = 10
+    
     def __init__(self, hotel_service):
         self.service = hotel_service
+        self.reserva_service = ReservaService(hotel_service)
+        self.reporte_service = ReporteService(hotel_service)
     
     def mostrar_menu_principal(self):
         """Muestra el menú principal"""
@@ -45,6 +55,8 @@ class SistemaHotelMenu:
         print("5️⃣  Crear paquete turístico")
         print("6️⃣  Cancelar reserva")
         print("7️⃣  Ver política de cancelación")
+        print("8️⃣  Buscar reservas por huésped")
+        print("9️⃣  Auditar reservas solapadas")
         print("0️⃣  Volver al menú principal")
         print("-"*50)
     
@@ -100,6 +112,9 @@ class SistemaHotelMenu:
             elif opcion == "4":
                 self.filtrar_habitaciones_por_tipo()
             
+            elif opcion == "5":
+                self.cambiar_estado_habitacion()
+            
             elif opcion == "6":
                 self.ver_detalles_habitacion()
             
@@ -138,8 +153,8 @@ class SistemaHotelMenu:
         print("\n📊 ESTADÍSTICAS:")
         print("-"*30)
         total = len(self.service.habitaciones)
-        disponibles = len([h for h in self.service.habitaciones if h.estado == "disponible"])
-        ocupadas = len([h for h in self.service.habitaciones if h.estado == "ocupada"])
+        disponibles = len(self.service.obtener_habitaciones_disponibles())
+        ocupadas = len(self.service.obtener_habitaciones_por_estado("ocupada"))
         
         print(f"Total habitaciones: {total}")
         print(f"Disponibles: {disponibles}")
@@ -220,6 +235,30 @@ class SistemaHotelMenu:
         except ValueError:
             print("❌ Por favor ingrese un número válido.")
     
+    def cambiar_estado_habitacion(self):
+        """Cambia el estado de una habitación sin bloquearla mientras el usuario decide"""
+        try:
+            numero = int(input("\n🔍 Ingrese número de habitación: "))
+            habitacion = self.service.obtener_habitacion_por_numero(numero)
+            
+            if not habitacion:
+                print(f"❌ No se encontró habitación con número {numero}")
+                return
+            
+            # Se recuerda la versión leída; se verifica al confirmar
+            version_leida = habitacion.version
+            print(f"   Estado actual: {habitacion.estado} (versión {version_leida})")
+            nuevo_estado = input("🔄 Nuevo estado (disponible/ocupada/limpieza/mantenimiento): ").strip().lower()
+            
+            if self.service.cambiar_estado_habitacion(numero, nuevo_estado, version_leida):
+                print(f"✅ Habitación {numero} ahora está en estado: {habitacion.estado}")
+            else:
+                print("❌ Estado inválido.")
+        except ValueError:
+            print("❌ Por favor ingrese un número válido.")
+        except ConflictoVersionError:
+            print("⚠️  La habitación fue modificada por otro usuario. Consulte de nuevo e intente otra vez.")
+    
     def ver_detalles_habitacion(self):
         """Muestra detalles completos de una habitación"""
         try:
@@ -259,9 +298,18 @@ class SistemaHotelMenu:
             elif opcion == "2":
                 self.crear_reserva_individual()
             
+            elif opcion == "6":
+                self.cancelar_reserva()
+            
             elif opcion == "7":
                 self.mostrar_politicas_cancelacion()
             
+            elif opcion == "8":
+                self.buscar_reservas_por_huesped()
+            
+            elif opcion == "9":
+                self.auditar_solapamientos()
+            
             else:
                 print("❌ Opción en desarrollo. Próximamente disponible.")
             
@@ -269,8 +317,9 @@ class SistemaHotelMenu:
                 input("\n⏎ Presione Enter para continuar...")
     
     def mostrar_todas_reservas(self):
-        """Muestra todas las reservas"""
-        if not self.service.reservas:
+        """Muestra todas las reservas, una página a la vez"""
+        pagina = self.reserva_service.paginar_reservas(self.RESERVAS_POR_PAGINA)
+        if not pagina["reservas"]:
             print("\n📭 No hay reservas registradas.")
             return
         
@@ -278,11 +327,20 @@ class SistemaHotelMenu:
         print("📋 RESERVAS REGISTRADAS")
         print("="*60)
         
-        for i, reserva in enumerate(self.service.reservas, 1):
-            print(f"\n{i}. {reserva}")
-            print(f"   Huésped(es): {', '.join(reserva._huespedes)}")
-            print(f"   Costo total: ${reserva.calcular_costo_total():,.0f}")
-            print(f"   Política: {reserva.politica_cancelacion()}")
+        i = 0
+        while True:
+            for reserva in pagina["reservas"]:
+                i += 1
+                print(f"\n{i}. {reserva}")
+                print(f"   Huésped(es): {', '.join(reserva._huespedes)}")
+                print(f"   Costo total: ${reserva.calcular_costo_total():,.0f}")
+                print(f"   Política: {reserva.politica_cancelacion()}")
+            
+            if pagina["cursor"] is None:
+                break
+            if input("\n⏎ Enter para ver más, 'q' para terminar: ").strip().lower() == "q":
+                break
+            pagina = self.reserva_service.paginar_reservas(self.RESERVAS_POR_PAGINA, pagina["cursor"])
     
     def crear_reserva_individual(self):
         """Crea una nueva reserva individual"""
@@ -323,10 +381,62 @@ class SistemaHotelMenu:
                 print(f"   Habitación: {reserva.habitacion.numero}")
                 print(f"   Costo total: ${reserva.calcular_costo_total():,.0f}")
             else:
-                print("❌ No se pudo crear la reserva.")
+                print("❌ No se pudo crear la reserva (habitación inexistente, fechas inválidas u ocupada en ese rango).")
         except ValueError:
             print("❌ Error en los datos ingresados.")
     
+    def cancelar_reserva(self):
+        """Cancela una reserva verificando que no haya cambiado mientras se confirmaba"""
+        codigo = input("\n🏷️  Código de reserva a cancelar: ").strip()
+        reserva = self.reserva_service.buscar_reserva_por_codigo(codigo)
+        
+        if not reserva:
+            print(f"❌ No se encontró reserva con código: {codigo}")
+            return
+        
+        version_leida = reserva.version
+        print(f"\n{reserva}")
+        print(f"   Política: {reserva.politica_cancelacion()}")
+        if input("❓ ¿Confirmar cancelación? (S/N): ").lower() != 's':
+            print("Operación cancelada.")
+            return
+        
+        try:
+            self.reserva_service.cancelar_reserva(codigo, version_leida)
+        except ConflictoVersionError:
+            print("⚠️  La reserva fue modificada por otro usuario. Revise los cambios e intente otra vez.")
+    
+    def buscar_reservas_por_huesped(self):
+        """Busca por nombre; si no hay coincidencias exactas sugiere nombres parecidos"""
+        nombre = input("\n👤 Nombre del huésped: ").strip()
+        if not nombre:
+            return
+        
+        reservas = self.reserva_service.buscar_reservas_por_huesped(nombre)
+        if reservas:
+            print(f"\n🔎 {len(reservas)} reserva(s) para '{nombre}':")
+            for reserva in reservas[:20]:
+                print(f"  • {reserva} | {', '.join(reserva.huespedes)}")
+            return
+        
+        similares = self.reserva_service.buscar_reservas_similares(nombre)
+        if not similares:
+            print(f"📭 No hay reservas para '{nombre}'.")
+            return
+        
+        print(f"\n🤔 Sin coincidencias exactas. ¿Quiso decir...? ({len(similares)} parecidas)")
+        for reserva, distancia in similares[:20]:
+            print(f"  • {reserva} | {', '.join(reserva.huespedes)} (diferencia: {distancia})")
+    
+    def auditar_solapamientos(self):
+        """Lista las reservas que comparten habitación en las mismas noches"""
+        print("\n🔍 Auditando solapamientos en todas las reservas...")
+        total = AuditoriaService(self.service).reporte_solapamientos()
+        if total:
+            print(f"\n⚠️  {total} conflicto(s) encontrados.")
+        else:
+            print("✅ No hay reservas solapadas.")
+    
     def mostrar_politicas_cancelacion(self):
         """Muestra políticas de cancelación"""
         print("\n" + "="*50)
@@ -354,13 +464,13 @@ class SistemaHotelMenu:
         print("📊 REPORTES GENERALES DEL HOTEL")
         print("="*50)
         
-        # Reporte de ocupación
-        reporte_ocupacion = self.service.generar_reporte_ocupacion()
+        # Los tres reportes salen de una sola pasada por colección
+        reportes = self.reporte_service.generar_reportes()
         
         print("\n🏨 OCUPACIÓN POR TIPO DE HABITACIÓN:")
         print("-"*45)
         
-        for tipo, datos in reporte_ocupacion.items():
+        for tipo, datos in reportes["ocupacion"].items():
             print(f"\n{tipo}:")
             print(f"  Total: {datos['total']} habitaciones")
             print(f"  Disponibles: {datos['disponibles']}")
@@ -369,26 +479,33 @@ class SistemaHotelMenu:
             print(f"  En mantenimiento: {datos['en_mantenimiento']}")
         
         # Ingresos potenciales
-        ingresos = self.service.calcular_ingresos_potenciales()
-        
         print("\n💰 INGRESOS POTENCIALES:")
         print("-"*30)
         
-        total_ingresos = 0
-        for tipo, ingreso in ingresos.items():
+        for tipo, ingreso in reportes["ingresos_por_tipo"].items():
             print(f"{tipo}: ${ingreso:,.0f}/día")
-            total_ingresos += ingreso
         
-        print(f"\n💵 TOTAL POTENCIAL DIARIO: ${total_ingresos:,.0f}")
-        print(f"💵 TOTAL POTENCIAL MENSUAL: ${total_ingresos * 30:,.0f}")
+        financiero = reportes["financiero"]
+        print(f"\n💵 TOTAL POTENCIAL DIARIO: ${financiero['ingresos_potenciales_diarios']:,.0f}")
+        print(f"💵 TOTAL POTENCIAL MENSUAL: ${financiero['ingresos_potenciales_mensuales']:,.0f}")
         
-        # Nómina
-        nomina = self.service.calcular_nomina_mensual()
-        print(f"\n👥 NÓMINA MENSUAL: ${nomina:,.0f}")
+        # Nómina y margen
+        print(f"\n👥 NÓMINA MENSUAL: ${financiero['costos_nomina_mensual']:,.0f}")
+        print(f"📈 MARGEN ESTIMADO MENSUAL: ${financiero['margen_estimado_mensual']:,.0f}")
         
-        # Calcular margen
-        margen_mensual = (total_ingresos * 30) - nomina
-        print(f"📈 MARGEN ESTIMADO MENSUAL: ${margen_mensual:,.0f}")
+        tiempos = reportes["tiempos"]
+        if reportes["desde_cache"]:
+            print(f"\n⏱️  Tomado de la caché (sin recalcular; el cálculo original tardó "
+                  f"{tiempos['total'] * 1000:.1f} ms)")
+        else:
+            print(f"\n⏱️  Generado en {tiempos['total'] * 1000:.1f} ms "
+                  f"(habitaciones {tiempos['habitaciones'] * 1000:.1f} ms, "
+                  f"reservas {tiempos['reservas'] * 1000:.1f} ms, "
+                  f"empleados {tiempos['empleados'] * 1000:.1f} ms)")
+        
+        cache = self.reporte_service.estadisticas_cache()
+        print(f"🗃️  Caché de reportes: {cache['aciertos']} aciertos, {cache['fallos']} fallos "
+              f"({cache['tasa_aciertos']:.0f}% de aciertos)")
     
     def ejecutar_simulaciones(self):
         """Ejecuta simulaciones del sistema"""
@@ -415,7 +532,7 @@ class SistemaHotelMenu:
         print("-"*30)
         
         # Buscar una habitación ocupada
-        ocupadas = [h for h in self.service.habitaciones if h.estado == "ocupada"]
+        ocupadas = self.service.obtener_habitaciones_por_estado("ocupada")
         if ocupadas:
             habitacion = ocupadas[0]
             print(f"Realizando check-out de Habitación {habitacion.numero}...")
@@ -0,0 +1,9 @@
+def combinar(a, b):
+    """Combina dos agregados parciales (asociativa): mezcla dicts clave a clave,
+    suma números y concatena listas"""
+    if isinstance(a, dict):
+        resultado = dict(a)
+        for clave, valor in b.items():
+            resultado[clave] = combinar(resultado[clave], valor) if clave in resultado else valor
+        return resultado
+    return a + b
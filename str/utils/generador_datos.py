@@ -0,0 +1,269 @@
+import argparse
+import random
+from datetime import date, datetime, timedelta
+
+from models.habitacion import HabitacionSimple, HabitacionDoble, Suite, Penthouse
+from models.reserva import ReservaIndividual, ReservaGrupal, ReservaCorporativa, PaqueteTuristico
+from models.empleado import Recepcionista, Housekeeping, Mantenimiento, Gerente
+from models.servicio import ServicioRestaurante, ServicioSpa, ServicioLavanderia, RoomService
+
+
+# ========== CATALOGOS ==========
+NOMBRES = ["Alejandro", "María José", "Sofía", "Andrés", "Camila", "Julián", "Valentina",
+           "Sebastián", "Lucía", "Martín", "Renée", "Joaquín", "Inés", "Tomás", "Ángela",
+           "Nicolás", "Laura", "Óscar", "Paula", "Héctor"]
+APELLIDOS = ["González", "Rodríguez", "Pérez", "Martínez", "Sánchez", "Ramírez", "Torres",
+             "Flórez", "Gómez", "Díaz", "Muñoz", "Álvarez", "Jiménez", "Hernández",
+             "Castaño", "Peña", "Mendoza", "Vargas", "López", "Núñez"]
+TRATAMIENTOS = ["", "", "", "Sr. ", "Sra. ", "Dr. ", "Dra. "]
+EMPRESAS = ["Tech Solutions", "Andina Logística", "Café del Valle", "Grupo Éxito Digital",
+            "Constructora Pacífico", "Banco Central", "Farmacéutica Norte"]
+TOURS = ["Tour Ciudad", "Ruta del Café", "Caribe Express", "Sierra Nevada", "Tour Colonial"]
+PROPOSITOS = ["negocios", "vacaciones", "conferencia", "familia"]
+VISTAS_SIMPLE = ["jardin", "calle", "interior"]
+VISTAS_DOBLE = ["calle", "marina", "montaña"]
+CAMAS_DOBLE = ["2 camas individuales", "cama queen", "cama king"]
+IDIOMAS = ["inglés", "francés", "portugués", "alemán", "italiano"]
+ITEMS_ROOM_SERVICE = ["café", "té", "jugo", "sandwich", "ensalada", "sopa", "postre",
+                      "fruta", "agua", "vino"]
+
+
+class GeneradorHotel:
+    """Genera hoteles sintéticos reproducibles (misma semilla -> mismos datos).
+
+    Todas las colecciones se producen con generadores, de modo que pueden
+    escribirse en streaming sin tenerlas completas en memoria.
+    """
+
+    def __init__(self, semilla: int = 42, num_habitaciones: int = 10000,
+                 num_reservas: int = 1000000, num_empleados: int = 5000,
+                 num_servicios: int = 100000, fecha_inicio: str = "2022-01-01",
+                 habitaciones_por_piso: int = 100):
+        self.semilla = semilla
+        self.num_habitaciones = num_habitaciones
+        self.num_reservas = num_reservas
+        self.num_empleados = num_empleados
+        self.num_servicios = num_servicios
+        self.fecha_inicio = date.fromisoformat(fecha_inicio)
+        self.habitaciones_por_piso = habitaciones_por_piso
+        self._fechas = {}  # ordinal -> "YYYY-MM-DD" (cache)
+
+    def _aleatorio(self, coleccion: str) -> random.Random:
+        """Un generador independiente por colección: cada una es reproducible por sí sola"""
+        return random.Random(f"{self.semilla}-{coleccion}")
+
+    def _fecha(self, ordinal: int) -> str:
+        fecha = self._fechas.get(ordinal)
+        if fecha is None:
+            fecha = self._fechas[ordinal] = date.fromordinal(ordinal).strftime("%Y-%m-%d")
+        return fecha
+
+    @staticmethod
+    def _nombre(aleatorio) -> str:
+        return (f"{aleatorio.choice(TRATAMIENTOS)}{aleatorio.choice(NOMBRES)} "
+                f"{aleatorio.choice(APELLIDOS)}")
+
+    # ========== HABITACIONES ==========
+    def generar_habitaciones(self):
+        """Habitaciones por piso: simples/dobles abajo, suites arriba y penthouses en la cima"""
+        aleatorio = self._aleatorio("habitaciones")
+        pisos = max(1, -(-self.num_habitaciones // self.habitaciones_por_piso))
+
+        for i in range(self.num_habitaciones):
+            piso = i // self.habitaciones_por_piso + 1
+            numero = piso * 1000 + i % self.habitaciones_por_piso + 1
+            altura = piso / pisos
+
+            if altura > 0.95:
+                yield Penthouse(numero, piso, aleatorio.random() < 0.3,
+                                aleatorio.random() < 0.7, aleatorio.random() < 0.5)
+            elif altura > 0.75:
+                yield Suite(numero, piso, aleatorio.random() < 0.8, aleatorio.random() < 0.5,
+                            aleatorio.random() < 0.6, aleatorio.randint(1, 3))
+            elif aleatorio.random() < 0.5:
+                yield HabitacionSimple(numero, piso, True, aleatorio.choice(VISTAS_SIMPLE),
+                                       aleatorio.random() < 0.3)
+            else:
+                yield HabitacionDoble(numero, piso, aleatorio.choice(CAMAS_DOBLE),
+                                      aleatorio.choice(VISTAS_DOBLE), True)
+
+    # ========== RESERVAS ==========
+    def generar_reservas(self, habitaciones):
+        """Reservas de los cuatro tipos sin solapamientos por habitación.
+
+        Cada habitación lleva un cursor 'libre desde'; una reserva (o grupo de
+        habitaciones contiguas) empieza después del cursor más tardío de sus
+        habitaciones y los adelanta hasta su fecha fin.
+        """
+        habitaciones = list(habitaciones)
+        if not habitaciones:
+            return
+
+        aleatorio = self._aleatorio("reservas")
+        base = self.fecha_inicio.toordinal()
+        libre_desde = [base + aleatorio.randint(0, 30) for _ in habitaciones]
+        total = len(habitaciones)
+
+        for i in range(self.num_reservas):
+            codigo = f"RES-{i + 1:07d}"
+            sorteo = aleatorio.random()
+
+            if sorteo < 0.15 and total > 1:
+                tamaño = min(aleatorio.randint(2, 4), total)
+                primera = aleatorio.randrange(total)
+                indices = [(primera + k) % total for k in range(tamaño)]
+            else:
+                indices = [aleatorio.randrange(total)]
+
+            inicio = max(libre_desde[k] for k in indices) + aleatorio.randint(0, 3)
+            fin = inicio + min(int(aleatorio.expovariate(1 / 3.5)) + 1, 14)
+            for k in indices:
+                libre_desde[k] = fin
+
+            fecha_inicio, fecha_fin = self._fecha(inicio), self._fecha(fin)
+            habitacion = habitaciones[indices[0]]
+
+            if len(indices) > 1:
+                apellido = aleatorio.choice(APELLIDOS)
+                yield ReservaGrupal(codigo, fecha_inicio, fecha_fin,
+                                    [habitaciones[k] for k in indices], f"Familia {apellido}",
+                                    len(indices) * 2, 15.0,
+                                    f"Sra. {apellido}" if aleatorio.random() < 0.5 else "")
+            elif sorteo < 0.60:
+                yield ReservaIndividual(codigo, fecha_inicio, fecha_fin, habitacion,
+                                        self._nombre(aleatorio), aleatorio.choice(PROPOSITOS),
+                                        aleatorio.random() < 0.6)
+            elif sorteo < 0.80:
+                huespedes = [self._nombre(aleatorio) for _ in range(aleatorio.randint(1, 3))]
+                yield ReservaCorporativa(codigo, fecha_inicio, fecha_fin, habitacion, huespedes,
+                                         aleatorio.choice(EMPRESAS), aleatorio.random() < 0.8,
+                                         aleatorio.random() < 0.7)
+            else:
+                huespedes = [self._nombre(aleatorio) for _ in range(aleatorio.randint(1, 4))]
+                yield PaqueteTuristico(codigo, fecha_inicio, fecha_fin, habitacion, huespedes,
+                                       aleatorio.choice(TOURS), aleatorio.random() < 0.7,
+                                       aleatorio.randint(1, 3), aleatorio.random() < 0.6)
+
+    # ========== PERSONAL ==========
+    def generar_empleados(self):
+        """Personal con historial de evaluaciones fechadas"""
+        aleatorio = self._aleatorio("empleados")
+        turnos = ["matutino", "vespertino", "nocturno"]
+        pisos = max(1, -(-self.num_habitaciones // self.habitaciones_por_piso))
+
+        for i in range(self.num_empleados):
+            nombre = f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}"
+            sorteo = aleatorio.random()
+
+            if sorteo < 0.30:
+                idiomas = ["español"] + aleatorio.sample(IDIOMAS, aleatorio.randint(0, 3))
+                empleado = Recepcionista(nombre, f"REC-{i + 1:05d}", aleatorio.choice(turnos),
+                                         1500, idiomas)
+            elif sorteo < 0.60:
+                piso = aleatorio.randint(1, pisos)
+                asignadas = [piso * 1000 + k for k in range(1, aleatorio.randint(3, 12))]
+                empleado = Housekeeping(nombre, f"HK-{i + 1:05d}", aleatorio.choice(turnos),
+                                        1200, asignadas, piso)
+            elif sorteo < 0.85:
+                empleado = Mantenimiento(nombre, f"MT-{i + 1:05d}", aleatorio.choice(turnos), 1300,
+                                         aleatorio.choice(["electricidad", "plomería",
+                                                           "carpintería", "general"]),
+                                         aleatorio.random() < 0.3)
+            else:
+                empleado = Gerente(nombre, f"GER-{i + 1:05d}", "administrativo", 2500,
+                                   aleatorio.choice(["recepcion", "servicios", "mantenimiento",
+                                                     "restaurante", "spa"]),
+                                   aleatorio.randint(2, 25))
+
+            for _ in range(aleatorio.randint(0, 12)):
+                dias_atras = aleatorio.randint(0, 730)
+                empleado._evaluaciones.append({
+                    "fecha": (self.fecha_inicio + timedelta(days=dias_atras)).strftime("%Y-%m-%d"),
+                    "calificacion": round(aleatorio.uniform(2.5, 5.0), 1),
+                    "comentario": ""
+                })
+            yield empleado
+
+    # ========== SERVICIOS ==========
+    def generar_servicios(self, habitaciones):
+        """Órdenes de servicio de los cuatro tipos con fecha de solicitud"""
+        numeros = [h.numero for h in habitaciones]
+        if not numeros:
+            return
+
+        aleatorio = self._aleatorio("servicios")
+        origen = datetime.combine(self.fecha_inicio, datetime.min.time())
+
+        for i in range(self.num_servicios):
+            codigo = f"SERV-{i + 1:07d}"
+            numero = aleatorio.choice(numeros)
+            sorteo = aleatorio.random()
+
+            if sorteo < 0.35:
+                servicio = ServicioRestaurante(codigo, "Cena", numero, aleatorio.randint(1, 6),
+                                               aleatorio.choice(["básico", "ejecutivo",
+                                                                 "premium", "gourmet"]),
+                                               aleatorio.choice(["restaurante", "habitacion",
+                                                                 "terraza"]))
+            elif sorteo < 0.55:
+                servicio = ServicioSpa(codigo, "Spa", numero,
+                                       aleatorio.choice(["masaje", "facial", "aromaterapia"]),
+                                       aleatorio.choice([30, 60, 90]))
+            elif sorteo < 0.75:
+                servicio = ServicioLavanderia(codigo, "Lavandería", numero,
+                                              aleatorio.randint(1, 15),
+                                              aleatorio.choice(["lavado", "planchado",
+                                                                "lavado y planchado", "seco"]),
+                                              aleatorio.random() < 0.2)
+            else:
+                items = aleatorio.sample(ITEMS_ROOM_SERVICE, aleatorio.randint(1, 4))
+                servicio = RoomService(codigo, "Room Service", numero, items,
+                                       f"{aleatorio.randint(0, 23):02d}:00", numero // 1000)
+
+            momento = origen + timedelta(minutes=aleatorio.randint(0, 730 * 24 * 60))
+            servicio.registrar_solicitud(momento.strftime("%Y-%m-%d %H:%M"))
+            yield servicio
+
+    # ========== DESTINOS ==========
+    def poblar(self, hotel_service):
+        """Carga los datos generados en un HotelService vacío (datos_ejemplo=False)"""
+        habitaciones = list(self.generar_habitaciones())
+        for habitacion in habitaciones:
+            hotel_service.agregar_habitacion(habitacion)
+        for empleado in self.generar_empleados():
+            hotel_service.contratar_empleado(empleado)
+        for servicio in self.generar_servicios(habitaciones):
+            hotel_service.agregar_servicio(servicio)
+        for reserva in self.generar_reservas(habitaciones):
+            hotel_service.agregar_reserva(reserva)
+        return hotel_service
+
+    def escribir(self, storage):
+        """Escribe todo en un JSONStorage en streaming (solo las habitaciones quedan en memoria)"""
+        habitaciones = list(self.generar_habitaciones())
+        storage.guardar_stream("habitaciones", habitaciones)
+        storage.guardar_stream("empleados", self.generar_empleados())
+        storage.guardar_stream("servicios", self.generar_servicios(habitaciones))
+        storage.guardar_stream("reservas", self.generar_reservas(habitaciones))
+
+
+def main():
+    """Genera un hotel sintético en un directorio de datos"""
+    from storage.json_storage import JSONStorage
+
+    parser = argparse.ArgumentParser(description="Generador de datos sintéticos del hotel")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--habitaciones", type=int, default=10000)
+    parser.add_argument("--reservas", type=int, default=1000000)
+    parser.add_argument("--empleados", type=int, default=5000)
+    parser.add_argument("--servicios", type=int, default=100000)
+    parser.add_argument("--salida", default="data")
+    args = parser.parse_args()
+
+    generador = GeneradorHotel(args.semilla, args.habitaciones, args.reservas,
+                               args.empleados, args.servicios)
+    generador.escribir(JSONStorage(args.salida))
+
+
+if __name__ == "__main__":
+    main()
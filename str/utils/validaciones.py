@@ -1,4 +1,12 @@
+import re
+import unicodedata
 from datetime import datetime
+from functools import lru_cache
+
+
+# Tratamientos que no forman parte del nombre (ya normalizados, sin punto)
+TRATAMIENTOS = {"sr", "sra", "srta", "dr", "dra", "don", "dona", "lic", "ing",
+                "mr", "mrs", "ms", "grupo"}
 
 
 def validar_fecha(fecha_str: str) -> bool:
@@ -10,6 +18,15 @@ def validar_fecha(fecha_str: str) -> bool:
         return False
 
 
+@lru_cache(maxsize=8192)
+def fecha_a_ordinal(fecha_str: str) -> int:
+    """Convierte una fecha YYYY-MM-DD en ordinal de día (lanza ValueError si es inválida).
+    
+    Memoizada: las fechas de las reservas se repiten mucho entre reportes.
+    """
+    return datetime.strptime(fecha_str, "%Y-%m-%d").toordinal()
+
+
 def validar_email(email: str) -> bool:
     """Valida formato de email básico"""
     return '@' in email and '.' in email and len(email) > 5
@@ -88,3 +105,29 @@ def convertir_a_boolean(valor: str) -> bool:
     """Convierte cadena a booleano"""
     valores_true = ['sí', 'si', 'yes', 'y', 'true', 'verdadero', '1']
     return valor.lower() in valores_true
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Normaliza un nombre para comparar: sin tildes, minúsculas, sin signos ni tratamientos"""
+    sin_tildes = "".join(c for c in unicodedata.normalize("NFKD", nombre)
+                         if not unicodedata.combining(c))
+    palabras = re.sub(r"[^\w\s]", " ", sin_tildes.casefold()).split()
+    return " ".join(p for p in palabras if p not in TRATAMIENTOS)
+
+
+def distancia_edicion(a: str, b: str, maximo: int = None) -> int:
+    """Distancia de Levenshtein; con 'maximo' corta en cuanto la supera (retorna maximo + 1)"""
+    if len(a) < len(b):
+        a, b = b, a
+    if maximo is not None and len(a) - len(b) > maximo:
+        return maximo + 1
+    
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if maximo is not None and min(actual) > maximo:
+            return maximo + 1
+        anterior = actual
+    return anterior[-1]